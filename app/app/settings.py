@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'rest_framework',
     'rest_framework.authtoken',
@@ -29,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,17 +63,122 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 
 
+# DB_POOL_MODE define como as conexões são reaproveitadas:
+#   off        - uma conexão nova por requisição (CONN_MAX_AGE=0).
+#   persistent - cada thread mantém sua conexão por DB_CONN_MAX_AGE
+#                segundos, testada no início da requisição (health check).
+#   pgbouncer  - como persistent, apontando para um PgBouncer em modo
+#                transaction (sem cursores no servidor, que ele não suporta).
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'persistent')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.environ.get(
+            'DB_ENGINE',
+            'core.db.backends.postgresql',
+        ),
         'HOST': os.environ.get('DB_HOST'),
+        'PORT': os.environ.get('DB_PORT', ''),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': (
+            0 if DB_POOL_MODE == 'off'
+            else int(os.environ.get('DB_CONN_MAX_AGE', 600))
+        ),
+        'CONN_HEALTH_CHECKS': DB_POOL_MODE != 'off',
+        'DISABLE_SERVER_SIDE_CURSORS': DB_POOL_MODE == 'pgbouncer',
+    }
+}
+
+# Réplicas de leitura (streaming replication), como host ou host:porta
+# separados por vírgula: DB_REPLICA_HOSTS=replica1,replica2:5433. Cada uma
+# vira o alias replicaN, com as demais configurações do primário; nos
+# testes elas espelham o banco de testes do primário.
+DB_REPLICAS = []
+for number, address in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')),
+    start=1,
+):
+    host, _, port = address.strip().partition(':')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(f'replica{number}')
+
+# Os GETs das receitas e do usuário leem das réplicas, em rodízio; após
+# uma escrita, o usuário lê do primário por TIMEOUT segundos (ver
+# core.db.routers). ALIAS é o cache (em CACHES) que guarda essas marcas.
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+DB_READ_YOUR_WRITES = {
+    'TIMEOUT': int(os.environ.get('DB_READ_YOUR_WRITES_TIMEOUT', 5)),
+    'ALIAS': os.environ.get('DB_READ_YOUR_WRITES_CACHE', 'default'),
+}
+
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+    # Só as chaves de idempotência (RECIPE_IDEMPOTENCY), para que não
+    # sejam descartadas pelo volume das versões e respostas em cache do
+    # 'default'. Com mais de um processo, deve ser um cache compartilhado
+    # (Redis ou Memcached): no LocMem cada processo tem o seu, e a
+    # repetição que cair em outro processo executa de novo.
+    'idempotency': {
+        'BACKEND': os.environ.get(
+            'IDEMPOTENCY_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get(
+            'IDEMPOTENCY_CACHE_LOCATION', 'idempotency',
+        ),
+    },
+}
+if CACHES['idempotency']['BACKEND'].endswith('.LocMemCache'):
+    # O padrão do LocMem (300 entradas) descartaria chaves dentro do TTL.
+    CACHES['idempotency']['OPTIONS'] = {
+        'MAX_ENTRIES': int(
+            os.environ.get('IDEMPOTENCY_CACHE_MAX_ENTRIES', 100000)
+        ),
     }
+
+
+# Hash de senhas: PASSWORD_HASHER escolhe o algoritmo das senhas novas
+# (pbkdf2, argon2 ou bcrypt); senhas com outro algoritmo ou custo são
+# refeitas no próximo login. argon2-cffi e bcrypt estão no requirements.txt.
+PASSWORD_HASHING = {
+    'ALGORITHM': os.environ.get('PASSWORD_HASHER', 'pbkdf2'),
+    'PBKDF2_ITERATIONS': int(os.environ.get('PBKDF2_ITERATIONS', 260000)),
+    'ARGON2_TIME_COST': int(os.environ.get('ARGON2_TIME_COST', 2)),
+    'ARGON2_MEMORY_COST': int(os.environ.get('ARGON2_MEMORY_COST', 102400)),
+    'ARGON2_PARALLELISM': int(os.environ.get('ARGON2_PARALLELISM', 8)),
+    'BCRYPT_ROUNDS': int(os.environ.get('BCRYPT_ROUNDS', 12)),
+    # Threads que calculam hashes (core.backends.PooledModelBackend): o
+    # máximo de núcleos que uma rajada de logins ocupa, por processo.
+    'WORKERS': int(os.environ.get('PASSWORD_HASH_WORKERS', 2)),
 }
 
+_HASHERS = {
+    'pbkdf2': 'core.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'core.hashers.TunableArgon2PasswordHasher',
+    'bcrypt': 'core.hashers.TunableBCryptSHA256PasswordHasher',
+}
+# O primeiro é usado nas senhas novas; os demais só verificam as antigas.
+PASSWORD_HASHERS = [
+    _HASHERS.pop(PASSWORD_HASHING['ALGORITHM']),
+    *_HASHERS.values(),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
 
+AUTHENTICATION_BACKENDS = ['core.backends.PooledModelBackend']
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -107,10 +215,68 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# API_FAST_JSON=1 troca o JSONRenderer/JSONParser do DRF pelos de
+# core.renderers/core.parsers, baseados no orjson; sem o orjson instalado
+# eles usam o módulo json, como os do DRF.
+API_FAST_JSON = os.environ.get('API_FAST_JSON', '1') == '1'
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer' if API_FAST_JSON
+        else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser' if API_FAST_JSON
+        else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Proxies reversos na frente da API: o IP dos anônimos é lido do
+    # X-Forwarded-For só até eles; com 0, vale o REMOTE_ADDR.
+    'NUM_PROXIES': int(os.environ.get('API_NUM_PROXIES', 0)),
+    # Token buckets em memória (core.throttling): 'user' vale para toda a
+    # API; os demais escopos, para as views com aquele throttle_scope
+    # (nas views async, o do async_api_view).
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.UserTokenBucketThrottle',
+        'core.throttling.ScopedTokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': os.environ.get('API_THROTTLE_USER_RATE', '3000/min'),
+        'recipes': os.environ.get('API_THROTTLE_RECIPES_RATE', '1200/min'),
+        'token': os.environ.get('API_THROTTLE_TOKEN_RATE', '20/min'),
+        'user_create': os.environ.get(
+            'API_THROTTLE_USER_CREATE_RATE', '10/hour',
+        ),
+    },
 }
 
+# Fila de tarefas em banco (core.taskqueue), executada pelo run_worker.
+# Com EAGER as tarefas rodam no próprio processo, após o commit.
+TASKS = {
+    'EAGER': os.environ.get('TASKS_EAGER') == '1',
+    'PROCESSES': int(os.environ.get('TASKS_PROCESSES', 2)),
+    'BATCH_SIZE': int(os.environ.get('TASKS_BATCH_SIZE', 10)),
+    'POLL_INTERVAL': float(os.environ.get('TASKS_POLL_INTERVAL', 1)),
+    'MAX_ATTEMPTS': int(os.environ.get('TASKS_MAX_ATTEMPTS', 5)),
+    'LOCK_TIMEOUT': int(os.environ.get('TASKS_LOCK_TIMEOUT', 300)),
+}
+
+# Com SHARED_CACHE (alias em CACHES), cada processo sincroniza o consumo
+# dos seus baldes a cada SYNC_INTERVAL segundos; sem ele, cada processo
+# limita sozinho. MAX_BUCKETS limita a memória dos baldes por processo.
+API_THROTTLE = {
+    'ENABLED': os.environ.get('API_THROTTLE_ENABLED', '1') == '1',
+    'MAX_BUCKETS': int(os.environ.get('API_THROTTLE_MAX_BUCKETS', 100000)),
+    'SHARED_CACHE': os.environ.get('API_THROTTLE_SHARED_CACHE') or None,
+    'SYNC_INTERVAL': float(os.environ.get('API_THROTTLE_SYNC_INTERVAL', 1)),
+}
+
+# Desliga API_THROTTLE nos testes (ver core.tests.runner).
+TEST_RUNNER = 'core.tests.runner.TestRunner'
+
 # https://drf-spectacular.readthedocs.io/en/latest/
 SPECTACULAR_SETTINGS = {
     'TITLE': '3-API-DRF-RECIPES',
@@ -118,3 +284,101 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# Paginação por cursor da listagem de receitas.
+# RECIPE_LIST_UNPAGINATED=1 devolve a listagem completa (comportamento antigo).
+RECIPE_PAGE_SIZE = int(os.environ.get('RECIPE_PAGE_SIZE', 50))
+RECIPE_MAX_PAGE_SIZE = int(os.environ.get('RECIPE_MAX_PAGE_SIZE', 500))
+RECIPE_LIST_UNPAGINATED = os.environ.get('RECIPE_LIST_UNPAGINATED') == '1'
+
+# List/retrieve das receitas via values_list + renderização compilada
+# (recipe.fastpath), em vez do ModelSerializer; 0 volta ao serializador.
+RECIPE_FAST_PATH = os.environ.get('RECIPE_FAST_PATH', '1') == '1'
+
+# Limites dos endpoints de criação/atualização/exclusão em lote.
+RECIPE_BULK_MAX_ITEMS = int(os.environ.get('RECIPE_BULK_MAX_ITEMS', 10000))
+RECIPE_BULK_BATCH_SIZE = int(os.environ.get('RECIPE_BULK_BATCH_SIZE', 1000))
+
+# Linhas buscadas por vez do cursor no servidor durante a exportação.
+RECIPE_EXPORT_CHUNK_SIZE = int(
+    os.environ.get('RECIPE_EXPORT_CHUNK_SIZE', 2000)
+)
+
+# Alias (em CACHES) onde ficam as versões das receitas usadas nas ETags.
+# Com mais de um processo, deve ser um cache compartilhado (ex.: memcached).
+RECIPE_VERSION_CACHE = os.environ.get('RECIPE_VERSION_CACHE', 'default')
+
+# Validade (segundos) da versão de cada receita. Ela é criada já na
+# leitura, antes de a receita ser buscada, então precisa expirar para que
+# pks inexistentes não fiquem no cache para sempre.
+RECIPE_OBJECT_VERSION_TIMEOUT = int(
+    os.environ.get('RECIPE_OBJECT_VERSION_TIMEOUT', 24 * 60 * 60)
+)
+
+# Cache dos dados de list/retrieve das receitas, invalidado pelas versões.
+RECIPE_RESPONSE_CACHE = {
+    'ENABLED': os.environ.get('RECIPE_RESPONSE_CACHE_ENABLED', '1') == '1',
+    'ALIAS': os.environ.get('RECIPE_RESPONSE_CACHE_ALIAS', 'default'),
+    'TIMEOUT': int(os.environ.get('RECIPE_RESPONSE_CACHE_TIMEOUT', 300)),
+}
+
+# Histogramas por view (consultas, tempo no banco, serialização e latência)
+# do core.middleware.RequestMetricsMiddleware, expostos em /api/metrics/.
+# SERVER_TIMING também devolve esses tempos no header Server-Timing.
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS_ENABLED', '1') == '1',
+    'SERVER_TIMING': os.environ.get('REQUEST_METRICS_SERVER_TIMING') == '1',
+}
+
+# Compressão das respostas (core.middleware.CompressionMiddleware), com
+# brotli quando o pacote está instalado e o cliente aceita, senão gzip.
+# Níveis baixos/médios: nas respostas dinâmicas o ganho dos níveis
+# máximos não compensa a CPU (ver benchmarks.bench_compression).
+RESPONSE_COMPRESSION = {
+    'ENABLED': os.environ.get('RESPONSE_COMPRESSION_ENABLED', '1') == '1',
+    'MIN_SIZE': int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024)),
+    'GZIP_LEVEL': int(os.environ.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6)),
+    'BROTLI_QUALITY': int(
+        os.environ.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+    ),
+    'CONTENT_TYPES': [
+        'application/json',
+        'application/vnd.oai.openapi',
+        'application/vnd.oai.openapi+json',
+        'application/x-ndjson',
+        'text/',
+    ],
+}
+
+# Respostas guardadas para as repetições com o header Idempotency-Key
+# (ver recipe.idempotency). ALIAS é um cache só delas (ver CACHES) e, com
+# mais de um processo, deve ser compartilhado (Redis ou Memcached);
+# LOCK_TIMEOUT limita a espera por uma requisição que morreu no meio.
+RECIPE_IDEMPOTENCY = {
+    'ALIAS': os.environ.get('RECIPE_IDEMPOTENCY_CACHE', 'idempotency'),
+    'TIMEOUT': int(os.environ.get('RECIPE_IDEMPOTENCY_TIMEOUT', 86400)),
+    'LOCK_TIMEOUT': int(os.environ.get('RECIPE_IDEMPOTENCY_LOCK_TIMEOUT', 60)),
+}
+
+# Sincronização incremental das receitas (ver recipe.sync). PAGE_SIZE
+# limita as alterações por resposta; SETTLE_SECONDS deve cobrir a duração
+# das transações que gravam receitas; marcas de exclusão mais antigas que
+# TOMBSTONE_DAYS são removidas pelo comando purge_recipe_tombstones, e um
+# cursor anterior a isso exige uma nova carga completa.
+RECIPE_SYNC = {
+    'PAGE_SIZE': int(os.environ.get('RECIPE_SYNC_PAGE_SIZE', 500)),
+    'SETTLE_SECONDS': float(os.environ.get('RECIPE_SYNC_SETTLE_SECONDS', 2)),
+    'TOMBSTONE_DAYS': int(os.environ.get('RECIPE_SYNC_TOMBSTONE_DAYS', 30)),
+}
+
+# Cache token -> usuário da core.authentication.CachedTokenAuthentication.
+# SHARED_CACHE é o alias (em CACHES) do nível compartilhado entre processos;
+# com ele, excluir um token ou alterar o usuário invalida os LRUs locais de
+# todos os processos. Sem ele, cada processo só vê as próprias alterações:
+# os demais continuam aceitando o token excluído (ou o usuário desativado)
+# por até TTL segundos, por isso o TTL padrão é curto.
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 5)),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None,
+}
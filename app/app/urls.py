@@ -6,6 +6,8 @@ from drf_spectacular.views import (
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
@@ -16,4 +18,5 @@ urlpatterns = [
     ),
     path('api/user/', include('user.urls')),
     path('api/recipe/', include('recipe.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='api-metrics'),
 ]
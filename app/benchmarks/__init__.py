@@ -0,0 +1,9 @@
+"""
+Benchmarks da API de Receitas.
+
+Cada módulo é executado a partir do diretório `app/`, por exemplo:
+
+    python -m benchmarks.bench_token_auth
+
+Os benchmarks criam e destroem um banco de testes, como o `manage.py test`.
+"""
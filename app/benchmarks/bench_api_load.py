@@ -0,0 +1,365 @@
+"""
+Teste de carga dos endpoints de token e de receitas.
+
+Popula o banco de testes (ver benchmarks.seed), dispara requisições
+concorrentes contra os endpoints reais e informa vazão e latências
+p50/p95/p99 por endpoint, gravando o resultado em JSON para comparar
+execuções. Roda com o SQLite ou com um PostgreSQL local, sem outros
+serviços.
+
+    python -m benchmarks.bench_api_load [--users N] [--recipes N]
+        [--requests N] [--concurrency C] [--transport inprocess|http]
+        [--endpoints token,list,...] [--output results.json] [--keepdb]
+        [--throttle]
+
+Com --transport http as requisições passam por um servidor WSGI local
+(thread por requisição) via http.client; com inprocess, pelo handler do
+django.test.Client, sem rede.
+"""
+import argparse
+import http.client
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from benchmarks.utils import (
+    percentile,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+
+class InProcessTransport:
+    """Requisições pelo handler WSGI do Django, sem rede."""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client()
+
+    def request(self, method, path, body=None, token=None):
+        headers = {}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = 'Token ' + token
+        res = self.client.generic(
+            method, path, body and json.dumps(body),
+            content_type='application/json', **headers,
+        )
+        return res.status_code
+
+    def close(self):
+        pass
+
+
+class HTTPTransport:
+    """Requisições HTTP/1.1 com keep-alive ao servidor local."""
+
+    def __init__(self, address):
+        self.address = address
+        self.connection = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Host': 'testserver'}
+        if token:
+            headers['Authorization'] = 'Token ' + token
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in (1, 2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(*self.address)
+            try:
+                self.connection.request(method, path, body, headers)
+                res = self.connection.getresponse()
+                res.read()
+            except (http.client.HTTPException, OSError):
+                # O servidor pode fechar a conexão entre requisições.
+                self.close()
+                if attempt == 2:
+                    raise
+                continue
+            if res.getheader('Connection', '').lower() == 'close':
+                self.close()
+            return res.status
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def start_server():
+    """Sobe um servidor WSGI local numa porta livre, em uma thread."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import (
+        ThreadedWSGIServer,
+        WSGIRequestHandler,
+    )
+
+    class QuietHandler(WSGIRequestHandler):
+        # Headers e corpo saem em writes separados: com o Nagle, cada
+        # resposta keep-alive esperaria o ACK atrasado (~40 ms) do client.
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def build_endpoints(accounts, sample):
+    """Retorna {nome: função(rng) -> (método, caminho, corpo, token,
+    status esperado)} dos cenários medidos."""
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from recipe.sync import encode_cursor
+
+    token_url = reverse('user:token')
+    recipes_url = reverse('recipe:recipe-list')
+    stats_url = reverse('recipe:recipe-stats')
+    sync_url = reverse('recipe:sync')
+    # Cliente em dia: sincronizou depois da carga, então recebe só o que
+    # os outros cenários gravaram desde então.
+    sync_cursor = encode_cursor(timezone.now(), 0)
+    with_recipes = [
+        account for account in accounts if account[0] in sample
+    ]
+
+    def token(rng):
+        _, email, _ = rng.choice(accounts)
+        return 'POST', token_url, {
+            'email': email, 'password': 'benchpass123',
+        }, None, 200
+
+    def recipe_list(rng):
+        return 'GET', recipes_url, None, rng.choice(accounts)[2], 200
+
+    def recipe_list_filtered(rng):
+        path = recipes_url + (
+            '?ordering=price&time_minutes__lte=60&fields=id,title,price'
+        )
+        return 'GET', path, None, rng.choice(accounts)[2], 200
+
+    def recipe_search(rng):
+        path = recipes_url + '?search=' + rng.choice(
+            ('bolo', 'queijo', 'limão', 'frango'),
+        )
+        return 'GET', path, None, rng.choice(accounts)[2], 200
+
+    def recipe_detail(rng):
+        user_id, _, key = rng.choice(with_recipes)
+        path = reverse(
+            'recipe:recipe-detail', args=[rng.choice(sample[user_id])],
+        )
+        return 'GET', path, None, key, 200
+
+    def recipe_stats(rng):
+        return 'GET', stats_url, None, rng.choice(accounts)[2], 200
+
+    def recipe_sync(rng):
+        path = f'{sync_url}?since={sync_cursor}'
+        return 'GET', path, None, rng.choice(accounts)[2], 200
+
+    def recipe_create(rng):
+        return 'POST', recipes_url, {
+            'title': 'Receita do benchmark',
+            'time_minutes': rng.randint(5, 240),
+            'price': '%d.%02d' % (rng.randint(1, 999), rng.randint(0, 99)),
+            'description': 'Criada pelo teste de carga.',
+        }, rng.choice(accounts)[2], 201
+
+    endpoints = {
+        'token': token,
+        'list': recipe_list,
+        'list_filtered': recipe_list_filtered,
+        'search': recipe_search,
+        'stats': recipe_stats,
+        'sync': recipe_sync,
+        'create': recipe_create,
+    }
+    if with_recipes:
+        endpoints['detail'] = recipe_detail
+    return endpoints
+
+
+def run_endpoint(make_request, requests, concurrency, new_transport, seed):
+    """Executa `requests` requisições com `concurrency` threads e
+    retorna (latências em segundos, erros, duração total)."""
+    from django.db import connections
+
+    lock = threading.Lock()
+    remaining = [requests]
+    latencies = []
+    errors = []
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        transport = new_transport()
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                method, path, body, token, expected = make_request(rng)
+                start = time.perf_counter()
+                try:
+                    status = transport.request(method, path, body, token)
+                except Exception as error:
+                    status = repr(error)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    if status != expected:
+                        errors.append(status)
+        finally:
+            transport.close()
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=worker, args=(i,))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize_endpoint(latencies, errors, elapsed):
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_samples': sorted({str(error) for error in errors})[:5],
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies, default=0.0) * 1000,
+    }
+
+
+def run(args):
+    import django
+    from django.db import connection
+
+    from benchmarks.seed import seed
+
+    start = time.perf_counter()
+    accounts, sample = seed(args.users, args.recipes, args.batch_size)
+    seed_seconds = time.perf_counter() - start
+
+    endpoints = build_endpoints(accounts, sample)
+    selected = args.endpoints or list(endpoints)
+    unknown = set(selected) - set(endpoints)
+    if unknown:
+        sys.exit('Endpoints desconhecidos: %s' % ', '.join(sorted(unknown)))
+
+    server = None
+    if args.transport == 'http':
+        server = start_server()
+
+        def new_transport():
+            return HTTPTransport(server.server_address)
+    else:
+        new_transport = InProcessTransport
+
+    results = {}
+    try:
+        for index, name in enumerate(selected):
+            latencies, errors, elapsed = run_endpoint(
+                endpoints[name],
+                args.requests,
+                args.concurrency,
+                new_transport,
+                seed=index,
+            )
+            results[name] = summarize_endpoint(latencies, errors, elapsed)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'transport': args.transport,
+            'users': args.users,
+            'recipes': args.recipes,
+            'requests_per_endpoint': args.requests,
+            'concurrency': args.concurrency,
+            'throttle': args.throttle,
+            'seed_seconds': seed_seconds,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'results': results,
+    }
+
+    print_table(
+        ['endpoint', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'],
+        [
+            [
+                name,
+                '%.0f' % result['throughput_rps'],
+                '%.2f' % result['p50_ms'],
+                '%.2f' % result['p95_ms'],
+                '%.2f' % result['p99_ms'],
+                result['errors'],
+            ]
+            for name, result in results.items()
+        ],
+    )
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f'Resultados gravados em {args.output}')
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--recipes', type=int, default=1000,
+                        help='Total de receitas (1k a 10M).')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=500,
+                        help='Requisições por endpoint.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--transport', choices=['inprocess', 'http'],
+                        default='inprocess')
+    parser.add_argument(
+        '--endpoints', type=lambda value: value.split(','),
+        help='Lista separada por vírgulas (padrão: todos).',
+    )
+    parser.add_argument('--output', help='Arquivo JSON dos resultados.')
+    parser.add_argument('--keepdb', action='store_true',
+                        help='Reaproveita (e mantém) o banco de testes.')
+    parser.add_argument('--throttle', action='store_true',
+                        help='Mantém o rate limiting ligado.')
+    args = parser.parse_args()
+
+    setup_django(throttle=args.throttle)
+    with test_database(keepdb=args.keepdb):
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
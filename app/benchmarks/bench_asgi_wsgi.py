@@ -0,0 +1,150 @@
+"""
+Compara a vazão da listagem de receitas pelo handler WSGI (view DRF
+síncrona, uma thread por requisição concorrente) e pelo handler ASGI
+(view async, corrotinas no event loop), com alta concorrência.
+
+Os dois lados fazem o mesmo trabalho: autenticação pelo token em cache,
+uma consulta paginada e a serialização, sem o cache de respostas (que só
+a view DRF tem). Nenhum dos clientes manda If-None-Match, então a ETag é
+calculada mas não evita a consulta. As conexões ficam abertas por
+thread nos dois lados (as do WSGI e as do executor do sync_to_async).
+
+Com --db-latency, cada consulta espera mais MS milissegundos, como a ida
+e volta a um PostgreSQL na rede: é aí que a vazão do ASGI depende de as
+consultas de requisições concorrentes rodarem em threads diferentes.
+
+    python -m benchmarks.bench_asgi_wsgi [--requests N] [--concurrency C]
+        [--db-latency MS]
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+)
+
+
+def seed(recipes):
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+
+    from rest_framework.authtoken.models import Token
+
+    from core.models import Recipe
+
+    user = get_user_model().objects.create_user(
+        'bench@example.com', 'benchpass123',
+    )
+    Recipe.objects.bulk_create(
+        Recipe(user=user, title=f'Recipe {i}', time_minutes=i % 120,
+               price=Decimal('9.99'))
+        for i in range(recipes)
+    )
+    return Token.objects.create(user=user).key
+
+
+def add_db_latency(seconds):
+    """Soma `seconds` a cada consulta, em todas as conexões abertas a
+    partir de agora."""
+    from django.db.backends.signals import connection_created
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if slow_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_query)
+
+    connection_created.connect(install, weak=False)
+
+
+def bench_wsgi(url, token, requests, concurrency):
+    from django.test import Client
+
+    def call(_):
+        client = Client(HTTP_AUTHORIZATION='Token ' + token)
+        start = time.perf_counter()
+        res = client.get(url)
+        elapsed = time.perf_counter() - start
+        assert res.status_code == 200, res.status_code
+        return elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(call, range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def bench_asgi(url, token, requests, concurrency):
+    from django.test import AsyncClient
+
+    async def run():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                start = time.perf_counter()
+                res = await client.get(url, AUTHORIZATION='Token ' + token)
+                elapsed = time.perf_counter() - start
+            assert res.status_code == 200, res.status_code
+            return elapsed
+
+        return await asyncio.gather(*(call() for _ in range(requests)))
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run())
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--recipes', type=int, default=200)
+    parser.add_argument('--db-latency', type=float, default=0,
+                        help='Milissegundos somados a cada consulta.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+    from django.urls import reverse
+
+    with test_database(), override_settings(RECIPE_RESPONSE_CACHE={
+        'ENABLED': False, 'ALIAS': 'default', 'TIMEOUT': 0,
+    }):
+        token = seed(args.recipes)
+        if args.db_latency:
+            add_db_latency(args.db_latency / 1000)
+        rows = []
+        for name, bench, url in (
+            ('WSGI (DRF)', bench_wsgi, reverse('recipe:recipe-list')),
+            ('ASGI (async)', bench_asgi, reverse('recipe:async-recipe-list')),
+        ):
+            latencies, elapsed = bench(
+                url, token, args.requests, args.concurrency,
+            )
+            stats = summarize(latencies)
+            rows.append([
+                name,
+                '%.0f' % (args.requests / elapsed),
+                '%.2f' % stats['p50_ms'],
+                '%.2f' % stats['p99_ms'],
+            ])
+
+    print(
+        f'{args.requests} requests, concurrency {args.concurrency}, '
+        f'db latency {args.db_latency} ms'
+    )
+    print_table(['handler', 'req/s', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
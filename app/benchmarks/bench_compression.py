@@ -0,0 +1,122 @@
+"""
+Mede, para payloads típicos das receitas (página da listagem, detalhe, um
+bloco da exportação NDJSON e a exportação inteira em streaming, com um
+flush por bloco), os bytes economizados e a CPU gasta pela compressão do
+core.middleware.CompressionMiddleware em cada nível de gzip e de brotli
+(este, se instalado).
+
+    python -m benchmarks.bench_compression [--rows N] [--rounds N]
+"""
+import argparse
+
+from benchmarks.utils import print_table, setup_django, summarize, timed_calls
+
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def payloads(rows):
+    """Retorna (nome, blocos) dos payloads medidos; os de mais de um bloco
+    são comprimidos como streaming."""
+    from collections import OrderedDict
+    from decimal import Decimal
+
+    from benchmarks.bench_json import recipe_page
+    from core.renderers import FastJSONRenderer
+    from recipe import exports
+
+    detail = OrderedDict([
+        ('id', 123456),
+        ('title', 'Pão de queijo mineiro'),
+        ('time_minutes', 45),
+        ('price', '12.50'),
+        ('link', 'https://example.com/receitas/pao-de-queijo.pdf'),
+        ('description', ' '.join(
+            f'Passo {i}: misture o polvilho, o leite e o queijo.'
+            for i in range(10)
+        )),
+    ])
+    export_rows = (
+        (i, f'Receita {i}', f'Descrição da receita {i}', i % 120,
+         Decimal('%d.%02d' % (i % 1000, i % 100)),
+         f'https://example.com/receitas/{i}.pdf')
+        for i in range(20000)
+    )
+    export = [chunk.encode() for chunk in exports.iter_ndjson(export_rows)]
+
+    renderer = FastJSONRenderer()
+    return [
+        (f'list page ({rows} rows)', [renderer.render(recipe_page(rows))]),
+        ('detail', [renderer.render(detail)]),
+        ('export chunk', export[:1]),
+        (f'export stream ({len(export)} chunks)', export),
+    ]
+
+
+def encoders():
+    """Retorna (nome, fábrica do encoder) para cada nível medido."""
+    from core.middleware import _BrotliEncoder, _GzipEncoder, brotli
+
+    result = [
+        (f'gzip {level}', lambda level=level: _GzipEncoder(level))
+        for level in GZIP_LEVELS
+    ]
+    if brotli is None:
+        print('brotli não está instalado: medindo só o gzip.')
+    else:
+        result += [
+            (f'br {quality}', lambda quality=quality: _BrotliEncoder(quality))
+            for quality in BROTLI_QUALITIES
+        ]
+    return result
+
+
+def run(rows, rounds):
+    from core.middleware import CompressionMiddleware
+
+    table = []
+    for payload_name, chunks in payloads(rows):
+        body = b''.join(chunks)
+        for encoder_name, make_encoder in encoders():
+            def compress():
+                encoder = make_encoder()
+                if len(chunks) > 1:
+                    return b''.join(CompressionMiddleware.compress_stream(
+                        encoder, chunks,
+                    ))
+                return encoder.process(body) + encoder.finish()
+
+            size = len(compress())
+            stats = summarize(timed_calls(compress, rounds))
+            table.append([
+                payload_name,
+                encoder_name,
+                len(body),
+                size,
+                '%.1f%%' % (100 * (1 - size / len(body))),
+                '%.3f' % stats['p50_ms'],
+                '%.0f' % (len(body) / 1024 / (stats['mean_ms'] / 1000)),
+                # Bytes economizados por milissegundo de CPU.
+                '%.0f' % ((len(body) - size) / stats['mean_ms']),
+            ])
+
+    print_table(
+        ['payload', 'encoding', 'bytes', 'compressed', 'saved',
+         'p50 ms', 'KiB/s', 'saved B/ms'],
+        table,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.rows, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
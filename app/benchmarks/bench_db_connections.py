@@ -0,0 +1,130 @@
+"""
+Mede a latência (p50/p99) da listagem de receitas abrindo uma conexão
+por requisição (DB_POOL_MODE=off) e com conexões persistentes testadas
+por health check (DB_POOL_MODE=persistent). O ganho aparece contra um
+PostgreSQL real, onde abrir a conexão custa vários milissegundos.
+
+As requisições passam pelo WSGIHandler, como num servidor: o
+django.test.Client desconecta o close_old_connections dos sinais
+request_started/request_finished, e com ele nenhuma conexão seria fechada
+ou testada entre as requisições.
+
+    python -m benchmarks.bench_db_connections [--requests N]
+"""
+import argparse
+import io
+import sys
+
+from benchmarks.utils import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed_calls,
+)
+
+
+def wsgi_get(handler, path, token):
+    """Faz um GET pelo handler WSGI e retorna o status."""
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_AUTHORIZATION': 'Token ' + token,
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+    }
+    status = []
+    response = handler(
+        environ, lambda code, headers, exc_info=None: status.append(code),
+    )
+    try:
+        b''.join(response)
+    finally:
+        # Dispara o request_finished, como o servidor WSGI.
+        response.close()
+    return int(status[0].split()[0])
+
+
+def run(requests):
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from django.urls import reverse
+
+    from rest_framework.authtoken.models import Token
+
+    from core.models import Recipe
+
+    user = get_user_model().objects.create_user(
+        'bench@example.com', 'benchpass123',
+    )
+    Recipe.objects.bulk_create(
+        Recipe(user=user, title=f'Recipe {i}', time_minutes=10,
+               price=Decimal('1.00'))
+        for i in range(50)
+    )
+    token = Token.objects.create(user=user).key
+    url = reverse('recipe:recipe-list')
+
+    connects = []
+    connection_created.connect(
+        lambda sender, **kwargs: connects.append(1), weak=False,
+    )
+
+    rows = []
+    modes = (
+        ('off', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}),
+        ('persistent', {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True}),
+    )
+    # Sem o cache de respostas, toda requisição vai ao banco.
+    with override_settings(RECIPE_RESPONSE_CACHE={
+        'ENABLED': False, 'ALIAS': 'default', 'TIMEOUT': 0,
+    }):
+        handler = WSGIHandler()
+        for mode, options in modes:
+            connection.close()
+            # Lidas ao abrir a conexão (CONN_MAX_AGE) e pelo backend do
+            # core (health check).
+            connection.settings_dict.update(options)
+            if hasattr(connection, 'health_check_enabled'):
+                connection.health_check_enabled = options['CONN_HEALTH_CHECKS']
+            connects.clear()
+
+            def call():
+                status = wsgi_get(handler, url, token)
+                assert status == 200, status
+
+            latencies = timed_calls(call, requests)
+            stats = summarize(latencies)
+            rows.append([
+                mode,
+                len(connects),
+                '%.3f' % stats['p50_ms'],
+                '%.3f' % stats['p99_ms'],
+            ])
+
+    print(f'{connection.vendor}, {requests} requests per mode')
+    print_table(['DB_POOL_MODE', 'connects', 'p50 ms', 'p99 ms'], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.requests)
+
+
+if __name__ == '__main__':
+    main()
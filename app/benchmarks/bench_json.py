@@ -0,0 +1,82 @@
+"""
+Compara o JSONRenderer/JSONParser do DRF com o FastJSONRenderer/
+FastJSONParser do core em payloads de listagem de receitas (página
+paginada) e de criação em lote.
+
+    python -m benchmarks.bench_json [--rows N] [--rounds N]
+"""
+import argparse
+import io
+
+from benchmarks.utils import print_table, setup_django, summarize, timed_calls
+
+
+def recipe_page(rows):
+    """Retorna uma página da listagem como o RecipeSerializer a gera."""
+    from collections import OrderedDict
+
+    from rest_framework.utils.serializer_helpers import ReturnList
+
+    results = ReturnList(serializer=None)
+    for i in range(rows):
+        results.append(OrderedDict([
+            ('id', 100000 + i),
+            ('title', f'Receita {i} de pão de queijo'),
+            ('time_minutes', i % 120),
+            ('price', '%d.%02d' % (i % 1000, i % 100)),
+            ('link', f'https://example.com/receitas/{i}.pdf'),
+        ]))
+    return OrderedDict([
+        ('next', 'http://localhost/api/recipe/recipes/?cursor=cD0xMjM0'),
+        ('previous', None),
+        ('results', results),
+    ])
+
+
+def run(rows, rounds):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.parsers import FastJSONParser
+    from core.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson não está instalado: os dois caminhos usam o json.')
+
+    page = recipe_page(rows)
+    body = JSONRenderer().render(page['results'])
+    assert FastJSONRenderer().render(page) == JSONRenderer().render(page)
+
+    table = []
+    for name, func in (
+        ('render JSONRenderer', lambda: JSONRenderer().render(page)),
+        ('render FastJSONRenderer', lambda: FastJSONRenderer().render(page)),
+        ('parse JSONParser',
+         lambda: JSONParser().parse(io.BytesIO(body))),
+        ('parse FastJSONParser',
+         lambda: FastJSONParser().parse(io.BytesIO(body))),
+    ):
+        stats = summarize(timed_calls(func, rounds))
+        table.append([
+            name,
+            '%.0f' % (rows / (stats['mean_ms'] / 1000)),
+            '%.3f' % stats['p50_ms'],
+            '%.3f' % stats['p99_ms'],
+        ])
+
+    print(f'{rows} receitas por payload ({len(body)} bytes)')
+    print_table(['operation', 'rows/s', 'p50 ms', 'p99 ms'], table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.rows, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
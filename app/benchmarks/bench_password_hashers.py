@@ -0,0 +1,54 @@
+"""
+Mede os logins por segundo, por núcleo, de cada hasher de senha com o
+custo configurado em PASSWORD_HASHING (argon2-cffi e bcrypt vêm do
+requirements.txt; sem eles, o hasher aparece como ignorado).
+
+    python -m benchmarks.bench_password_hashers [--seconds N]
+"""
+import argparse
+import time
+
+from benchmarks.utils import print_table, setup_django
+
+
+def run(seconds):
+    from django.conf import settings
+    from django.contrib.auth.hashers import check_password
+    from django.utils.module_loading import import_string
+
+    rows = []
+    for path in settings.PASSWORD_HASHERS:
+        hasher = import_string(path)()
+        algorithm = hasher.algorithm
+        try:
+            encoded = hasher.encode('benchpass123', hasher.salt())
+        except ValueError as error:
+            rows.append([algorithm, '-', f'skipped: {error}'])
+            continue
+
+        logins = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            assert check_password('benchpass123', encoded)
+            logins += 1
+        elapsed = time.perf_counter() - start
+        rows.append([
+            algorithm,
+            '%.1f' % (logins / elapsed),
+            '%.2f ms' % (elapsed / logins * 1000),
+        ])
+
+    print_table(['hasher', 'logins/s/core', 'per login'], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Compara linhas/segundo da listagem de receitas entre o ModelSerializer e o
+caminho rápido de recipe.fastpath (values_list + renderização compilada),
+medindo a consulta + serialização e a requisição completa.
+
+    python -m benchmarks.bench_recipe_fastpath [--rows N] [--rounds N]
+"""
+import argparse
+import time
+
+from benchmarks.utils import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed_calls,
+)
+
+
+def run(rows, rounds):
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test.utils import override_settings
+    from django.urls import reverse
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from core.models import Recipe
+    from recipe.fastpath import get_row_renderer
+    from recipe.serializers import RecipeSerializer
+
+    user = get_user_model().objects.create_user(
+        'bench@example.com', 'benchpass123',
+    )
+    Recipe.objects.bulk_create(
+        Recipe(
+            user=user,
+            title=f'Receita {i}',
+            description='Descrição ' * 20,
+            time_minutes=i % 120,
+            price=Decimal(i % 1000) / 10,
+            link=f'http://example.com/{i}.pdf',
+        )
+        for i in range(rows)
+    )
+    queryset = Recipe.objects.filter(user=user).order_by('-id')
+    render = get_row_renderer(RecipeSerializer)
+
+    def serializer_path():
+        return RecipeSerializer(list(queryset), many=True).data
+
+    def fast_path():
+        return [render(row) for row in queryset.values_list(*render.columns)]
+
+    renderer = JSONRenderer()
+    assert renderer.render(serializer_path()) == renderer.render(fast_path())
+
+    table = []
+    for name, func in (('serializer', serializer_path),
+                       ('fast path', fast_path)):
+        stats = summarize(timed_calls(func, rounds))
+        table.append([
+            name,
+            '%.0f' % (rows / (stats['mean_ms'] / 1000)),
+            '%.2f' % stats['p50_ms'],
+            '%.2f' % stats['p95_ms'],
+        ])
+    print(f'Consulta + serialização de {rows} receitas')
+    print_table(['path', 'rows/s', 'p50 ms', 'p95 ms'], table)
+
+    # Requisição completa, com a página máxima e sem o cache de respostas.
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse('recipe:recipe-list')
+    params = {'page_size': 500}
+    table = []
+    for name, enabled in (('serializer', False), ('fast path', True)):
+        with override_settings(RECIPE_FAST_PATH=enabled):
+            latencies = []
+            for _ in range(rounds):
+                cache.clear()
+                start = time.perf_counter()
+                res = client.get(url, params)
+                latencies.append(time.perf_counter() - start)
+                assert res.status_code == 200, res.status_code
+        stats = summarize(latencies)
+        table.append([
+            name,
+            '%.0f' % (500 / (stats['mean_ms'] / 1000)),
+            '%.2f' % stats['p50_ms'],
+            '%.2f' % stats['p95_ms'],
+        ])
+    print()
+    print('GET da listagem (page_size=500)')
+    print_table(['path', 'rows/s', 'p50 ms', 'p95 ms'], table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.rows, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Mede o custo de uma verificação dos throttles por token bucket, só com os
+baldes do processo e sincronizando com o cache compartilhado.
+
+    python -m benchmarks.bench_throttle [--iterations N] [--clients N]
+"""
+import argparse
+
+from benchmarks.utils import (
+    print_table,
+    setup_django,
+    summarize,
+    timed_calls,
+)
+
+
+def run(iterations, clients):
+    from django.conf import settings
+    from django.test import override_settings
+
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from core import throttling
+
+    factory = APIRequestFactory()
+    requests = [
+        Request(factory.get('/api/recipe/recipes/', REMOTE_ADDR=f'10.0.{i}'))
+        for i in range(clients)
+    ]
+    view = type('View', (), {'throttle_scope': 'recipes'})()
+
+    rows = []
+    for label, shared in (('local', None), ('shared cache', 'default')):
+        config = {**settings.API_THROTTLE, 'ENABLED': True,
+                  'SHARED_CACHE': shared}
+        with override_settings(API_THROTTLE=config):
+            throttling.reset()
+            throttle = throttling.ScopedTokenBucketThrottle()
+            position = [0]
+
+            def check():
+                request = requests[position[0] % clients]
+                position[0] += 1
+                throttle.allow_request(request, view)
+
+            stats = summarize(timed_calls(check, iterations))
+        rows.append([
+            label,
+            '%.2f' % (stats['mean_ms'] * 1000),
+            '%.2f' % (stats['p50_ms'] * 1000),
+            '%.2f' % (stats['p99_ms'] * 1000),
+        ])
+
+    print_table(['buckets', 'mean us', 'p50 us', 'p99 us'], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.iterations, args.clients)
+
+
+if __name__ == '__main__':
+    main()
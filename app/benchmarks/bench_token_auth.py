@@ -0,0 +1,80 @@
+"""
+Compara as consultas e a latência por requisição autenticada entre a
+TokenAuthentication do DRF e a CachedTokenAuthentication do core.
+
+    python -m benchmarks.bench_token_auth [--requests N]
+"""
+import argparse
+import time
+from unittest.mock import patch
+
+from benchmarks.utils import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+)
+
+
+def run(requests):
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from core.authentication import (
+        CachedTokenAuthentication,
+        get_local_cache,
+    )
+    from user.views import ManageUserView
+
+    user = get_user_model().objects.create_user(
+        'bench@example.com', 'benchpass123',
+    )
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+    url = reverse('user:me')
+
+    rows = []
+    for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+        get_local_cache().clear()
+        with patch.object(
+            ManageUserView, 'authentication_classes', [auth_class],
+        ):
+            latencies = []
+            queries = 0
+            for _ in range(requests):
+                start = time.perf_counter()
+                with CaptureQueriesContext(connection) as ctx:
+                    res = client.get(url)
+                latencies.append(time.perf_counter() - start)
+                assert res.status_code == 200, res.status_code
+                queries += len(ctx.captured_queries)
+        stats = summarize(latencies)
+        rows.append([
+            auth_class.__name__,
+            '%.2f' % (queries / requests),
+            '%.3f' % stats['p50_ms'],
+            '%.3f' % stats['p99_ms'],
+        ])
+
+    print_table(['authentication', 'queries/req', 'p50 ms', 'p99 ms'], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Popula o banco com usuários (com token) e receitas para os benchmarks.
+
+Os usuários compartilham a mesma senha já com hash (um único hash PBKDF2
+em vez de um por usuário) e as receitas são inseridas em lotes com os
+helpers do comando import_recipes (core.db.bulk): COPY no PostgreSQL,
+bulk_create nos demais bancos. Como esses caminhos não disparam sinais,
+o resumo das receitas (core.stats) é recalculado no fim. Rodar de novo
+com o mesmo banco (ex.: --keepdb) só completa o que faltar.
+"""
+import random
+import time
+from decimal import Decimal
+
+EMAIL = 'bench{}@example.com'
+PASSWORD = 'benchpass123'
+
+TITLES = (
+    'Bolo de cenoura', 'Pão de queijo', 'Lasanha', 'Feijoada', 'Moqueca',
+    'Brigadeiro', 'Risoto de cogumelos', 'Torta de limão', 'Coxinha',
+    'Escondidinho', 'Salada caesar', 'Strogonoff', 'Pudim', 'Quiche',
+)
+WORDS = (
+    'farinha açúcar ovos leite manteiga queijo tomate cebola alho arroz '
+    'feijão batata frango carne sal pimenta azeite forno panela minutos'
+).split()
+
+
+def recipe_values(rng, number):
+    """Retorna (title, description, time_minutes, price, link)."""
+    title = '%s %d' % (rng.choice(TITLES), number)
+    description = ' '.join(rng.choices(WORDS, k=rng.randint(10, 60)))
+    return (
+        title,
+        description.capitalize() + '.',
+        rng.randint(5, 240),
+        Decimal(rng.randint(100, 99999)) / 100,
+        f'https://example.com/receitas/{number}.pdf' if number % 3 else '',
+    )
+
+
+def seed_users(count, log):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from rest_framework.authtoken.models import Token
+
+    User = get_user_model()
+    existing = User.objects.filter(email__startswith='bench').count()
+    if existing < count:
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            (
+                User(email=EMAIL.format(i), name=f'Bench {i}',
+                     password=password)
+                for i in range(existing, count)
+            ),
+            batch_size=1000,
+        )
+        users = User.objects.filter(
+            email__startswith='bench', auth_token__isnull=True,
+        )
+        Token.objects.bulk_create(
+            (Token(key=Token.generate_key(), user=user) for user in users),
+            batch_size=1000,
+        )
+        log(f'{count - existing} usuários criados')
+
+    return list(
+        User.objects.filter(email__startswith='bench')
+        .order_by('id')
+        .values_list('id', 'email', 'auth_token__key')[:count]
+    )
+
+
+def insert_batch(connection, user_ids, first, values):
+    from core.db.bulk import copy_recipes, create_recipes
+
+    insert = copy_recipes if connection.vendor == 'postgresql' \
+        else create_recipes
+    insert(
+        {
+            'user_id': user_ids[(first + offset) % len(user_ids)],
+            'title': title,
+            'description': description,
+            'time_minutes': time_minutes,
+            'price': price,
+            'link': link,
+        }
+        for offset, (title, description, time_minutes, price, link)
+        in enumerate(values)
+    )
+
+
+def seed_recipes(user_ids, count, batch_size, log):
+    from django.db import connection, transaction
+
+    from core.models import Recipe
+
+    existing = Recipe.objects.filter(user_id__in=user_ids).count()
+    rng = random.Random(existing)
+    start = time.perf_counter()
+    for first in range(existing, count, batch_size):
+        size = min(batch_size, count - first)
+        values = [recipe_values(rng, first + i) for i in range(size)]
+        with transaction.atomic():
+            insert_batch(connection, user_ids, first, values)
+        done = first + size
+        if done % (batch_size * 10) == 0 or done == count:
+            elapsed = time.perf_counter() - start
+            log('%d/%d receitas (%.0f linhas/s)' % (
+                done, count, (done - existing) / elapsed,
+            ))
+
+
+def rebuild_stats(log):
+    from core import stats
+
+    start = time.perf_counter()
+    written = stats.rebuild()
+    log('resumo de %d usuários recalculado (%.1fs)' % (
+        written, time.perf_counter() - start,
+    ))
+
+
+def sample_recipes(user_ids, per_user=20, users=100):
+    """Retorna {user_id: [ids]} de algumas receitas de alguns usuários,
+    usadas nos detalhes."""
+    from core.models import Recipe
+
+    sample = {}
+    for user_id in user_ids[:users]:
+        ids = list(
+            Recipe.objects.filter(user_id=user_id)
+            .order_by('-id')
+            .values_list('id', flat=True)[:per_user]
+        )
+        if ids:
+            sample[user_id] = ids
+    return sample
+
+
+def seed(users, recipes, batch_size=10000, log=print):
+    """Garante `users` usuários e `recipes` receitas (distribuídas entre
+    eles) e retorna (usuários, amostra de receitas).
+
+    Cada usuário é uma tupla (id, email, token).
+    """
+    accounts = seed_users(users, log)
+    user_ids = [user_id for user_id, _, _ in accounts]
+    seed_recipes(user_ids, recipes, batch_size, log)
+    rebuild_stats(log)
+    return accounts, sample_recipes(user_ids)
@@ -0,0 +1,85 @@
+"""
+Funções auxiliares compartilhadas pelos benchmarks.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django(throttle=False):
+    """Configura o Django para rodar fora do manage.py.
+
+    O rate limiting fica desligado, a menos que `throttle`: as requisições
+    dos benchmarks saem do mesmo IP e de poucos usuários, e com os limites
+    ligados eles mediriam as respostas 429.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    os.environ['API_THROTTLE_ENABLED'] = '1' if throttle else '0'
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Cria um banco de testes, como o test runner, e o destrói ao sair."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb,
+        )
+        teardown_test_environment()
+
+
+def percentile(values, pct):
+    """Retorna o percentil `pct` (0-100) de uma lista de valores."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_calls(func, iterations):
+    """Executa `func` repetidas vezes e retorna as latências em segundos."""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(latencies):
+    """Resume uma lista de latências (segundos) em milissegundos."""
+    return {
+        'count': len(latencies),
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def print_table(headers, rows):
+    """Imprime uma tabela simples alinhada."""
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows))
+        for i, h in enumerate(headers)
+    ]
+    line = '  '.join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print('-' * len(line))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
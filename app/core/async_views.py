@@ -0,0 +1,91 @@
+"""
+Utilitários das views assíncronas (ASGI) da API.
+
+O Django 3.2 ainda não tem a API assíncrona do ORM (aget, acount...,
+disponível a partir do 4.1). Por isso as views async agrupam todo o
+trabalho de banco de uma requisição em uma única chamada
+core.db.threads.database_sync_to_async (numa thread do executor, não na
+thread única do sync_to_async padrão), enquanto autenticação em cache,
+leitura do corpo e envio da resposta ficam no event loop.
+"""
+import functools
+import io
+from types import SimpleNamespace
+
+from django.http import HttpResponse
+
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+
+from core.authentication import authenticate_async
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """Resposta JSON com o primeiro renderizador de DEFAULT_RENDERER_CLASSES
+    (o JSON da API), para o mesmo corpo das views do DRF."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(
+        renderer.render(data),
+        status=status,
+        content_type=renderer.media_type,
+    )
+
+
+def parse_json(request):
+    """Retorna o corpo JSON da requisição, lido pelo primeiro parser de
+    DEFAULT_PARSER_CLASSES."""
+    parser = api_settings.DEFAULT_PARSER_CLASSES[0]()
+    return parser.parse(io.BytesIO(request.body or b'{}'))
+
+
+def check_throttles(request, throttle_scope):
+    """Aplica os DEFAULT_THROTTLE_CLASSES como o DRF, com o escopo
+    `throttle_scope`. Os token buckets do core.throttling não fazem I/O,
+    então rodam no event loop."""
+    view = SimpleNamespace(throttle_scope=throttle_scope)
+    waits = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, view):
+            waits.append(throttle.wait())
+    if waits:
+        waits = [wait for wait in waits if wait is not None]
+        raise exceptions.Throttled(max(waits, default=None))
+
+
+def async_api_view(methods, throttle_scope=None):
+    """Decorator das views async: valida o método, autentica pelo token,
+    aplica os throttles (com `throttle_scope`, como o atributo das views
+    do DRF) e converte as APIException do DRF em respostas JSON."""
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise exceptions.MethodNotAllowed(request.method)
+                auth = await authenticate_async(request)
+                if auth is None:
+                    raise exceptions.NotAuthenticated()
+                request.user, request.auth = auth
+                check_throttles(request, throttle_scope)
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as error:
+                data = error.detail
+                if not isinstance(error, exceptions.ValidationError):
+                    data = {'detail': data}
+                response = json_response(data, status=error.status_code)
+                if isinstance(error, exceptions.MethodNotAllowed):
+                    response['Allow'] = ', '.join(methods)
+                if isinstance(error, (exceptions.NotAuthenticated,
+                                      exceptions.AuthenticationFailed)):
+                    response['WWW-Authenticate'] = 'Token'
+                if getattr(error, 'wait', None):
+                    response['Retry-After'] = '%d' % error.wait
+                return response
+
+        # Autenticação só por token, como as views do DRF: sem CSRF.
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
@@ -0,0 +1,220 @@
+"""
+Autenticação por Token com cache das consultas token -> usuário.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+from core.db.threads import database_sync_to_async
+
+
+class LRUCache:
+    """Cache LRU em memória, limitado em tamanho e com TTL."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Retorna o valor da chave, ou None se ausente ou expirado."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Guarda o valor e descarta os itens menos usados recentemente."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache():
+    """Retorna o cache em memória do processo, criado sob demanda."""
+    global _local_cache
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                config = settings.TOKEN_AUTH_CACHE
+                _local_cache = LRUCache(config['MAX_SIZE'], config['TTL'])
+    return _local_cache
+
+
+def get_shared_cache():
+    """Retorna o cache compartilhado configurado, ou None."""
+    alias = settings.TOKEN_AUTH_CACHE.get('SHARED_CACHE')
+    if not alias:
+        return None
+    return caches[alias]
+
+
+# Geração dos LRUs locais, no cache compartilhado: cada invalidação a
+# incrementa, e os itens locais de uma geração anterior são descartados em
+# todos os processos, não só no que fez a alteração.
+GENERATION_KEY = 'auth:token:generation'
+
+
+def _shared_key(key):
+    # Não usa o token em texto puro como chave no cache compartilhado.
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _generation(shared):
+    """Retorna a geração atual dos LRUs locais, ou None sem o cache
+    compartilhado (um só processo, sem o que sincronizar)."""
+    if shared is None:
+        return None
+    return shared.get(GENERATION_KEY, 0)
+
+
+def invalidate_tokens(keys):
+    """Remove os tokens informados dos dois níveis de cache e, com o
+    cache compartilhado, invalida os LRUs locais dos demais processos.
+
+    A remoção é repetida após o commit, para que uma requisição
+    concorrente não repopule o cache com dados anteriores à transação.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+
+    def _invalidate():
+        local = get_local_cache()
+        for key in keys:
+            local.delete(key)
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.delete_many([_shared_key(key) for key in keys])
+            shared.add(GENERATION_KEY, 0, timeout=None)
+            try:
+                shared.incr(GENERATION_KEY)
+            except ValueError:
+                # Descartada entre o add e o incr: a geração recomeça, o
+                # que também não bate com os itens locais.
+                pass
+
+    _invalidate()
+    transaction.on_commit(_invalidate)
+
+
+def _request_copy(cached):
+    """Copia o par (usuário, token) do cache para uma requisição.
+
+    O mesmo objeto em cache atende requisições concorrentes; sem a cópia,
+    as alterações de uma (ex.: um PATCH no perfil que falha na validação)
+    vazariam para as outras e para o próprio cache.
+    """
+    user, token = cached
+    user = copy.copy(user)
+    token = copy.copy(token)
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication que evita o SELECT em authtoken_token a cada
+    requisição, guardando o par (usuário, token) em um LRU em memória e,
+    opcionalmente, em um cache compartilhado entre processos. Cada
+    requisição recebe uma cópia rasa do usuário e do token em cache.
+
+    Com o cache compartilhado, um acerto no LRU só vale se ele ainda for
+    da geração atual (GENERATION_KEY): uma leitura a mais no cache, sem ir
+    ao banco, para que tokens excluídos e usuários desativados deixem de
+    autenticar em todos os processos.
+    """
+
+    def authenticate_credentials(self, key):
+        local = get_local_cache()
+        shared = get_shared_cache()
+        # Lida antes do banco: se uma invalidação acontecer no meio, o
+        # item local fica com a geração anterior e é descartado.
+        generation = _generation(shared)
+        cached = None
+        item = local.get(key)
+        if item is not None and item[1] == generation:
+            cached = item[0]
+
+        if cached is None and shared is not None:
+            cached = shared.get(_shared_key(key))
+            if cached is not None:
+                local.set(key, (cached, generation))
+
+        if cached is None:
+            # Valida no banco (e levanta AuthenticationFailed se preciso).
+            cached = super().authenticate_credentials(key)
+            local.set(key, (cached, generation))
+            if shared is not None:
+                shared.set(
+                    _shared_key(key),
+                    cached,
+                    settings.TOKEN_AUTH_CACHE['TTL'],
+                )
+
+        return _request_copy(cached)
+
+
+async def authenticate_async(request):
+    """Versão assíncrona da CachedTokenAuthentication para views async.
+
+    Sem o cache compartilhado, um acerto no LRU local não faz I/O nem usa
+    threads; só uma falta vai ao banco por meio do sync_to_async. Com ele,
+    a conferência da geração também passa pelo sync_to_async.
+    Retorna (usuário, token), ou None se não houver cabeçalho de token.
+    """
+    authentication = CachedTokenAuthentication()
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != authentication.keyword.lower().encode():
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+    if get_shared_cache() is None:
+        item = get_local_cache().get(key)
+        if item is not None:
+            return _request_copy(item[0])
+
+    return await database_sync_to_async(
+        authentication.authenticate_credentials
+    )(key)
@@ -0,0 +1,75 @@
+"""
+Backends de autenticação.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Retorna o pool de threads (limitado) que calcula os hashes."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING['WORKERS'],
+                    thread_name_prefix='password-hash',
+                )
+    return _executor
+
+
+def hash_in_pool(func, *args):
+    """Executa uma função de hash no pool e espera o resultado."""
+    return get_executor().submit(func, *args).result()
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend que verifica as senhas em um pool de threads limitado.
+
+    Os hashers liberam o GIL, então no máximo WORKERS hashes rodam ao
+    mesmo tempo e uma rajada de logins não ocupa todos os núcleos. As
+    consultas e o rehash (quando o hasher ou o custo mudam) são feitos
+    na thread da requisição.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Calcula um hash mesmo assim, para que o tempo de resposta não
+            # revele se o usuário existe (como o ModelBackend).
+            hash_in_pool(make_password, password)
+            return None
+
+        if self.verify_password(user, password):
+            if self.user_can_authenticate(user):
+                return user
+
+        return None
+
+    def verify_password(self, user, password):
+        """Verifica a senha no pool e refaz o hash se estiver desatualizado."""
+        outdated = []
+        valid = hash_in_pool(
+            check_password, password, user.password, outdated.append,
+        )
+        if valid and outdated:
+            user.password = hash_in_pool(make_password, password)
+            user.save(update_fields=['password'])
+
+        return valid
@@ -0,0 +1,44 @@
+"""
+Backend PostgreSQL com health check das conexões persistentes.
+"""
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL com a opção CONN_HEALTH_CHECKS do Django 4.1.
+
+    Com conexões persistentes (CONN_MAX_AGE > 0) o Django 3.2 só descarta
+    uma conexão reaproveitada se ela já tiver dado erro. Com
+    CONN_HEALTH_CHECKS, a primeira consulta de cada requisição antes
+    testa a conexão (is_usable) e reconecta se ela tiver caído (ex.:
+    reinício do banco ou do PgBouncer), em vez de falhar a requisição.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_enabled = self.settings_dict.get(
+            'CONN_HEALTH_CHECKS', False,
+        )
+        self.health_check_done = False
+
+    def connect(self):
+        super().connect()
+        # Uma conexão recém-aberta não precisa ser testada.
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # Chamado no início e no fim de cada requisição.
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and self.health_check_enabled
+            and not self.health_check_done
+            and not self.in_atomic_block
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
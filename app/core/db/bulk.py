@@ -0,0 +1,52 @@
+"""
+Inserção de receitas em lote, usada pelo comando import_recipes e pela
+carga dos benchmarks.
+
+Nenhum dos dois caminhos chama save() nem dispara sinais: quem insere
+atualiza o resumo das receitas (core.stats) por conta própria.
+"""
+import csv
+import io
+
+from django.db import connection
+from django.utils import timezone
+
+from core.models import Recipe
+
+
+COPY_COLUMNS = ['user_id', 'title', 'description', 'time_minutes', 'price',
+                'link', 'updated_at']
+
+
+def create_recipes(recipes):
+    """Insere com bulk_create. Cada receita é um dicionário com o user_id
+    e os campos do modelo."""
+    Recipe.objects.bulk_create(Recipe(**attrs) for attrs in recipes)
+
+
+def copy_recipes(recipes):
+    """Insere com o COPY do PostgreSQL, recebendo os mesmos dicionários
+    de create_recipes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # O COPY não passa pelo auto_now do updated_at.
+    now = timezone.now().isoformat()
+    for attrs in recipes:
+        writer.writerow([
+            attrs['user_id'],
+            attrs['title'],
+            attrs.get('description', ''),
+            attrs['time_minutes'],
+            attrs['price'],
+            attrs.get('link', ''),
+            now,
+        ])
+    buffer.seek(0)
+
+    columns = ', '.join(COPY_COLUMNS)
+    sql = (
+        f'COPY {Recipe._meta.db_table} ({columns}) FROM STDIN '
+        'WITH (FORMAT csv, FORCE_NOT_NULL (title, description, link))'
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
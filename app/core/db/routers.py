@@ -0,0 +1,117 @@
+"""
+Roteamento das leituras para as réplicas do PostgreSQL.
+
+As views com ReplicaReadMixin atendem seus GETs dentro de
+`read_from_replica`, que manda as leituras para uma das réplicas de
+settings.DB_REPLICAS, em rodízio. Todo o resto, inclusive as escritas,
+vai para o primário ('default').
+
+Depois de uma escrita o usuário fica preso ao primário por
+DB_READ_YOUR_WRITES['TIMEOUT'] segundos (`pin`), para ler o que acabou de
+gravar mesmo com atraso na replicação.
+"""
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Alias das leituras da requisição atual (None: primário).
+_read_alias = ContextVar('read_alias', default=None)
+_replica_counter = itertools.count()
+
+
+def choose_replica():
+    """Retorna a próxima réplica do rodízio, ou None sem réplicas."""
+    replicas = settings.DB_REPLICAS
+    if not replicas:
+        return None
+    return replicas[next(_replica_counter) % len(replicas)]
+
+
+@contextmanager
+def read_from_replica(alias=None):
+    """Envia as leituras do bloco para `alias` (padrão: a próxima
+    réplica). Sem réplicas configuradas, elas continuam no primário."""
+    token = _read_alias.set(alias or choose_replica())
+    try:
+        yield _read_alias.get()
+    finally:
+        _read_alias.reset(token)
+
+
+def _pin_key(user_id):
+    return f'db:pinned:{user_id}'
+
+
+def pin(user_id):
+    """Prende as leituras do usuário ao primário por alguns segundos."""
+    config = settings.DB_READ_YOUR_WRITES
+    caches[config['ALIAS']].set(_pin_key(user_id), 1, config['TIMEOUT'])
+
+
+def is_pinned(user_id):
+    config = settings.DB_READ_YOUR_WRITES
+    return caches[config['ALIAS']].get(_pin_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    """Manda as leituras para a réplica escolhida por `read_from_replica`
+    e todo o resto para o primário."""
+
+    def db_for_read(self, model, **hints):
+        # Sem o fallback do Django para o banco da instância: um objeto
+        # lido da réplica não arrasta as leituras seguintes para ela.
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # As réplicas têm os mesmos dados do primário.
+        return True
+
+
+class ReplicaReadMixin:
+    """Atende os métodos seguros da view numa réplica, a menos que o
+    usuário tenha escrito há pouco; as escritas bem-sucedidas prendem o
+    usuário ao primário.
+
+    A autenticação roda antes, no primário: um token recém-criado pode
+    ainda não ter chegado às réplicas.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        user_id = request.user.pk
+        if (
+            settings.DB_REPLICAS
+            and request.method in SAFE_METHODS
+            and not (user_id and is_pinned(user_id))
+        ):
+            self._read_alias_token = _read_alias.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_read_alias_token', None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._read_alias_token = None
+
+        user = getattr(request, 'user', None)
+        if (
+            settings.DB_REPLICAS
+            and request.method not in SAFE_METHODS
+            and status.is_success(response.status_code)
+            and user is not None
+            and user.pk
+        ):
+            pin(user.pk)
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,30 @@
+"""
+Trabalho de banco das views assíncronas, fora do event loop.
+"""
+from asgiref.sync import sync_to_async
+
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func):
+    """Como sync_to_async, mas sem thread_sensitive.
+
+    No Django 3.2, o sync_to_async padrão (thread_sensitive=False) executa
+    o código síncrono de todas as requisições ASGI em andamento numa
+    mesma thread: as consultas de requisições concorrentes entram numa
+    fila. Aqui cada chamada usa uma thread do executor padrão, que mantém
+    a sua conexão; o close_old_connections antes e depois faz, por
+    chamada, o que os sinais request_started/request_finished fazem nas
+    requisições WSGI: aplica o CONN_MAX_AGE e descarta conexões com erro.
+
+    Como a conexão é a da thread do executor, `func` deve fazer todo o
+    trabalho de banco (inclusive transações) dentro da própria chamada.
+    """
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)
@@ -0,0 +1,43 @@
+"""
+Hashers de senha com custo configurável em PASSWORD_HASHING.
+
+O custo é lido das configurações a cada uso, então alterá-lo faz o
+`must_update` do Django marcar as senhas antigas, que são refeitas de
+forma transparente no próximo login.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunablePBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 com número de iterações configurável."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHING['PBKDF2_ITERATIONS']
+
+
+class TunableArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 com custos de tempo, memória e paralelismo configuráveis.
+    Requer o pacote argon2-cffi."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHING['ARGON2_TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHING['ARGON2_MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHING['ARGON2_PARALLELISM']
+
+
+class TunableBCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt (sobre SHA256) com número de rounds configurável.
+    Requer o pacote bcrypt."""
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_HASHING['BCRYPT_ROUNDS']
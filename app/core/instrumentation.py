@@ -0,0 +1,79 @@
+"""
+Medição das fases de cada requisição (banco, serialização), usada pelo
+core.middleware.RequestMetricsMiddleware.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+
+# Tempos (segundos) da requisição atual, por fase; None fora do
+# middleware, quando as medições viram no-ops.
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def start_request():
+    """Começa a medir uma requisição e retorna (token, tempos)."""
+    timings = {'db': 0.0, 'queries': 0, 'serialize': 0.0}
+    return _timings.set(timings), timings
+
+
+def finish_request(token):
+    _timings.reset(token)
+
+
+def add_time(phase, seconds):
+    """Soma `seconds` à fase da requisição atual, se houver uma."""
+    timings = _timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timer(phase):
+    """Mede o bloco e soma a duração à fase da requisição atual."""
+    if _timings.get() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    """execute_wrapper que conta as consultas e soma o tempo no banco da
+    requisição atual.
+
+    Fica instalado em todas as conexões (ver install_query_timer), em vez
+    de ser ligado pelo middleware às conexões da sua thread: sob ASGI as
+    consultas rodam nas threads do sync_to_async, que recebem uma cópia do
+    contexto e, com ela, os tempos da requisição.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings['db'] += time.perf_counter() - start
+        timings['queries'] += 1
+
+
+def install_query_timer(connection):
+    """Instala time_query na conexão, uma única vez."""
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class TimedSerializerMixin:
+    """Conta o tempo de `serializer.data` como a fase `serialize`."""
+
+    @property
+    def data(self):
+        with timer('serialize'):
+            return super().data
@@ -0,0 +1,238 @@
+"""
+Django command to bulk import recipes from NDJSON or CSV.
+"""
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from core.db.bulk import copy_recipes, create_recipes
+from core.models import ImportCheckpoint, Recipe
+from core.signals import recipes_changed
+from recipe.serializers import RecipeDetailSerializer
+
+
+class MalformedRow:
+    """Linha que não pôde ser lida, contada e reportada como inválida."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def read_ndjson(stream):
+    """Gera um dicionário por linha não vazia do NDJSON, ou um
+    MalformedRow quando a linha não é um JSON válido."""
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            yield MalformedRow(f'invalid JSON on line {number}: {error}')
+
+
+def read_csv(stream):
+    """Gera um dicionário por linha do CSV (com cabeçalho)."""
+    yield from csv.DictReader(stream)
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+class Command(BaseCommand):
+    """Django command to import recipes in chunks."""
+    help = (
+        'Import recipes for a user from an NDJSON or CSV file (or stdin), '
+        'validating each row with the recipe serializer and inserting in '
+        'one transaction per chunk. Progress is saved to the database in '
+        'the same transaction as each chunk so an interrupted import can '
+        '--resume.'
+    )
+    stealth_options = ('stdin',)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='File to import, or "-" for stdin (default).',
+        )
+        parser.add_argument(
+            '--user', required=True,
+            help='Email of the user that will own the recipes.',
+        )
+        parser.add_argument(
+            '--format', choices=sorted(READERS), dest='input_format',
+            help='Input format (default: from the file extension, or ndjson).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Rows validated and inserted per transaction.',
+        )
+        parser.add_argument(
+            '--copy', action='store_true',
+            help='Insert with PostgreSQL COPY instead of bulk_create.',
+        )
+        parser.add_argument(
+            '--skip-invalid', action='store_true',
+            help='Report and skip invalid rows instead of stopping.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint name (default: the absolute path of the file).',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Skip the rows already imported according to the checkpoint.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path']
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be a positive integer.')
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('--copy is only available on PostgreSQL.')
+
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist.')
+
+        input_format = options['input_format']
+        if input_format is None:
+            input_format = 'csv' if path.endswith('.csv') else 'ndjson'
+
+        source = options['checkpoint']
+        if source is None and path != '-':
+            source = os.path.abspath(path)
+        if options['resume'] and source is None:
+            raise CommandError('--resume from stdin requires --checkpoint.')
+
+        if source is None:
+            checkpoint = None
+        else:
+            checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+                user=user, source=source,
+            )
+            if options['resume']:
+                self.stdout.write(
+                    f'Resuming after row {checkpoint.rows_read} '
+                    f'({checkpoint.rows_imported} recipes already imported).'
+                )
+            else:
+                checkpoint.rows_read = checkpoint.rows_imported = 0
+                checkpoint.save()
+        progress = {
+            'rows_read': checkpoint.rows_read if checkpoint else 0,
+            'rows_imported': checkpoint.rows_imported if checkpoint else 0,
+        }
+
+        if path == '-':
+            stream = options.get('stdin', sys.stdin)
+            self.run(stream, input_format, user, progress, checkpoint,
+                     options)
+        else:
+            with open(path, newline='', encoding='utf-8') as stream:
+                self.run(stream, input_format, user, progress, checkpoint,
+                         options)
+
+    def run(self, stream, input_format, user, progress, checkpoint,
+            options):
+        """Lê, valida e insere as receitas em blocos."""
+        rows = READERS[input_format](stream)
+        # Retoma após as linhas já gravadas no último bloco confirmado.
+        rows = islice(rows, progress['rows_read'], None)
+        serializer = RecipeDetailSerializer()
+        insert = self.copy_chunk if options['copy'] else self.create_chunk
+
+        imported = 0
+        start = time.perf_counter()
+        while True:
+            chunk = list(islice(rows, options['chunk_size']))
+            if not chunk:
+                break
+
+            first_row = progress['rows_read'] + 1
+            valid = self.validate_chunk(
+                serializer, chunk, first_row, options['skip_invalid'],
+            )
+            progress['rows_read'] += len(chunk)
+            progress['rows_imported'] += len(valid)
+            # O checkpoint é gravado na transação do bloco: ou os dois
+            # são confirmados, ou nenhum.
+            with transaction.atomic():
+                if valid:
+                    insert(user, valid)
+                    recipes_changed.send(
+                        sender=Recipe, user_id=user.pk,
+                        added=[
+                            (attrs['time_minutes'], attrs['price'])
+                            for attrs in valid
+                        ],
+                    )
+                if checkpoint is not None:
+                    ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                        rows_read=progress['rows_read'],
+                        rows_imported=progress['rows_imported'],
+                        updated_at=timezone.now(),
+                    )
+            imported += len(valid)
+
+            if options['verbosity'] >= 2:
+                self.stdout.write(
+                    f'Committed rows {first_row}-{progress["rows_read"]} '
+                    f'({self.rate(imported, start):.0f} rows/s)'
+                )
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} recipes in {elapsed:.2f}s '
+            f'({self.rate(imported, start):.0f} rows/s).'
+        ))
+
+    def validate_chunk(self, serializer, chunk, first_row, skip_invalid):
+        """Valida as linhas com as regras do serializador de receitas.
+
+        Reaproveita uma única instância do serializador, evitando criar
+        os campos do DRF a cada linha.
+        """
+        valid = []
+        for number, row in enumerate(chunk, start=first_row):
+            if isinstance(row, MalformedRow):
+                message = f'Row {number}: {row.message}'
+            else:
+                try:
+                    valid.append(serializer.run_validation(row))
+                    continue
+                except ValidationError as error:
+                    message = f'Row {number}: {error.detail}'
+            if not skip_invalid:
+                raise CommandError(
+                    message + ' (nothing from this chunk was imported)'
+                )
+            self.stderr.write(message)
+
+        return valid
+
+    def create_chunk(self, user, valid):
+        create_recipes({'user_id': user.pk, **attrs} for attrs in valid)
+
+    def copy_chunk(self, user, valid):
+        copy_recipes({'user_id': user.pk, **attrs} for attrs in valid)
+
+    def rate(self, rows, start):
+        elapsed = time.perf_counter() - start
+        return rows / elapsed if elapsed else 0.0
@@ -0,0 +1,36 @@
+"""
+Django command to delete the old recipe deletion tombstones.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import RecipeTombstone
+
+
+class Command(BaseCommand):
+    """Django command to purge core.models.RecipeTombstone."""
+    help = (
+        'Delete the recipe deletion tombstones older than '
+        'RECIPE_SYNC["TOMBSTONE_DAYS"]. Sync cursors older than that are '
+        'rejected, so those clients download the full list again. Run it '
+        'periodically (e.g. daily from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.RECIPE_SYNC['TOMBSTONE_DAYS'],
+            help='Keep the tombstones of the last DAYS days.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        limit = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = RecipeTombstone.objects.filter(
+            deleted_at__lt=limit,
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} recipe tombstone(s).'
+        ))
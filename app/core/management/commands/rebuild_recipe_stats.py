@@ -0,0 +1,44 @@
+"""
+Django command to rebuild the per-user recipe stats from scratch.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core import stats
+
+
+class Command(BaseCommand):
+    """Django command to rebuild core.models.RecipeStats."""
+    help = (
+        'Recompute the recipe stats summary (count, time and price '
+        'aggregates) of every user, or only of the given users, with one '
+        'grouped aggregate query. Use it after writes that bypass the '
+        'signals, such as raw SQL or loading fixtures.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', dest='users', metavar='EMAIL',
+            help='Only rebuild this user (may be repeated).',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        user_ids = None
+        if options['users']:
+            found = dict(
+                get_user_model().objects.filter(email__in=options['users'])
+                .values_list('email', 'id')
+            )
+            missing = [email for email in options['users']
+                       if email not in found]
+            if missing:
+                raise CommandError(
+                    'User(s) not found: %s.' % ', '.join(missing)
+                )
+            user_ids = list(found.values())
+
+        written = stats.rebuild(user_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt recipe stats for {written} user(s).'
+        ))
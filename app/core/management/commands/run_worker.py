@@ -0,0 +1,117 @@
+"""
+Django command to run the background task workers.
+"""
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core import taskqueue
+
+
+class Worker:
+    """Laço de um processo do pool, que para no SIGTERM/SIGINT depois de
+    terminar a tarefa atual."""
+
+    def __init__(self, batch_size, poll_interval, once):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.once = once
+        self.stopping = False
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def __call__(self):
+        previous = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            return taskqueue.work(
+                batch_size=self.batch_size,
+                poll_interval=self.poll_interval,
+                once=self.once,
+                should_stop=lambda: self.stopping,
+            )
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+
+class Command(BaseCommand):
+    """Django command to process the task queue."""
+    help = (
+        'Run a pool of worker processes that execute the queued background '
+        'tasks. Workers claim tasks with SELECT ... FOR UPDATE SKIP LOCKED, '
+        'so any number of run_worker commands can share one queue.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.TASKS['PROCESSES'],
+            help='Worker processes in the pool (1 runs in this process).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TASKS['BATCH_SIZE'],
+            help='Tasks claimed per query.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=settings.TASKS['POLL_INTERVAL'],
+            help='Seconds to wait when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit when the queue is empty instead of polling.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['processes'] < 1 or options['batch_size'] < 1:
+            raise CommandError(
+                '--processes and --batch-size must be positive integers.'
+            )
+        taskqueue.discover()
+        self.stdout.write(
+            'Starting %d worker(s) for %d task type(s)...'
+            % (options['processes'], len(taskqueue.registry))
+        )
+
+        worker = Worker(
+            options['batch_size'], options['poll_interval'], options['once'],
+        )
+        if options['processes'] == 1:
+            done = worker()
+            connections.close_all()
+            self.stdout.write(self.style.SUCCESS(f'{done} task(s) done.'))
+            return
+
+        # Os filhos abrem as próprias conexões: nenhuma é herdada no fork.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=self.run_child, args=(worker,))
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            # Repassa a parada aos workers, que terminam a tarefa atual.
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
+
+    @staticmethod
+    def run_child(worker):
+        worker()
+        connections.close_all()
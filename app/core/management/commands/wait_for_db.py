@@ -5,6 +5,7 @@ import time
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.db import connections
 from django.db.utils import OperationalError
 from django.core.management.base import BaseCommand
 
@@ -23,6 +24,11 @@ class Command(BaseCommand):
                 db_up = True
             except (Psycopg2OpError, OperationalError):
                 self.stdout.write('Database unavailable, waiting 1 second...')
+                # Com conexões persistentes a conexão quebrada seria
+                # reaproveitada na próxima tentativa: descarta e reconecta.
+                connections.close_all()
                 time.sleep(1)
 
+        # Devolve a conexão, para não ocupar uma vaga do pool (PgBouncer).
+        connections.close_all()
         self.stdout.write(self.style.SUCCESS('Database available!'))
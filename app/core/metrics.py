@@ -0,0 +1,146 @@
+"""
+Métricas do processo, expostas no formato de texto do Prometheus.
+"""
+import bisect
+import threading
+
+
+class Counter:
+    """Contador monotônico, opcionalmente com labels."""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def samples(self):
+        """Gera (sufixo, labels, valor) de cada série do contador."""
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield '', dict(zip(self.labelnames, key)), value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Histograma com buckets cumulativos, opcionalmente com labels."""
+    type = 'histogram'
+
+    # Buckets padrão dos clientes do Prometheus (segundos).
+    DEFAULT_BUCKETS = (
+        .005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 7.5, 10,
+    )
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, amount, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, amount)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Contagem por bucket (+ o +Inf no fim), soma e total.
+                series = self._values[key] = [
+                    [0] * (len(self.buckets) + 1), 0, 0,
+                ]
+            series[0][index] += 1
+            series[1] += amount
+            series[2] += 1
+
+    def count(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._values.get(key)
+        return series[2] if series else 0
+
+    def samples(self):
+        """Gera (sufixo, labels, valor) dos buckets, da soma e do total
+        de cada série."""
+        with self._lock:
+            values = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._values.items()
+            ]
+        for key, counts, total, count in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(
+                self.buckets + (float('inf'),), counts,
+            ):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else str(float(bound))
+                yield '_bucket', {**labels, 'le': le}, cumulative
+            yield '_sum', labels, total
+            yield '_count', labels, count
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register(metric):
+    """Registra a métrica, ou retorna a já registrada com o mesmo nome."""
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name, documentation, labelnames=()):
+    return register(Counter(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=None):
+    return register(Histogram(name, documentation, labelnames, buckets))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '%s="%s"' % (
+            name,
+            value.replace('\\', r'\\').replace('\n', r'\n')
+            .replace('"', r'\"'),
+        )
+        for name, value in labels.items()
+    )
+    return '{%s}' % pairs
+
+
+def render_prometheus():
+    """Retorna todas as métricas registradas no formato de texto 0.0.4."""
+    lines = []
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for suffix, labels, value in metric.samples():
+            lines.append(
+                f'{metric.name}{suffix}{_format_labels(labels)} {value}'
+            )
+
+    return '\n'.join(lines) + '\n'
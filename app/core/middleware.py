@@ -0,0 +1,314 @@
+"""
+Middlewares do core.
+"""
+import asyncio
+import time
+import zlib
+
+from asgiref.sync import markcoroutinefunction
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from core import instrumentation, metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+LABELS = ['view', 'method']
+
+request_duration = metrics.histogram(
+    'http_request_duration_seconds',
+    'Total request latency, until the response is rendered.',
+    LABELS,
+)
+request_db_duration = metrics.histogram(
+    'http_request_db_duration_seconds',
+    'Time spent executing SQL queries per request.',
+    LABELS,
+)
+request_db_queries = metrics.histogram(
+    'http_request_db_queries',
+    'SQL queries executed per request.',
+    LABELS,
+    QUERY_BUCKETS,
+)
+request_serialize_duration = metrics.histogram(
+    'http_request_serialize_duration_seconds',
+    'Time spent serializing and rendering the response per request.',
+    LABELS,
+)
+
+
+class RequestMetricsMiddleware:
+    """Mede, por view, as consultas SQL, o tempo no banco, o tempo de
+    serialização/renderização e a latência total de cada requisição.
+
+    Os valores vão para os histogramas expostos em /api/metrics/ e, com
+    REQUEST_METRICS['SERVER_TIMING'], também para o header Server-Timing.
+    Desligado em REQUEST_METRICS['ENABLED'], o middleware sai da pilha
+    (MiddlewareNotUsed) e não custa nada por requisição. Sob ASGI ele roda
+    no event loop (async), sem levar cada requisição à thread única do
+    sync_to_async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.REQUEST_METRICS
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = config['SERVER_TIMING']
+        self.async_mode = asyncio.iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        token, timings = instrumentation.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        return self.record(request, response, start, timings)
+
+    async def __acall__(self, request):
+        """Versão async de __call__, para a pilha ASGI não passar por
+        sync_to_async a cada requisição."""
+        start = time.perf_counter()
+        token, timings = instrumentation.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        return self.record(request, response, start, timings)
+
+    def record(self, request, response, start, timings):
+        """Registra as medições da requisição iniciada em `start`."""
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        labels = {
+            'view': match.view_name if match else '<unresolved>',
+            'method': request.method,
+        }
+        request_duration.observe(total, **labels)
+        request_db_duration.observe(timings['db'], **labels)
+        request_db_queries.observe(timings['queries'], **labels)
+        request_serialize_duration.observe(timings['serialize'], **labels)
+
+        if self.server_timing:
+            response['Server-Timing'] = ', '.join([
+                'db;dur=%.3f;desc="%d queries"' % (
+                    timings['db'] * 1000, timings['queries'],
+                ),
+                'serialize;dur=%.3f' % (timings['serialize'] * 1000),
+                'total;dur=%.3f' % (total * 1000),
+            ])
+        return response
+
+    def process_template_response(self, request, response):
+        """Soma a renderização das respostas do DRF (que acontece depois
+        da view) à fase de serialização."""
+        start = time.perf_counter()
+
+        def rendered(response):
+            instrumentation.add_time(
+                'serialize', time.perf_counter() - start,
+            )
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+def accepted_encodings(header):
+    """Converte o header Accept-Encoding em {codificação: q}."""
+    encodings = {}
+    for item in header.lower().split(','):
+        name, *params = (part.strip() for part in item.split(';'))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+class _GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, level):
+        # wbits=31: formato gzip (cabeçalho e CRC), sem data no cabeçalho.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self, data):
+        return (
+            self._compressor.compress(data)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self._compressor.process(data)
+
+    def flush(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Comprime as respostas com brotli ou gzip, conforme o
+    Accept-Encoding do cliente (brotli só com o pacote instalado; no
+    empate de q, ele tem preferência).
+
+    Só comprime os content types de RESPONSE_COMPRESSION['CONTENT_TYPES']
+    (um item terminado em '/' vale para o tipo inteiro, ex.: 'text/') e,
+    fora do streaming, corpos com pelo menos MIN_SIZE bytes, mantendo o
+    original quando a compressão não reduz o tamanho. Respostas em
+    streaming (ex.: a exportação) são comprimidas bloco a bloco, sem
+    juntar o corpo em memória nem atrasar o envio de cada bloco. Uma ETag
+    forte vira fraca, já que o corpo muda com a codificação. Como o
+    RequestMetricsMiddleware, roda em modo async na pilha ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.RESPONSE_COMPRESSION
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_size = config['MIN_SIZE']
+        self.gzip_level = config['GZIP_LEVEL']
+        self.brotli_quality = config['BROTLI_QUALITY']
+        self.content_types = tuple(config['CONTENT_TYPES'])
+        self.async_mode = asyncio.iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        """Comprime a resposta, se o cliente e o content type permitirem."""
+        if (
+            response.has_header('Content-Encoding')
+            or not self.compressible(response)
+        ):
+            return response
+        # O corpo depende do Accept-Encoding, mesmo quando não é comprimido.
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if request.method == 'HEAD' or response.status_code in (204, 304):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        encoder = self.get_encoder(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+        )
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            # Corpos async (StreamingHttpResponse com iterador async, a
+            # partir do Django 4.2) continuam async.
+            compress_stream = (
+                self.compress_async_stream
+                if getattr(response, 'is_async', False)
+                else self.compress_stream
+            )
+            response.streaming_content = compress_stream(
+                encoder, response.streaming_content,
+            )
+            del response['Content-Length']
+        else:
+            content = encoder.process(response.content) + encoder.finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoder.name
+        return response
+
+    def compressible(self, response):
+        media_type = response.get('Content-Type', '').partition(';')[0]
+        media_type = media_type.strip().lower()
+        return any(
+            media_type.startswith(rule) if rule.endswith('/')
+            else media_type == rule
+            for rule in self.content_types
+        )
+
+    def get_encoder(self, accept_encoding):
+        """Escolhe a codificação de maior q aceita pelo cliente."""
+        encodings = accepted_encodings(accept_encoding)
+        default = encodings.get('*', 0.0)
+        candidates = [('gzip', encodings.get('gzip', default))]
+        if brotli is not None:
+            candidates.insert(0, ('br', encodings.get('br', default)))
+        name, q = max(candidates, key=lambda candidate: candidate[1])
+        if q <= 0:
+            return None
+        if name == 'br':
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    @staticmethod
+    def compress_stream(encoder, chunks):
+        """Comprime os blocos à medida que são gerados, com um flush por
+        bloco: cada um chega ao cliente assim que é produzido (ex.: a
+        primeira página da exportação), sem esperar o buffer do
+        compressor encher."""
+        for chunk in chunks:
+            data = encoder.flush(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def compress_async_stream(encoder, chunks):
+        """Como compress_stream, para um corpo async."""
+        async for chunk in chunks:
+            data = encoder.flush(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
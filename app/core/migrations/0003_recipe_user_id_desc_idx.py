@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-16 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_recipe'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', '-id'], name='core_recipe_user_id_desc_idx'),
+        ),
+    ]
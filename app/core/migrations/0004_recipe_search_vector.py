@@ -0,0 +1,72 @@
+# Generated by Django 3.2.25 on 2026-10-16 20:40
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Só no PostgreSQL: nos outros bancos a busca usa icontains e o campo
+# search_vector fica nulo. A configuração 'simple' (sem stemming) atende
+# títulos em vários idiomas e deve ser a mesma de recipe.search.
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    CREATE FUNCTION core_recipe_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER core_recipe_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON core_recipe
+    FOR EACH ROW EXECUTE FUNCTION core_recipe_search_vector_update()
+    """,
+    # Dispara o trigger para preencher as receitas existentes.
+    'UPDATE core_recipe SET title = title',
+    """
+    CREATE INDEX core_recipe_search_vector_gin
+    ON core_recipe USING gin (search_vector)
+    """,
+    """
+    CREATE INDEX core_recipe_title_trgm_gin
+    ON core_recipe USING gin (title gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS core_recipe_title_trgm_gin',
+    'DROP INDEX IF EXISTS core_recipe_search_vector_gin',
+    'DROP TRIGGER IF EXISTS core_recipe_search_vector_trigger ON core_recipe',
+    'DROP FUNCTION IF EXISTS core_recipe_search_vector_update()',
+]
+
+
+def postgres_only(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_recipe_user_id_desc_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            postgres_only(POSTGRES_FORWARD),
+            postgres_only(POSTGRES_BACKWARD),
+        ),
+    ]
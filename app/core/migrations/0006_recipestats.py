@@ -0,0 +1,67 @@
+# Generated by Django 3.2.25 on 2026-10-16 20:56
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+import django.db.models.deletion
+
+
+def build_stats(apps, schema_editor):
+    """Preenche o resumo de todos os usuários existentes (mesma lógica de
+    core.stats.rebuild, com os modelos históricos)."""
+    User = apps.get_model('core', 'User')
+    Recipe = apps.get_model('core', 'Recipe')
+    RecipeStats = apps.get_model('core', 'RecipeStats')
+    db = schema_editor.connection.alias
+
+    totals = {
+        row['user_id']: row
+        for row in Recipe.objects.using(db).order_by().values(
+            'user_id',
+        ).annotate(
+            count=Count('id'),
+            time_minutes_sum=Sum('time_minutes'),
+            price_sum=Sum('price'),
+            price_min=Min('price'),
+            price_max=Max('price'),
+        )
+    }
+    RecipeStats.objects.using(db).bulk_create(
+        (
+            RecipeStats(
+                user_id=user_id,
+                count=totals.get(user_id, {}).get('count', 0),
+                time_minutes_sum=totals.get(user_id, {}).get(
+                    'time_minutes_sum', 0,
+                ),
+                price_sum=totals.get(user_id, {}).get('price_sum', 0),
+                price_min=totals.get(user_id, {}).get('price_min'),
+                price_max=totals.get(user_id, {}).get('price_max'),
+            )
+            for user_id in User.objects.using(db).values_list(
+                'id', flat=True,
+            )
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_recipe_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recipe_stats', serialize=False, to='core.user')),
+                ('count', models.IntegerField(default=0)),
+                ('time_minutes_sum', models.BigIntegerField(default=0)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=17)),
+                ('price_min', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('price_max', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+            ],
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,9 @@
 Database models.
 """
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -45,6 +47,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
 
 
+class RecipeManager(models.Manager):
+    """Manager das receitas."""
+
+    def get_queryset(self):
+        """Não carrega o search_vector, usado apenas dentro das consultas
+        de busca."""
+        return super().get_queryset().defer('search_vector')
+
+
 class Recipe(models.Model):
     """Tabela de Receitas"""
     user = models.ForeignKey(
@@ -56,6 +67,170 @@ class Recipe(models.Model):
     time_minutes = models.IntegerField()
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
+    # Mantido pelo trigger core_recipe_search_vector_update no PostgreSQL
+    # (ver migração 0004); fica nulo nos outros bancos.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Cursor da sincronização incremental (ver recipe.sync). Os caminhos
+    # em lote que não passam pelo save() (bulk_update, COPY) preenchem o
+    # valor explicitamente.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RecipeManager()
+
+    class Meta:
+        indexes = [
+            # Atende o filtro por usuário + ordenação por id decrescente
+            # da listagem paginada por cursor.
+            models.Index(
+                fields=['user', '-id'],
+                name='core_recipe_user_id_desc_idx',
+            ),
+            # Filtros por faixa e ordenações da listagem (?ordering=);
+            # o id no fim serve de desempate para o cursor.
+            models.Index(
+                fields=['user', 'time_minutes', 'id'],
+                name='core_recipe_user_time_idx',
+            ),
+            models.Index(
+                fields=['user', 'price', 'id'],
+                name='core_recipe_user_price_idx',
+            ),
+            models.Index(
+                fields=['user', 'title', 'id'],
+                name='core_recipe_user_title_idx',
+            ),
+            # Alterações desde o cursor da sincronização, em ordem.
+            models.Index(
+                fields=['user', 'updated_at', 'id'],
+                name='core_recipe_user_updated_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Guarda os valores lidos do banco, usados para desfazer a
+        contribuição antiga da receita no RecipeStats ao salvá-la."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class RecipeTombstone(models.Model):
+    """Marca de uma receita excluída, para que a sincronização informe a
+    exclusão aos clientes (ver recipe.sync). As marcas mais antigas que
+    RECIPE_SYNC['TOMBSTONE_DAYS'] são removidas pelo comando
+    purge_recipe_tombstones."""
+    # Sem chave estrangeira no banco: as marcas são gravadas no
+    # post_delete das receitas, inclusive na exclusão em cascata do
+    # próprio usuário.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    recipe_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'deleted_at', 'recipe_id'],
+                name='core_tombstone_user_idx',
+            ),
+        ]
+
+
+class RecipeStats(models.Model):
+    """Resumo das receitas de cada usuário, mantido incrementalmente
+    (ver core.stats) para que as estatísticas sejam lidas em uma única
+    linha, sem varrer as receitas."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='recipe_stats',
+    )
+    count = models.IntegerField(default=0)
+    time_minutes_sum = models.BigIntegerField(default=0)
+    price_sum = models.DecimalField(
+        max_digits=17, decimal_places=2, default=0,
+    )
+    price_min = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    price_max = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+
+    @property
+    def time_minutes_avg(self):
+        if not self.count:
+            return None
+        return round(self.time_minutes_sum / self.count, 2)
+
+    @property
+    def price_avg(self):
+        if not self.count:
+            return None
+        return self.price_sum / self.count
+
+
+class Task(models.Model):
+    """Tarefa da fila em banco (ver core.taskqueue), executada fora da
+    requisição pelo `manage.py run_worker`."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Só as pendentes, na ordem em que os workers as pegam; as
+            # concluídas são excluídas e a tabela continua pequena.
+            models.Index(
+                fields=['run_after', 'id'],
+                name='core_task_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ImportCheckpoint(models.Model):
+    """Progresso de uma importação do comando import_recipes, gravado na
+    mesma transação de cada bloco, para que o --resume nunca repita nem
+    pule linhas."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    source = models.CharField(max_length=1024)
+    rows_read = models.BigIntegerField(default=0)
+    rows_imported = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'source'],
+                name='core_importcheckpoint_unique',
+            ),
+        ]
@@ -0,0 +1,30 @@
+"""
+Parsers da API.
+"""
+from django.conf import settings
+
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser que lê o corpo com o orjson, quando instalado.
+
+    Como o JSONParser em modo STRICT_JSON, recusa NaN e infinito. Usa o
+    JSONParser do DRF quando o orjson não está instalado ou quando o
+    corpo não está em UTF-8.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
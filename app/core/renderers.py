@@ -0,0 +1,67 @@
+"""
+Renderizadores da API.
+"""
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+
+class PrometheusTextRenderer(renderers.BaseRenderer):
+    """Renderiza texto puro no formato de exposição do Prometheus."""
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # Respostas de erro do DRF, ex.: {'detail': '...'}
+            data = '\n'.join(f'{k}: {v}' for k, v in data.items()) + '\n'
+        return data.encode(self.charset)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer que serializa com o orjson, quando instalado.
+
+    Datas e UUIDs são tratados pelo próprio orjson; o restante (Decimal,
+    strings lazy de tradução, timedelta, QuerySet...) passa pelo
+    `default` do encoder do DRF, então a saída é a mesma do JSONRenderer
+    compacto. Usa o JSONRenderer do DRF (módulo json) quando o orjson não
+    está instalado, quando a resposta pede indentação, quando UNICODE_JSON
+    ou COMPACT_JSON estão desligados ou quando o orjson recusa os dados
+    (ex.: inteiros acima de 64 bits). Diferente do modo STRICT_JSON do
+    DRF, NaN e infinito saem como null.
+    """
+    options = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context,
+            )
+
+        try:
+            ret = orjson.dumps(
+                data, default=JSONEncoder().default, option=self.options,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context,
+            )
+
+        # Mesmo escape do JSONRenderer para U+2028 e U+2029.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+            ret = ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
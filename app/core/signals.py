@@ -0,0 +1,226 @@
+"""
+Receptores de sinais dos modelos do core.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from rest_framework.authtoken.models import Token
+
+from core import authentication, instrumentation, stats, tasks, versions
+from core.models import Recipe, RecipeStats, RecipeTombstone, User
+
+
+# Enviado pelas operações em lote (bulk_create, bulk_update, DELETE em um
+# único comando, COPY), que não disparam post_save/post_delete por receita.
+# Argumentos: user_id e recipe_ids (ids afetados, quando conhecidos);
+# opcionalmente added e removed, com os pares (time_minutes, price) que
+# entraram e saíram. Sem eles o resumo do usuário é recalculado por uma
+# tarefa em segundo plano.
+recipes_changed = Signal()
+
+# Receitas excluídas dentro de batch_recipe_deletes(), ou None fora dele.
+_deleted_recipes = ContextVar('deleted_recipes', default=None)
+# Usuários sendo excluídos, cujas receitas saem em cascata.
+_deleting_users = ContextVar('deleting_users', default=frozenset())
+
+
+@contextmanager
+def batch_recipe_deletes():
+    """Agrupa os post_delete das receitas excluídas no bloco (ex.: por
+    QuerySet.delete()): em vez de versão, resumo e marca de exclusão por
+    receita, grava as marcas com um bulk_create e envia um único
+    recipes_changed por dono ao sair do bloco sem erro.
+
+    Produz a lista das receitas excluídas, como tuplas
+    (id, user_id, (time_minutes, price)).
+    """
+    deleted = []
+    token = _deleted_recipes.set(deleted)
+    try:
+        yield deleted
+    finally:
+        _deleted_recipes.reset(token)
+
+    RecipeTombstone.objects.bulk_create([
+        RecipeTombstone(user_id=user_id, recipe_id=pk)
+        for pk, user_id, _ in deleted
+    ])
+    by_user = {}
+    for pk, user_id, values in deleted:
+        by_user.setdefault(user_id, []).append((pk, values))
+    for user_id, recipes in by_user.items():
+        recipes_changed.send(
+            sender=Recipe, user_id=user_id,
+            recipe_ids=[pk for pk, _ in recipes],
+            removed=[values for _, values in recipes],
+        )
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Remove do cache de autenticação o token salvo ou excluído."""
+    authentication.invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_tokens(sender, instance, created, **kwargs):
+    """Remove do cache os tokens do usuário salvo (ex.: desativado), para
+    que o usuário em cache nunca fique desatualizado.
+
+    A exclusão do usuário apaga os tokens em cascata, o que já dispara
+    `invalidate_cached_token`.
+    """
+    if created:
+        return
+    keys = Token.objects.filter(user_id=instance.pk).values_list(
+        'key', flat=True,
+    )
+    authentication.invalidate_tokens(keys)
+
+
+@receiver(pre_delete, sender=User)
+def mark_user_deleting(sender, instance, **kwargs):
+    """Marca o usuário cuja exclusão vai apagar as receitas em cascata
+    (o Collector envia todos os pre_delete antes de excluir)."""
+    _deleting_users.set(_deleting_users.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=User)
+def unmark_user_deleting(sender, instance, **kwargs):
+    """Desfaz a marca; os post_delete das receitas já foram enviados."""
+    _deleting_users.set(_deleting_users.get() - {instance.pk})
+
+
+@receiver(request_started)
+def reset_deleting_users(sender, **kwargs):
+    """Descarta marcas de uma exclusão que falhou (sem post_delete)."""
+    _deleting_users.set(frozenset())
+
+
+def owner_deleted(instance):
+    """Indica se a receita sai junto com o dono, na exclusão dele."""
+    return instance.user_id in _deleting_users.get()
+
+
+@receiver(post_save, sender=User)
+def start_recipe_version(sender, instance, created, **kwargs):
+    """Começa o novo usuário com uma versão nova da coleção de receitas,
+    para nunca herdar respostas em cache de um id reutilizado."""
+    if created:
+        versions.bump(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def create_recipe_stats(sender, instance, created, **kwargs):
+    """Cria o resumo (vazio) das receitas do novo usuário."""
+    if created:
+        RecipeStats.objects.create(user=instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def collect_batched_recipe_delete(sender, instance, **kwargs):
+    """Guarda a receita excluída dentro de batch_recipe_deletes(); os
+    receptores de post_delete abaixo a ignoram (ver `batched`)."""
+    deleted = _deleted_recipes.get()
+    if deleted is not None:
+        deleted.append((
+            instance.pk,
+            instance.user_id,
+            (instance.time_minutes, instance.price),
+        ))
+
+
+def batched():
+    """Indica se as exclusões de receitas são tratadas por
+    batch_recipe_deletes()."""
+    return _deleted_recipes.get() is not None
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def bump_recipe_version(sender, instance, signal, **kwargs):
+    """Troca a versão da receita e da coleção do dono."""
+    if signal is post_delete and batched():
+        return
+    versions.bump(instance.user_id, [instance.pk])
+
+
+@receiver(recipes_changed)
+def bump_recipes_version(sender, user_id, recipe_ids=(), **kwargs):
+    """Troca as versões após uma operação em lote."""
+    versions.bump(user_id, recipe_ids)
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_stats(sender, instance, created, **kwargs):
+    """Aplica ao resumo do dono a receita criada ou a diferença entre os
+    valores lidos do banco e os salvos."""
+    current = (instance.time_minutes, instance.price)
+    if created:
+        stats.apply(instance.user_id, added=[current])
+    else:
+        loaded = getattr(instance, '_loaded_values', {})
+        if not {'user_id', 'time_minutes', 'price'} <= loaded.keys():
+            # Instância criada à mão ou carregada com only()/defer(): sem
+            # os valores antigos, recalcula fora da requisição.
+            tasks.rebuild_recipe_stats.delay(user_ids=[instance.user_id])
+        elif loaded['user_id'] != instance.user_id:
+            tasks.rebuild_recipe_stats.delay(
+                user_ids=[loaded['user_id'], instance.user_id],
+            )
+        else:
+            previous = (loaded['time_minutes'], loaded['price'])
+            if previous != current:
+                stats.apply(
+                    instance.user_id, added=[current], removed=[previous],
+                )
+    instance._loaded_values = {
+        'user_id': instance.user_id,
+        'time_minutes': instance.time_minutes,
+        'price': instance.price,
+    }
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_recipe_stats(sender, instance, **kwargs):
+    """Subtrai a receita excluída do resumo do dono."""
+    if batched() or owner_deleted(instance):
+        return
+    stats.apply(
+        instance.user_id, removed=[(instance.time_minutes, instance.price)],
+    )
+
+
+@receiver(post_delete, sender=Recipe)
+def record_recipe_tombstone(sender, instance, **kwargs):
+    """Marca a exclusão da receita para a sincronização dos clientes.
+    Não há marca quando o próprio dono é excluído: ninguém mais a leria.
+    """
+    if batched() or owner_deleted(instance):
+        return
+    RecipeTombstone.objects.create(
+        user_id=instance.user_id, recipe_id=instance.pk,
+    )
+
+
+@receiver(recipes_changed)
+def update_recipes_stats(sender, user_id, added=None, removed=None,
+                         **kwargs):
+    """Atualiza o resumo após uma operação em lote."""
+    if added is None and removed is None:
+        tasks.rebuild_recipe_stats.delay(user_ids=[user_id])
+    else:
+        stats.apply(user_id, added or (), removed or ())
+
+
+@receiver(connection_created)
+def time_connection_queries(sender, connection, **kwargs):
+    """Mede as consultas de cada conexão aberta (ver
+    core.instrumentation.time_query)."""
+    instrumentation.install_query_timer(connection)
@@ -0,0 +1,119 @@
+"""
+Manutenção do resumo das receitas por usuário (core.models.RecipeStats).
+
+Cada gravação aplica só a diferença: contagem e somas com F(), mínimo e
+máximo com LEAST/GREATEST nas inclusões. Quando um preço sai (exclusão ou
+alteração), mínimo e máximo são relidos por subconsultas que usam o índice
+(user_id, price, id), sem varrer as receitas do usuário.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from core.models import Recipe, RecipeStats
+
+
+BATCH_SIZE = 1000
+
+
+def to_python(pair):
+    """Converte o par (time_minutes, price) como os campos do modelo (ex.:
+    o preço em texto de uma receita criada à mão)."""
+    time_minutes, price = pair
+    return (
+        Recipe._meta.get_field('time_minutes').to_python(time_minutes),
+        Recipe._meta.get_field('price').to_python(price),
+    )
+
+
+def apply(user_id, added=(), removed=()):
+    """Soma as receitas `added` e subtrai as `removed` do resumo do
+    usuário; cada item é um par (time_minutes, price).
+
+    Deve ser chamada depois de gravar as receitas, já que mínimo e máximo
+    podem ser relidos da tabela. Sem a linha do resumo (ex.: usuário
+    criado com bulk_create), recalcula o usuário se houver inclusões; só
+    com remoções não há o que recriar agora (e, na exclusão do usuário em
+    cascata, a linha já foi apagada de propósito).
+    """
+    added = [to_python(pair) for pair in added]
+    removed = [to_python(pair) for pair in removed]
+    if not added and not removed:
+        return
+
+    updates = {
+        'count': F('count') + (len(added) - len(removed)),
+        'time_minutes_sum': F('time_minutes_sum') + (
+            sum(time for time, _ in added)
+            - sum(time for time, _ in removed)
+        ),
+        'price_sum': F('price_sum') + (
+            sum(price for _, price in added)
+            - sum(price for _, price in removed)
+        ),
+    }
+    if removed:
+        recipes = Recipe.objects.filter(user_id=user_id)
+        updates['price_min'] = Subquery(
+            recipes.order_by('price').values('price')[:1]
+        )
+        updates['price_max'] = Subquery(
+            recipes.order_by('-price').values('price')[:1]
+        )
+    else:
+        low = Value(min(price for _, price in added))
+        high = Value(max(price for _, price in added))
+        updates['price_min'] = Least(Coalesce('price_min', low), low)
+        updates['price_max'] = Greatest(Coalesce('price_max', high), high)
+
+    updated = RecipeStats.objects.filter(user_id=user_id).update(**updates)
+    if not updated and added:
+        rebuild([user_id])
+
+
+def rebuild(user_ids=None):
+    """Recalcula do zero o resumo dos usuários (todos, por padrão) com uma
+    única agregação agrupada por usuário e retorna quantos foram gravados.
+    """
+    users = get_user_model().objects.order_by('id')
+    recipes = Recipe.objects.order_by()
+    stats = RecipeStats.objects.all()
+    if user_ids is not None:
+        users = users.filter(id__in=user_ids)
+        recipes = recipes.filter(user_id__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        totals = {
+            row['user_id']: row
+            for row in recipes.values('user_id').annotate(
+                count=Count('id'),
+                time_minutes_sum=Sum('time_minutes'),
+                price_sum=Sum('price'),
+                price_min=Min('price'),
+                price_max=Max('price'),
+            )
+        }
+        stats.delete()
+
+        written = 0
+        batch = []
+        for user_id in users.values_list('id', flat=True).iterator():
+            row = totals.get(user_id, {})
+            batch.append(RecipeStats(
+                user_id=user_id,
+                count=row.get('count', 0),
+                time_minutes_sum=row.get('time_minutes_sum', 0),
+                price_sum=row.get('price_sum', 0),
+                price_min=row.get('price_min'),
+                price_max=row.get('price_max'),
+            ))
+            if len(batch) >= BATCH_SIZE:
+                RecipeStats.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        RecipeStats.objects.bulk_create(batch)
+        written += len(batch)
+
+    return written
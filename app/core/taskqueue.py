@@ -0,0 +1,152 @@
+"""
+Fila de tarefas em banco para o trabalho lento depois das escritas.
+
+As funções marcadas com `@task` (nos módulos `tasks.py` das apps) são
+enfileiradas com `func.delay(**kwargs)`: a linha da tarefa é gravada na
+transação atual, então só fica visível aos workers após o commit e some
+com um rollback. Com TASKS['EAGER'], a tarefa roda no próprio processo,
+no `on_commit` (útil em desenvolvimento).
+
+O `manage.py run_worker` executa as tarefas. Cada worker pega um lote com
+SELECT ... FOR UPDATE SKIP LOCKED, então vários processos (ou máquinas)
+dividem a fila sem disputar as mesmas linhas. Uma tarefa que falha volta
+para a fila com espera exponencial, até TASKS['MAX_ATTEMPTS'] tentativas.
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import Task
+
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func):
+    """Registra `func` como tarefa e adiciona `func.delay(**kwargs)`.
+
+    Os argumentos são gravados em JSON, então devem ser serializáveis.
+    """
+    name = f'{func.__module__}.{func.__qualname__}'
+    registry[name] = func
+
+    def delay(**kwargs):
+        return enqueue(name, **kwargs)
+
+    func.task_name = name
+    func.delay = delay
+    return func
+
+
+def enqueue(name, **kwargs):
+    """Enfileira a tarefa `name` na transação atual."""
+    if settings.TASKS['EAGER']:
+        transaction.on_commit(lambda: registry[name](**kwargs))
+        return None
+    return Task.objects.create(
+        name=name, kwargs=kwargs, run_after=timezone.now(),
+    )
+
+
+def discover():
+    """Importa os módulos `tasks.py` das apps, que registram as tarefas."""
+    autodiscover_modules('tasks')
+
+
+def claim(batch_size):
+    """Marca como em execução e retorna até `batch_size` tarefas prontas.
+
+    Inclui as que ficaram em execução além de TASKS['LOCK_TIMEOUT']
+    segundos (worker que morreu no meio).
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS['LOCK_TIMEOUT'])
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Task.PENDING, run_after__lte=now)
+                | Q(status=Task.RUNNING, locked_at__lt=stale)
+            )
+            .order_by('run_after', 'id')[:batch_size]
+        )
+        if tasks:
+            Task.objects.filter(id__in=[t.id for t in tasks]).update(
+                status=Task.RUNNING,
+                locked_at=now,
+                attempts=F('attempts') + 1,
+            )
+    return tasks
+
+
+def execute(task):
+    """Executa a tarefa: exclui em caso de sucesso, reagenda ou marca
+    como falha em caso de erro."""
+    try:
+        registry[task.name](**task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        attempts = task.attempts + 1
+        if attempts >= settings.TASKS['MAX_ATTEMPTS']:
+            logger.error('Task %s (%s) failed: %s', task.id, task.name, error)
+            updates = {'status': Task.FAILED}
+        else:
+            updates = {
+                'status': Task.PENDING,
+                'run_after': timezone.now() + timedelta(seconds=2 ** attempts),
+            }
+        Task.objects.filter(id=task.id).update(
+            locked_at=None, last_error=error, **updates,
+        )
+        return False
+
+    Task.objects.filter(id=task.id).delete()
+    return True
+
+
+def work(batch_size=None, poll_interval=None, once=False,
+         should_stop=lambda: False):
+    """Laço de um worker. Com `once`, para quando a fila esvazia; retorna
+    quantas tarefas foram executadas."""
+    config = settings.TASKS
+    batch_size = batch_size or config['BATCH_SIZE']
+    poll_interval = poll_interval or config['POLL_INTERVAL']
+
+    done = 0
+    while not should_stop():
+        # Fora do ciclo de requisição: descarta conexões quebradas ou
+        # vencidas, como o Django faz a cada requisição.
+        close_old_connections()
+        try:
+            tasks = claim(batch_size)
+        except DatabaseError:
+            # Banco fora do ar ou travado: o worker espera e tenta de novo.
+            logger.exception('Could not claim tasks')
+            time.sleep(poll_interval)
+            continue
+        for item in tasks:
+            try:
+                execute(item)
+            except DatabaseError:
+                # Fica em execução e volta à fila após o LOCK_TIMEOUT.
+                logger.exception('Could not record task %s', item.id)
+            done += 1
+        if not tasks:
+            if once:
+                break
+            time.sleep(poll_interval)
+    return done
+
+
+def run_pending():
+    """Executa no processo atual todas as tarefas prontas (ex.: testes)."""
+    return work(once=True)
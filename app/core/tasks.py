@@ -0,0 +1,11 @@
+"""
+Tarefas do core executadas pelos workers (ver core.taskqueue).
+"""
+from core import stats
+from core.taskqueue import task
+
+
+@task
+def rebuild_recipe_stats(user_ids):
+    """Recalcula o resumo das receitas dos usuários."""
+    stats.rebuild(user_ids)
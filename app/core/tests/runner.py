@@ -0,0 +1,27 @@
+"""
+Test runner do projeto.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner com o rate limiting desligado.
+
+    Os baldes do core.throttling ficam em memória, no processo, e seriam
+    compartilhados por todos os testes: o resultado dependeria da ordem
+    (ex.: o 11º usuário criado por IP numa hora recebe 429). Os testes dos
+    throttles os ligam com override_settings e esvaziam os baldes.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.throttle_settings = override_settings(API_THROTTLE={
+            **settings.API_THROTTLE, 'ENABLED': False,
+        })
+        self.throttle_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.throttle_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,147 @@
+"""
+Tests for the cached token authentication.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import authentication
+
+
+ME_URL = reverse('user:me')
+
+
+class LRUCacheTests(TestCase):
+    """Testa o LRU em memória."""
+
+    def test_evicts_least_recently_used(self):
+        """Verifica se o item menos usado é descartado ao exceder o
+        tamanho máximo."""
+        cache = authentication.LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    @patch('core.authentication.time.monotonic')
+    def test_expires_after_ttl(self, patched_monotonic):
+        """Verifica se o item expira após o TTL."""
+        patched_monotonic.return_value = 100
+        cache = authentication.LRUCache(max_size=2, ttl=10)
+        cache.set('a', 1)
+
+        patched_monotonic.return_value = 111
+
+        self.assertIsNone(cache.get('a'))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Testa a autenticação por token com cache."""
+
+    def setUp(self):
+        authentication.get_local_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_cached_request_skips_token_query(self):
+        """Verifica se a segunda requisição não consulta o token no BD."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_invalidated(self):
+        """Verifica se o token excluído deixa de autenticar."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_invalidated(self):
+        """Verifica se o usuário desativado deixa de autenticar."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saved_user_is_refreshed(self):
+        """Verifica se os dados do usuário em cache são atualizados."""
+        self.client.get(ME_URL)
+        self.user.name = 'New Name'
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'New Name')
+
+    def test_requests_get_copies_of_cached_user(self):
+        """Verifica se cada requisição recebe a sua cópia do usuário em
+        cache, para que alterações não salvas não vazem entre elas."""
+        backend = authentication.CachedTokenAuthentication()
+        first, _ = backend.authenticate_credentials(self.token.key)
+        first.name = 'Unsaved'
+
+        second, token = backend.authenticate_credentials(self.token.key)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.name, self.user.name)
+        self.assertIs(token.user, second)
+
+    @override_settings(
+        TOKEN_AUTH_CACHE={'MAX_SIZE': 10, 'TTL': 60, 'SHARED_CACHE': 'default'}
+    )
+    def test_shared_cache_tier(self):
+        """Verifica se o nível compartilhado evita a consulta quando o
+        cache local do processo está vazio."""
+        self.client.get(ME_URL)
+        authentication.get_local_cache().clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.token.delete()
+        authentication.get_local_cache().clear()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        TOKEN_AUTH_CACHE={'MAX_SIZE': 10, 'TTL': 60, 'SHARED_CACHE': 'default'}
+    )
+    def test_invalidation_reaches_other_processes(self):
+        """Verifica se o token excluído por outro processo deixa de valer
+        mesmo com o LRU local deste processo ainda preenchido."""
+        self.client.get(ME_URL)
+
+        # O outro processo só limpa o seu próprio LRU.
+        other_process = authentication.LRUCache(max_size=10, ttl=60)
+        with patch('core.authentication.get_local_cache',
+                   return_value=other_process):
+            self.token.delete()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,104 @@
+"""
+Tests for the authentication backend and password hashers.
+"""
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+
+
+def hashing_settings(**overrides):
+    """Retorna PASSWORD_HASHING com os valores alterados."""
+    return override_settings(
+        PASSWORD_HASHING={**settings.PASSWORD_HASHING, **overrides},
+    )
+
+
+class PooledModelBackendTests(TestCase):
+    """Testa o backend que verifica as senhas no pool de threads."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+
+    def test_authenticate_valid_credentials(self):
+        """Verifica a autenticação com a senha correta."""
+        user = authenticate(
+            username='user@example.com',
+            password='testpass123',
+        )
+
+        self.assertEqual(user, self.user)
+
+    def test_authenticate_invalid_credentials(self):
+        """Verifica se senha errada, usuário inexistente ou inativo
+        não autenticam."""
+        self.assertIsNone(
+            authenticate(username='user@example.com', password='wrong')
+        )
+        self.assertIsNone(
+            authenticate(username='nobody@example.com', password='x')
+        )
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(
+            authenticate(username='user@example.com', password='testpass123')
+        )
+
+    @hashing_settings(PBKDF2_ITERATIONS=1000)
+    def test_rehash_when_cost_changes(self):
+        """Verifica se a senha é refeita com o novo custo no login."""
+        user = authenticate(
+            username='user@example.com',
+            password='testpass123',
+        )
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_rehash_when_algorithm_changes(self):
+        """Verifica se uma senha com outro algoritmo é refeita com o
+        algoritmo preferido no login."""
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha1')
+        self.user.save()
+
+        authenticate(username='user@example.com', password='testpass123')
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    @hashing_settings(
+        ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=1024, ARGON2_PARALLELISM=1,
+        BCRYPT_ROUNDS=4,
+    )
+    def test_login_with_argon2_and_bcrypt_passwords(self):
+        """Verifica se as senhas em argon2 e bcrypt (bibliotecas do
+        requirements.txt) autenticam e são refeitas no algoritmo atual."""
+        for hasher in ('argon2', 'bcrypt_sha256'):
+            with self.subTest(hasher=hasher):
+                self.user.password = make_password(
+                    'testpass123', hasher=hasher,
+                )
+                self.user.save()
+
+                user = authenticate(
+                    username='user@example.com', password='testpass123',
+                )
+
+                self.assertEqual(user, self.user)
+                user.refresh_from_db()
+                self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+    def test_no_rehash_on_wrong_password(self):
+        """Verifica se a senha não é refeita quando a senha está errada."""
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha1')
+        self.user.save()
+        encoded = self.user.password
+
+        authenticate(username='user@example.com', password='wrong')
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, encoded)
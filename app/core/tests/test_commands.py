@@ -1,13 +1,29 @@
 """
 Test custom Django management commands.
 """
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.models import (
+    ImportCheckpoint,
+    Recipe,
+    RecipeStats,
+    RecipeTombstone,
+)
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -32,3 +48,229 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+    @patch('core.management.commands.wait_for_db.connections.close_all')
+    @patch('time.sleep')
+    def test_wait_for_db_discards_broken_connections(
+        self, patched_sleep, patched_close_all, patched_check,
+    ):
+        """Test broken (persistent) connections are discarded between
+        attempts and released once the database is available."""
+        patched_check.side_effect = [OperationalError] * 2 + [True]
+
+        call_command('wait_for_db')
+
+        self.assertEqual(patched_close_all.call_count, 3)
+
+
+class ImportRecipesCommandTests(TestCase):
+    """Test the import_recipes command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def ndjson(self, *titles):
+        return ''.join(
+            json.dumps({'title': t, 'time_minutes': 5, 'price': '1.25'}) + '\n'
+            for t in titles
+        )
+
+    def test_import_ndjson_file(self):
+        """Test importing recipes from an NDJSON file in chunks."""
+        path = self.write_file('recipes.ndjson', self.ndjson('A', 'B', 'C'))
+
+        call_command('import_recipes', path, user=self.user.email,
+                     chunk_size=2, stdout=StringIO())
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([r.title for r in recipes], ['A', 'B', 'C'])
+        self.assertEqual(recipes[0].price, Decimal('1.25'))
+
+    def test_import_csv_from_stdin(self):
+        """Test importing CSV rows read from stdin."""
+        content = 'title,time_minutes,price,link\nA,10,2.50,http://a.com\n'
+
+        call_command('import_recipes', '-', user=self.user.email,
+                     input_format='csv', stdin=StringIO(content),
+                     stdout=StringIO())
+
+        recipe = Recipe.objects.get(user=self.user)
+        self.assertEqual(recipe.time_minutes, 10)
+        self.assertEqual(recipe.link, 'http://a.com')
+
+    def test_invalid_row_stops_import(self):
+        """Test an invalid row stops the import at its chunk."""
+        content = self.ndjson('A', 'B') + '{"title": "C"}\n'
+        path = self.write_file('recipes.ndjson', content)
+
+        with self.assertRaises(CommandError):
+            call_command('import_recipes', path, user=self.user.email,
+                         chunk_size=2, stdout=StringIO())
+
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 2)
+
+    def test_skip_invalid_rows(self):
+        """Test invalid rows are reported and skipped when requested."""
+        content = '{"title": "A"}\n' + self.ndjson('B')
+        path = self.write_file('recipes.ndjson', content)
+        stderr = StringIO()
+
+        call_command('import_recipes', path, user=self.user.email,
+                     skip_invalid=True, stdout=StringIO(), stderr=stderr)
+
+        self.assertIn('Row 1', stderr.getvalue())
+        self.assertEqual(
+            list(Recipe.objects.values_list('title', flat=True)), ['B'],
+        )
+
+    def test_resume_from_checkpoint(self):
+        """Test resuming skips the rows of the committed chunks."""
+        content = self.ndjson('A', 'B') + '{"title": "C"}\n'
+        path = self.write_file('recipes.ndjson', content)
+        with self.assertRaises(CommandError):
+            call_command('import_recipes', path, user=self.user.email,
+                         chunk_size=2, stdout=StringIO())
+
+        # Corrige a linha inválida e retoma a importação
+        self.write_file('recipes.ndjson', self.ndjson('A', 'B', 'C'))
+        call_command('import_recipes', path, user=self.user.email,
+                     chunk_size=2, resume=True, stdout=StringIO())
+
+        titles = Recipe.objects.order_by('id').values_list('title', flat=True)
+        self.assertEqual(list(titles), ['A', 'B', 'C'])
+
+    def test_malformed_json_stops_import(self):
+        """Test a malformed NDJSON line is reported with its line number."""
+        content = self.ndjson('A') + '\n{"title": \n' + self.ndjson('B')
+        path = self.write_file('recipes.ndjson', content)
+
+        with self.assertRaisesRegex(CommandError, 'Row 2: .*line 3'):
+            call_command('import_recipes', path, user=self.user.email,
+                         stdout=StringIO())
+
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_skip_malformed_json(self):
+        """Test malformed NDJSON lines are skipped as invalid rows."""
+        content = 'not json\n' + self.ndjson('A')
+        path = self.write_file('recipes.ndjson', content)
+        stderr = StringIO()
+
+        call_command('import_recipes', path, user=self.user.email,
+                     skip_invalid=True, stdout=StringIO(), stderr=stderr)
+
+        self.assertIn('Row 1: invalid JSON on line 1', stderr.getvalue())
+        self.assertEqual(
+            list(Recipe.objects.values_list('title', flat=True)), ['A'],
+        )
+
+    def test_checkpoint_saved_with_chunk(self):
+        """Test a chunk that fails to commit leaves the checkpoint at the
+        previous chunk, so resuming does not duplicate recipes."""
+        path = self.write_file('recipes.ndjson', self.ndjson('A', 'B', 'C'))
+        send = 'core.management.commands.import_recipes.recipes_changed.send'
+        with patch(send, side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                call_command('import_recipes', path, user=self.user.email,
+                             chunk_size=2, stdout=StringIO())
+
+        checkpoint = ImportCheckpoint.objects.get(user=self.user)
+        self.assertEqual(checkpoint.rows_read, 2)
+
+        call_command('import_recipes', path, user=self.user.email,
+                     chunk_size=2, resume=True, stdout=StringIO())
+
+        titles = Recipe.objects.order_by('id').values_list('title', flat=True)
+        self.assertEqual(list(titles), ['A', 'B', 'C'])
+
+    def test_import_updates_stats(self):
+        """Test the imported rows are added to the user's stats."""
+        path = self.write_file('recipes.ndjson', self.ndjson('A', 'B', 'C'))
+
+        call_command('import_recipes', path, user=self.user.email,
+                     chunk_size=2, stdout=StringIO())
+
+        stats = RecipeStats.objects.get(user=self.user)
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.price_sum, Decimal('3.75'))
+        self.assertEqual(stats.price_min, Decimal('1.25'))
+
+
+class RebuildRecipeStatsCommandTests(TestCase):
+    """Test the rebuild_recipe_stats command."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user('user@example.com', 'pass1234')
+        self.other = User.objects.create_user('other@example.com', 'pass1234')
+        # Gravações em lote não disparam sinais: o resumo fica defasado.
+        Recipe.objects.bulk_create([
+            Recipe(user=self.user, title='A', time_minutes=10,
+                   price=Decimal('2.00')),
+            Recipe(user=self.user, title='B', time_minutes=20,
+                   price=Decimal('4.00')),
+            Recipe(user=self.other, title='C', time_minutes=5,
+                   price=Decimal('1.00')),
+        ])
+
+    def test_rebuild_all_users(self):
+        """Test every user's stats are recomputed from the recipes."""
+        stdout = StringIO()
+
+        call_command('rebuild_recipe_stats', stdout=stdout)
+
+        self.assertIn('2 user(s)', stdout.getvalue())
+        stats = RecipeStats.objects.get(user=self.user)
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.time_minutes_sum, 30)
+        self.assertEqual(stats.price_min, Decimal('2.00'))
+        self.assertEqual(stats.price_max, Decimal('4.00'))
+        self.assertEqual(RecipeStats.objects.get(user=self.other).count, 1)
+
+    def test_rebuild_given_users(self):
+        """Test --user only recomputes the given users."""
+        call_command('rebuild_recipe_stats', users=[self.other.email],
+                     stdout=StringIO())
+
+        self.assertEqual(RecipeStats.objects.get(user=self.user).count, 0)
+        self.assertEqual(RecipeStats.objects.get(user=self.other).count, 1)
+
+    def test_rebuild_unknown_user(self):
+        """Test an unknown email is reported."""
+        with self.assertRaises(CommandError):
+            call_command('rebuild_recipe_stats', users=['x@example.com'],
+                         stdout=StringIO())
+
+
+class PurgeRecipeTombstonesCommandTests(TestCase):
+    """Test the purge_recipe_tombstones command."""
+
+    def test_purge_old_tombstones(self):
+        """Test only the tombstones older than the retention are deleted."""
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'pass1234',
+        )
+        now = timezone.now()
+        RecipeTombstone.objects.create(
+            user=user, recipe_id=1, deleted_at=now - timedelta(days=40),
+        )
+        recent = RecipeTombstone.objects.create(
+            user=user, recipe_id=2, deleted_at=now - timedelta(days=10),
+        )
+        stdout = StringIO()
+
+        call_command('purge_recipe_tombstones', days=30, stdout=stdout)
+
+        self.assertIn('Deleted 1 recipe tombstone(s)', stdout.getvalue())
+        self.assertEqual(list(RecipeTombstone.objects.all()), [recent])
@@ -0,0 +1,64 @@
+"""
+Tests for the database backend with connection health checks.
+"""
+from unittest.mock import MagicMock, patch
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.test import SimpleTestCase
+
+from core.db.backends.postgresql.base import DatabaseWrapper
+
+
+def make_wrapper(health_checks=True):
+    """Cria um DatabaseWrapper com uma conexão simulada."""
+    wrapper = DatabaseWrapper({
+        'NAME': 'test',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': health_checks,
+        'OPTIONS': {},
+        'TIME_ZONE': None,
+        'AUTOCOMMIT': True,
+    })
+    wrapper.connection = MagicMock()
+    return wrapper
+
+
+@patch.object(BaseDatabaseWrapper, 'ensure_connection')
+class HealthCheckTests(SimpleTestCase):
+    """Testa o health check das conexões persistentes."""
+
+    def test_unusable_connection_is_replaced(self, patched_ensure):
+        """Test a dead reused connection is closed before the query."""
+        wrapper = make_wrapper()
+
+        with patch.object(wrapper, 'is_usable', return_value=False), \
+                patch.object(wrapper, 'close') as patched_close:
+            wrapper.ensure_connection()
+
+        patched_close.assert_called_once()
+        patched_ensure.assert_called_once()
+
+    def test_checked_once_per_request(self, patched_ensure):
+        """Test the connection is checked only once until the next
+        request boundary."""
+        wrapper = make_wrapper()
+
+        with patch.object(wrapper, 'is_usable', return_value=True) as usable:
+            wrapper.ensure_connection()
+            wrapper.ensure_connection()
+            self.assertEqual(usable.call_count, 1)
+
+            with patch.object(BaseDatabaseWrapper,
+                              'close_if_unusable_or_obsolete'):
+                wrapper.close_if_unusable_or_obsolete()
+            wrapper.ensure_connection()
+            self.assertEqual(usable.call_count, 2)
+
+    def test_health_checks_disabled(self, patched_ensure):
+        """Test no check is made when CONN_HEALTH_CHECKS is off."""
+        wrapper = make_wrapper(health_checks=False)
+
+        with patch.object(wrapper, 'is_usable') as usable:
+            wrapper.ensure_connection()
+
+        usable.assert_not_called()
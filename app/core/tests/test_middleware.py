@@ -0,0 +1,437 @@
+"""
+Tests for the request metrics and compression middlewares.
+"""
+import asyncio
+import gzip
+import unittest
+import zlib
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    AsyncClient,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.authentication import get_local_cache
+from core.models import Recipe
+from core.middleware import (
+    CompressionMiddleware,
+    RequestMetricsMiddleware,
+    _GzipEncoder,
+    accepted_encodings,
+    brotli,
+    request_db_duration,
+    request_db_queries,
+    request_duration,
+    request_serialize_duration,
+)
+
+
+RECIPES_URL = reverse('recipe:recipe-list')
+ASYNC_RECIPES_URL = reverse('recipe:async-recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+def metrics_settings(**config):
+    return override_settings(REQUEST_METRICS={
+        'ENABLED': True, 'SERVER_TIMING': False, **config,
+    })
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    """Testa as medições por requisição."""
+
+    def setUp(self):
+        cache.clear()
+        for histogram in (
+            request_duration,
+            request_db_duration,
+            request_db_queries,
+            request_serialize_duration,
+        ):
+            histogram.reset()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+
+    def get_client(self):
+        # O middleware é carregado na primeira requisição de cada client.
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client
+
+    @metrics_settings()
+    def test_records_request_per_view(self):
+        """Verifica se a requisição é contada nos histogramas da view."""
+        labels = {'view': 'recipe:recipe-list', 'method': 'GET'}
+
+        res = self.get_client().get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(request_duration.count(**labels), 1)
+        self.assertEqual(request_db_queries.count(**labels), 1)
+        self.assertEqual(request_serialize_duration.count(**labels), 1)
+        self.assertNotIn('Server-Timing', res)
+
+    @metrics_settings()
+    def test_counts_queries(self):
+        """Verifica se as consultas da requisição caem no bucket certo."""
+        self.get_client().get(RECIPES_URL)
+
+        content = metrics.render_prometheus()
+        labels = 'view="recipe:recipe-list",method="GET"'
+        for line in (
+            'http_request_db_queries_bucket{%s,le="0.0"} 0' % labels,
+            'http_request_db_queries_bucket{%s,le="1.0"} 1' % labels,
+            'http_request_db_queries_sum{%s} 1' % labels,
+        ):
+            self.assertIn(line, content)
+
+    @metrics_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        """Verifica o header Server-Timing quando habilitado."""
+        res = self.get_client().get(RECIPES_URL)
+
+        timing = res['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="1 queries"')
+        self.assertRegex(timing, r'serialize;dur=[\d.]+')
+        self.assertRegex(timing, r'total;dur=[\d.]+')
+
+    @metrics_settings()
+    def test_unresolved_url(self):
+        """Verifica se URLs inexistentes usam um label fixo."""
+        self.get_client().get('/missing/')
+
+        self.assertEqual(
+            request_duration.count(view='<unresolved>', method='GET'), 1,
+        )
+
+    @metrics_settings()
+    def test_async_capable(self):
+        """Verifica se o middleware segue o modo (sync ou async) da pilha,
+        sem adaptador entre ele e o próximo."""
+        async def async_view(request):
+            return None
+
+        self.assertTrue(asyncio.iscoroutinefunction(
+            RequestMetricsMiddleware(async_view),
+        ))
+        self.assertFalse(asyncio.iscoroutinefunction(
+            RequestMetricsMiddleware(lambda request: None),
+        ))
+
+    @metrics_settings(ENABLED=False)
+    def test_disabled(self):
+        """Verifica se, desligado, o middleware sai da pilha."""
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: None)
+
+        self.get_client().get(RECIPES_URL)
+
+        self.assertEqual(
+            request_duration.count(view='recipe:recipe-list', method='GET'),
+            0,
+        )
+
+
+class AsyncRequestMetricsTests(TransactionTestCase):
+    """Testa as medições na pilha async (TransactionTestCase: as views
+    async consultam o banco em threads do executor, com outras conexões).
+    """
+
+    def setUp(self):
+        get_local_cache().clear()
+        request_duration.reset()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+
+    @metrics_settings(SERVER_TIMING=True)
+    async def test_async_view_recorded(self):
+        """Verifica se, na pilha async, as consultas feitas nas threads do
+        sync_to_async entram nas medições da requisição."""
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        labels = {'view': 'recipe:async-recipe-list', 'method': 'GET'}
+
+        res = await AsyncClient().get(
+            ASYNC_RECIPES_URL, AUTHORIZATION='Token ' + token.key,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(request_duration.count(**labels), 1)
+        self.assertRegex(
+            res['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"',
+        )
+
+
+class HistogramTests(SimpleTestCase):
+    """Testa o histograma das métricas."""
+
+    def test_prometheus_format(self):
+        """Verifica os buckets cumulativos, a soma e o total."""
+        histogram = metrics.histogram(
+            'test_duration_seconds', 'Test durations.', ['kind'], (.1, 1),
+        )
+        histogram.reset()
+        for value in (.05, .5, .5, 3):
+            histogram.observe(value, kind='a')
+
+        content = metrics.render_prometheus()
+
+        self.assertIn('# TYPE test_duration_seconds histogram', content)
+        for line in (
+            'test_duration_seconds_bucket{kind="a",le="0.1"} 1',
+            'test_duration_seconds_bucket{kind="a",le="1.0"} 3',
+            'test_duration_seconds_bucket{kind="a",le="+Inf"} 4',
+            'test_duration_seconds_sum{kind="a"} 4.05',
+            'test_duration_seconds_count{kind="a"} 4',
+        ):
+            self.assertIn(line, content)
+
+
+def compression_settings(**config):
+    return override_settings(RESPONSE_COMPRESSION={
+        'ENABLED': True,
+        'MIN_SIZE': 200,
+        'GZIP_LEVEL': 6,
+        'BROTLI_QUALITY': 4,
+        'CONTENT_TYPES': ['application/json', 'text/'],
+        **config,
+    })
+
+
+@compression_settings()
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Testa a compressão das respostas."""
+
+    body = b'{"title": "Bolo de cenoura"}' * 50
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding='gzip', method='get'):
+        request = getattr(self.factory, method)(
+            '/', HTTP_ACCEPT_ENCODING=accept_encoding,
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, content=None, **kwargs):
+        return HttpResponse(
+            self.body if content is None else content,
+            content_type='application/json',
+            **kwargs,
+        )
+
+    def test_gzip(self):
+        """Verifica a compressão gzip e os headers da resposta."""
+        res = self.process(self.json_response(), 'gzip, deflate')
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(res['Vary'], 'Accept-Encoding')
+        self.assertEqual(res['Content-Length'], str(len(res.content)))
+        self.assertEqual(gzip.decompress(res.content), self.body)
+
+    @unittest.skipIf(brotli is None, 'brotli não está instalado')
+    def test_brotli_preferred(self):
+        """Verifica se o brotli é usado quando aceito com o mesmo q."""
+        res = self.process(self.json_response(), 'gzip, br')
+
+        self.assertEqual(res['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(res.content), self.body)
+
+    def test_quality_values(self):
+        """Verifica se o q do Accept-Encoding é respeitado."""
+        res = self.process(self.json_response(), 'br;q=0.5, gzip')
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+
+        res = self.process(self.json_response(), 'gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', res)
+        self.assertEqual(res.content, self.body)
+
+    def test_accepted_encodings(self):
+        """Verifica a leitura do header Accept-Encoding."""
+        self.assertEqual(
+            accepted_encodings('gzip;q=0.8, BR , *;q=0, x;q=bad'),
+            {'gzip': 0.8, 'br': 1.0, '*': 0.0, 'x': 0.0},
+        )
+
+    def test_below_min_size(self):
+        """Verifica se corpos menores que MIN_SIZE não são comprimidos."""
+        res = self.process(self.json_response(b'{"id": 1}'))
+
+        self.assertNotIn('Content-Encoding', res)
+        self.assertEqual(res['Vary'], 'Accept-Encoding')
+
+    def test_content_type_rules(self):
+        """Verifica os content types exatos e por tipo ('text/')."""
+        res = self.process(HttpResponse(self.body, content_type='text/csv'))
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+
+        res = self.process(HttpResponse(self.body, content_type='image/png'))
+        self.assertNotIn('Content-Encoding', res)
+        self.assertNotIn('Vary', res)
+
+    def test_incompressible_body_kept(self):
+        """Verifica se o original é mantido quando a compressão não
+        reduz o tamanho."""
+        content = bytes(range(256)) * 2
+        with compression_settings(CONTENT_TYPES=['application/octet-stream']):
+            res = self.process(HttpResponse(
+                gzip.compress(content),
+                content_type='application/octet-stream',
+            ))
+
+        self.assertNotIn('Content-Encoding', res)
+
+    def test_already_encoded(self):
+        """Verifica se respostas já codificadas não são alteradas."""
+        response = self.json_response()
+        response['Content-Encoding'] = 'identity'
+
+        res = self.process(response)
+
+        self.assertEqual(res['Content-Encoding'], 'identity')
+        self.assertEqual(res.content, self.body)
+
+    def test_weakens_etag(self):
+        """Verifica se a ETag forte vira fraca na resposta comprimida."""
+        response = self.json_response()
+        response['ETag'] = '"abc"'
+
+        res = self.process(response)
+
+        self.assertEqual(res['ETag'], 'W/"abc"')
+
+    def test_streaming(self):
+        """Verifica se o streaming é comprimido bloco a bloco."""
+        chunks = [b'{"id": %d}\n' % i for i in range(1000)]
+        response = StreamingHttpResponse(
+            iter(chunks), content_type='application/json',
+        )
+
+        res = self.process(response)
+
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', res)
+        self.assertEqual(
+            gzip.decompress(b''.join(res.streaming_content)),
+            b''.join(chunks),
+        )
+
+    def test_streaming_flushes_each_chunk(self):
+        """Verifica se cada bloco pode ser descomprimido assim que é
+        enviado, sem esperar os seguintes."""
+        chunks = [b'{"id": %d}\n' % i for i in range(3)]
+        response = StreamingHttpResponse(
+            iter(chunks), content_type='application/json',
+        )
+
+        stream = iter(self.process(response).streaming_content)
+        decompressor = zlib.decompressobj(31)
+
+        for chunk in chunks:
+            self.assertEqual(decompressor.decompress(next(stream)), chunk)
+
+    async def test_async_mode(self):
+        """Verifica se, numa pilha async, o middleware é uma corrotina e
+        comprime a resposta."""
+        async def get_response(request):
+            return self.json_response()
+
+        middleware = CompressionMiddleware(get_response)
+        res = await middleware(
+            self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip'),
+        )
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res.content), self.body)
+
+    async def test_async_stream_flushes_each_chunk(self):
+        """Verifica o flush por bloco também nos corpos async."""
+        chunks = [b'{"id": %d}\n' % i for i in range(3)]
+
+        async def body():
+            for chunk in chunks:
+                yield chunk
+
+        stream = CompressionMiddleware.compress_async_stream(
+            _GzipEncoder(6), body(),
+        )
+        decompressor = zlib.decompressobj(31)
+
+        for chunk in chunks:
+            self.assertEqual(
+                decompressor.decompress(await stream.__anext__()), chunk,
+            )
+
+    def test_head_request(self):
+        """Verifica se respostas a HEAD não são comprimidas."""
+        res = self.process(self.json_response(), method='head')
+
+        self.assertNotIn('Content-Encoding', res)
+
+    @compression_settings(ENABLED=False)
+    def test_disabled(self):
+        """Verifica se, desligado, o middleware sai da pilha."""
+        with self.assertRaises(MiddlewareNotUsed):
+            CompressionMiddleware(lambda request: None)
+
+
+class CompressionApiTests(TestCase):
+    """Testa a compressão nos endpoints das receitas."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        for i in range(20):
+            Recipe.objects.create(
+                user=self.user,
+                title=f'Receita {i}',
+                time_minutes=10,
+                price=Decimal('5.50'),
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @compression_settings(CONTENT_TYPES=['application/json'])
+    def test_recipe_list_compressed(self):
+        """Verifica se a listagem vem com gzip quando aceito."""
+        res = self.client.get(RECIPES_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn(b'Receita 19', gzip.decompress(res.content))
+
+    @compression_settings(CONTENT_TYPES=['application/x-ndjson'])
+    def test_export_streaming_compressed(self):
+        """Verifica se a exportação continua em streaming, comprimida."""
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(
+            b''.join(res.streaming_content),
+        ).splitlines()
+        self.assertEqual(len(lines), 20)
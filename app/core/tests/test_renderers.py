@@ -0,0 +1,119 @@
+"""
+Tests for the JSON renderer and parser.
+"""
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import parsers, renderers
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+PAYLOAD = {
+    'next': None,
+    'results': [{
+        'id': 1,
+        'title': 'Pão de queijo "mineiro"',
+        'time_minutes': 45,
+        'price': '999.99',
+        'link': '',
+    }],
+    'decimal': Decimal('5.25'),
+    'lazy': gettext_lazy('Not found.'),
+    'utc': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, timezone.utc),
+    'offset': datetime.datetime(
+        2024, 1, 2, 3, 4, 5,
+        tzinfo=datetime.timezone(datetime.timedelta(hours=-3)),
+    ),
+    'naive': datetime.datetime(2024, 1, 2, 3, 4, 5),
+    'date': datetime.date(2024, 1, 2),
+    'duration': datetime.timedelta(minutes=90),
+    'uuid': uuid.UUID(int=1),
+    'keys': {1: 'int key'},
+    'separators': 'linha\u2028parágrafo\u2029',
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Testa o renderizador JSON baseado no orjson."""
+
+    def test_same_output_as_drf_renderer(self):
+        """Verifica se a saída é byte a byte igual à do JSONRenderer."""
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD),
+        )
+
+    def test_indent_uses_drf_renderer(self):
+        """Verifica se respostas indentadas continuam iguais às do DRF."""
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type),
+        )
+
+    def test_unsupported_data_falls_back(self):
+        """Verifica se dados recusados pelo orjson (inteiros grandes)
+        são renderizados pelo JSONRenderer."""
+        data = {'big': 2 ** 70}
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data),
+        )
+
+    def test_without_orjson(self):
+        """Verifica se sem o orjson o renderizador usa o módulo json."""
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(
+                FastJSONRenderer().render(PAYLOAD),
+                JSONRenderer().render(PAYLOAD),
+            )
+
+    def test_none_renders_empty(self):
+        """Verifica se None gera um corpo vazio, como no DRF."""
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Testa o parser JSON baseado no orjson."""
+
+    def parse(self, body, parser_class=FastJSONParser, **context):
+        return parser_class().parse(io.BytesIO(body), None, context)
+
+    def test_same_result_as_drf_parser(self):
+        """Verifica se o resultado é igual ao do JSONParser."""
+        body = '{"title": "Pão", "price": "5.25", "tags": [1, 2.5]}'.encode()
+
+        self.assertEqual(self.parse(body), self.parse(body, JSONParser))
+
+    def test_invalid_json(self):
+        """Verifica se JSON inválido ou com NaN gera ParseError."""
+        for body in (b'{"title": ', b'{"price": NaN}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(body)
+
+    def test_other_encoding_uses_drf_parser(self):
+        """Verifica se corpos fora de UTF-8 são lidos pelo JSONParser."""
+        body = '{"title": "Pão"}'.encode('latin-1')
+
+        self.assertEqual(
+            self.parse(body, encoding='latin-1'), {'title': 'Pão'},
+        )
+
+    def test_without_orjson(self):
+        """Verifica se sem o orjson o parser usa o módulo json."""
+        with mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(self.parse(b'{"id": 1}'), {'id': 1})
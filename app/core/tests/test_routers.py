@@ -0,0 +1,196 @@
+"""
+Tests for the read replica router.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.db import routers
+from core.models import Recipe
+
+
+REPLICAS = ['sqlite_replica1', 'sqlite_replica2']
+
+RECIPES_URL = reverse('recipe:recipe-list')
+ME_URL = reverse('user:me')
+
+
+@override_settings(
+    DB_REPLICAS=REPLICAS,
+    DB_READ_YOUR_WRITES={'TIMEOUT': 60, 'ALIAS': 'default'},
+    RECIPE_RESPONSE_CACHE={'ENABLED': False},
+)
+class ReplicaRouterTests(TestCase):
+    """Testa o roteamento com duas réplicas SQLite."""
+    @classmethod
+    def setUpClass(cls):
+        # Réplicas de teste: bancos SQLite em memória, separados do
+        # primário, que existem só durante esta classe. O que é gravado no
+        # primário não aparece nelas, como numa réplica atrasada. Por não
+        # existirem antes, entram em `databases` só aqui.
+        cls.databases = {'default', *REPLICAS}
+        cls.replica_names = {}
+        try:
+            for alias in REPLICAS:
+                connections.settings[alias] = {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                    'NAME': ':memory:',
+                }
+                cls.replica_names[alias] = connections[alias].settings_dict[
+                    'NAME'
+                ]
+                connections[alias].creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False,
+                )
+            super().setUpClass()
+        except Exception:
+            cls.remove_replicas()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls.remove_replicas()
+
+    @classmethod
+    def remove_replicas(cls):
+        """Apaga as réplicas de teste e as tira de settings.DATABASES."""
+        for alias, name in cls.replica_names.items():
+            connections[alias].creation.destroy_test_db(name, verbosity=0)
+            del connections[alias]
+        for alias in REPLICAS:
+            connections.settings.pop(alias, None)
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_replicated_recipe(self, title):
+        """Cria a receita no primário e a copia para as réplicas (com
+        bulk_create, que não dispara os sinais que gravam no primário)."""
+        recipe = Recipe.objects.create(
+            user=self.user, title=title, time_minutes=5,
+            price=Decimal('1.00'),
+        )
+        for alias in REPLICAS:
+            get_user_model().objects.using(alias).bulk_create([self.user])
+            Recipe.objects.using(alias).bulk_create([recipe])
+        return recipe
+
+    def test_reads_outside_views_use_primary(self):
+        """Verifica se, fora de read_from_replica, tudo vai ao primário."""
+        router = routers.ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Recipe), 'default')
+        self.assertEqual(router.db_for_write(Recipe), 'default')
+
+    def test_read_from_replica_round_robin(self):
+        """Verifica se as leituras alternam entre as réplicas."""
+        used = set()
+        for _ in REPLICAS:
+            with routers.read_from_replica() as alias:
+                self.assertEqual(Recipe.objects.all().db, alias)
+                used.add(alias)
+
+        self.assertEqual(used, set(REPLICAS))
+        self.assertEqual(Recipe.objects.all().db, 'default')
+
+    def test_get_reads_from_replica(self):
+        """Verifica se o GET lê das réplicas, não do primário."""
+        Recipe.objects.create(
+            user=self.user, title='Só no primário', time_minutes=5,
+            price=Decimal('1.00'),
+        )
+
+        for _ in REPLICAS:
+            res = self.client.get(RECIPES_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data['results'], [])
+
+    def test_read_your_writes(self):
+        """Verifica se, após uma escrita, o usuário lê do primário."""
+        res = self.client.post(RECIPES_URL, {
+            'title': 'Nova', 'time_minutes': 5, 'price': '1.00',
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Recipe.objects.using(REPLICAS[0]).exists())
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(
+            [recipe['title'] for recipe in res.data['results']], ['Nova'],
+        )
+
+    def test_pin_is_per_user(self):
+        """Verifica se a escrita de um usuário não prende os outros."""
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123',
+        )
+        routers.pin(other.pk)
+        Recipe.objects.create(
+            user=self.user, title='Só no primário', time_minutes=5,
+            price=Decimal('1.00'),
+        )
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_failed_write_does_not_pin(self):
+        """Verifica se uma escrita inválida não prende o usuário."""
+        res = self.client.post(RECIPES_URL, {'title': 'Sem tempo'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(routers.is_pinned(self.user.pk))
+
+    def test_update_me_pins_user(self):
+        """Verifica se atualizar o perfil prende o usuário ao primário."""
+        res = self.client.patch(ME_URL, {'name': 'Novo nome'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(routers.is_pinned(self.user.pk))
+
+    def test_export_streams_from_replica(self):
+        """Verifica se o export, consumido após a view, lê da réplica."""
+        self.create_replicated_recipe('Replicada')
+        Recipe.objects.create(
+            user=self.user, title='Só no primário', time_minutes=5,
+            price=Decimal('1.00'),
+        )
+
+        res = self.client.get(reverse('recipe:recipe-export'))
+        content = b''.join(res.streaming_content).decode()
+
+        self.assertIn('Replicada', content)
+        self.assertNotIn('Só no primário', content)
+
+    @override_settings(DB_REPLICAS=[])
+    def test_without_replicas(self):
+        """Verifica se, sem réplicas, tudo fica no primário."""
+        Recipe.objects.create(
+            user=self.user, title='Primário', time_minutes=5,
+            price=Decimal('1.00'),
+        )
+
+        res = self.client.get(RECIPES_URL)
+        self.client.post(RECIPES_URL, {
+            'title': 'Nova', 'time_minutes': 5, 'price': '1.00',
+        })
+
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertFalse(routers.is_pinned(self.user.pk))
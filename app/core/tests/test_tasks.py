@@ -0,0 +1,162 @@
+"""
+Tests for the database task queue.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import taskqueue
+from core.models import Recipe, RecipeStats, Task
+
+
+calls = []
+
+
+@taskqueue.task
+def record(value):
+    calls.append(value)
+
+
+@taskqueue.task
+def explode():
+    raise RuntimeError('boom')
+
+
+class TaskQueueTests(TestCase):
+    """Testa o enfileiramento e a execução das tarefas."""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Verifica se a tarefa é gravada e excluída após rodar."""
+        record.delay(value=1)
+        self.assertEqual(Task.objects.get().name, record.task_name)
+
+        done = taskqueue.run_pending()
+
+        self.assertEqual(done, 1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_enqueue_rolled_back(self):
+        """Verifica se a tarefa some com o rollback da transação."""
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                record.delay(value=1)
+                raise ValueError
+
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(TASKS={
+        'EAGER': True, 'BATCH_SIZE': 10, 'POLL_INTERVAL': 1,
+        'MAX_ATTEMPTS': 3, 'LOCK_TIMEOUT': 300,
+    })
+    def test_eager_runs_on_commit(self):
+        """Verifica se, no modo EAGER, a tarefa roda após o commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay(value=1)
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failure_is_retried_then_failed(self):
+        """Verifica a nova tentativa com espera e a falha definitiva."""
+        explode.delay()
+
+        taskqueue.run_pending()
+
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.PENDING)
+        self.assertEqual(task.attempts, 1)
+        self.assertIn('boom', task.last_error)
+        self.assertGreater(task.run_after, timezone.now())
+
+        Task.objects.update(attempts=4, run_after=timezone.now())
+        with self.assertLogs('core.taskqueue', 'ERROR'):
+            taskqueue.run_pending()
+
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_claim_order_and_due_date(self):
+        """Verifica se só as tarefas vencidas são pegas, em ordem."""
+        now = timezone.now()
+        later = Task.objects.create(name='a', run_after=now + timedelta(1))
+        second = Task.objects.create(name='b', run_after=now)
+        first = Task.objects.create(
+            name='c', run_after=now - timedelta(seconds=1),
+        )
+
+        claimed = taskqueue.claim(10)
+
+        self.assertEqual(claimed, [first, second])
+        self.assertEqual(
+            Task.objects.get(id=later.id).status, Task.PENDING,
+        )
+        self.assertEqual(
+            Task.objects.filter(status=Task.RUNNING).count(), 2,
+        )
+
+    def test_claim_stale_running_task(self):
+        """Verifica se a tarefa de um worker que morreu volta a rodar."""
+        task = Task.objects.create(
+            name='a', run_after=timezone.now(), status=Task.RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(taskqueue.claim(10), [task])
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+    def test_claim_skips_locked_rows(self):
+        """Verifica se os workers não disputam as mesmas linhas."""
+        with CaptureQueriesContext(connection) as context:
+            taskqueue.claim(10)
+
+        self.assertTrue(any(
+            'FOR UPDATE SKIP LOCKED' in query['sql']
+            for query in context.captured_queries
+        ))
+
+    def test_run_worker_command(self):
+        """Verifica se o run_worker --once esvazia a fila."""
+        record.delay(value=1)
+        record.delay(value=2)
+        stdout = StringIO()
+
+        call_command('run_worker', processes=1, once=True, stdout=stdout)
+
+        self.assertEqual(calls, [1, 2])
+        self.assertIn('2 task(s) done', stdout.getvalue())
+
+
+class StatsTaskTests(TestCase):
+    """Testa o recálculo do resumo das receitas em segundo plano."""
+
+    def test_partial_save_rebuilds_stats_in_background(self):
+        """Verifica se salvar uma receita carregada sem os valores
+        antigos enfileira o recálculo do resumo."""
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123',
+        )
+        Recipe.objects.create(
+            user=user, title='A', time_minutes=10, price=Decimal('2.00'),
+        )
+        recipe = Recipe.objects.only('id', 'user').get()
+        Recipe.objects.filter(id=recipe.id).update(price=Decimal('8.00'))
+
+        recipe.save(update_fields=['user'])
+
+        self.assertEqual(Task.objects.get().kwargs, {'user_ids': [user.id]})
+        taskqueue.run_pending()
+        self.assertEqual(
+            RecipeStats.objects.get(user=user).price_max, Decimal('8.00'),
+        )
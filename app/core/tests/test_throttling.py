@@ -0,0 +1,236 @@
+"""
+Tests for the token bucket throttles.
+"""
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import (
+    AsyncClient,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core import throttling
+from core.authentication import get_local_cache
+
+
+RECIPES_URL = reverse('recipe:recipe-list')
+ASYNC_RECIPES_URL = reverse('recipe:async-recipe-list')
+TOKEN_URL = reverse('user:token')
+CREATE_USER_URL = reverse('user:create')
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'user': '1000/min', **rates},
+    })
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Testa o balde de fichas."""
+
+    def test_parse_rate(self):
+        """Verifica as taxas no formato do DRF."""
+        self.assertEqual(throttling.parse_rate('100/min'), (100, 60))
+        self.assertEqual(throttling.parse_rate('5/s'), (5, 1))
+        self.assertEqual(throttling.parse_rate('10/hour'), (10, 3600))
+
+    def test_consume_and_refill(self):
+        """Verifica a rajada até a capacidade e o reabastecimento."""
+        bucket = throttling.TokenBucket(3, 60, now=0)
+
+        self.assertEqual([bucket.consume(0) for _ in range(4)],
+                         [True, True, True, False])
+        self.assertAlmostEqual(bucket.wait(), 20)
+        # Uma ficha a cada 20 segundos.
+        self.assertFalse(bucket.consume(19))
+        self.assertTrue(bucket.consume(20))
+
+    def test_refill_is_capped(self):
+        """Verifica se o balde parado não passa da capacidade."""
+        bucket = throttling.TokenBucket(2, 1, now=0)
+
+        results = [bucket.consume(1000) for _ in range(3)]
+
+        self.assertEqual(results, [True, True, False])
+
+    def test_sync_discounts_other_processes(self):
+        """Verifica se a sincronização desconta o consumo dos outros
+        processos, via cache compartilhado."""
+        cache = caches['default']
+        cache.clear()
+        first = throttling.TokenBucket(10, 60, now=0)
+        second = throttling.TokenBucket(10, 60, now=0)
+
+        for _ in range(6):
+            first.consume(0)
+        first.sync(cache, 'test', 0)
+        second.sync(cache, 'test', 0)
+
+        self.assertEqual(second.tokens, 4)
+        # O próprio consumo já publicado não é descontado de novo.
+        first.sync(cache, 'test', 0)
+        self.assertEqual(first.tokens, 4)
+
+    @override_settings(API_THROTTLE={
+        **settings.API_THROTTLE, 'MAX_BUCKETS': 2,
+    })
+    def test_evicts_least_recently_used(self):
+        """Verifica se, no limite, sai o balde usado há mais tempo."""
+        throttling.reset()
+        self.addCleanup(throttling.reset)
+        first = throttling.get_bucket('a', 10, 60)
+        throttling.get_bucket('b', 10, 60)
+        throttling.get_bucket('a', 10, 60)
+
+        throttling.get_bucket('c', 10, 60)
+
+        self.assertIs(throttling.get_bucket('a', 10, 60), first)
+        self.assertEqual(list(throttling._buckets), ['c', 'a'])
+
+
+@override_settings(API_THROTTLE={**settings.API_THROTTLE, 'ENABLED': True})
+class ThrottleApiTests(TestCase):
+    """Testa os throttles nos endpoints."""
+
+    def setUp(self):
+        throttling.reset()
+        self.addCleanup(throttling.reset)
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+
+    @throttle_rates(token='2/min')
+    def test_token_endpoint_throttled(self):
+        """Verifica o limite do token e o header Retry-After."""
+        payload = {'email': self.user.email, 'password': 'testpass123'}
+        for _ in range(2):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # Uma ficha a cada 30 segundos.
+        self.assertIn(int(res['Retry-After']), range(1, 31))
+
+    @throttle_rates(user_create='1/hour')
+    def test_anonymous_throttled_per_ip(self):
+        """Verifica se os anônimos são limitados por IP."""
+        def create(email, ip):
+            return self.client.post(
+                CREATE_USER_URL,
+                {'email': email, 'password': 'testpass123', 'name': 'Test'},
+                REMOTE_ADDR=ip,
+            ).status_code
+
+        self.assertEqual(create('a@example.com', '10.0.0.1'), 201)
+        self.assertEqual(create('b@example.com', '10.0.0.1'), 429)
+        self.assertEqual(create('c@example.com', '10.0.0.2'), 201)
+
+    @throttle_rates(user_create='1/hour')
+    def test_forwarded_for_not_trusted(self):
+        """Verifica se trocar o X-Forwarded-For não muda o IP do cliente
+        quando não há proxies configurados."""
+        def create(email, forwarded_for):
+            return self.client.post(
+                CREATE_USER_URL,
+                {'email': email, 'password': 'testpass123', 'name': 'Test'},
+                REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            ).status_code
+
+        self.assertEqual(create('a@example.com', '1.1.1.1'), 201)
+        self.assertEqual(create('b@example.com', '2.2.2.2'), 429)
+
+    @throttle_rates(recipes='2/min')
+    def test_recipes_throttled_per_user(self):
+        """Verifica se o limite das receitas vale por usuário."""
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        for _ in range(2):
+            self.client.get(RECIPES_URL)
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        self.client.force_authenticate(other)
+        res = self.client.post(RECIPES_URL, {
+            'title': 'Bolo', 'time_minutes': 5, 'price': Decimal('1.00'),
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    @throttle_rates(recipes='1/min')
+    @override_settings(API_THROTTLE={
+        **settings.API_THROTTLE, 'ENABLED': False,
+    })
+    def test_disabled(self):
+        """Verifica se os throttles podem ser desligados."""
+        self.client.force_authenticate(self.user)
+
+        for _ in range(3):
+            res = self.client.get(RECIPES_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @throttle_rates(recipes='10/min')
+    def test_check_does_no_io(self):
+        """Verifica se a verificação não consulta o banco."""
+        request = Request(APIRequestFactory().get(RECIPES_URL))
+        request.user = self.user
+        view = type('View', (), {'throttle_scope': 'recipes'})()
+
+        with self.assertNumQueries(0):
+            for throttle_class in (
+                throttling.UserTokenBucketThrottle,
+                throttling.ScopedTokenBucketThrottle,
+            ):
+                self.assertTrue(
+                    throttle_class().allow_request(request, view),
+                )
+
+
+@override_settings(API_THROTTLE={**settings.API_THROTTLE, 'ENABLED': True})
+class AsyncThrottleApiTests(TransactionTestCase):
+    """Testa os throttles nas views async (TransactionTestCase: elas
+    consultam o banco em threads do executor, com outras conexões)."""
+
+    def setUp(self):
+        throttling.reset()
+        self.addCleanup(throttling.reset)
+        get_local_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+
+    @throttle_rates(recipes='2/min')
+    async def test_async_recipes_throttled(self):
+        """Verifica se as views async aplicam o limite do escopo."""
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        client = AsyncClient()
+        auth = {'AUTHORIZATION': 'Token ' + token.key}
+        for _ in range(2):
+            res = await client.get(ASYNC_RECIPES_URL, **auth)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = await client.get(ASYNC_RECIPES_URL, **auth)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn(int(res['Retry-After']), range(1, 31))
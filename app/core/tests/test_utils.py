@@ -0,0 +1,27 @@
+"""
+Tests for the shared test helpers.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.tests.utils import QueryBudgetMixin
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    """Testa as asserções de orçamento de consultas."""
+
+    def test_within_budget(self):
+        """Verifica se consultas dentro do orçamento passam."""
+        with self.assertQueryBudget(1) as context:
+            get_user_model().objects.count()
+
+        self.assertEqual(len(context), 1)
+
+    def test_over_budget_lists_queries(self):
+        """Verifica se o excesso falha e lista o SQL executado."""
+        with self.assertRaisesRegex(
+            AssertionError, r'2 queries executed, budget is 1:\n1\. SELECT',
+        ):
+            with self.assertQueryBudget(1):
+                get_user_model().objects.count()
+                get_user_model().objects.exists()
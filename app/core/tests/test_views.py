@@ -0,0 +1,53 @@
+"""
+Tests for the core views.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import metrics
+
+
+METRICS_URL = reverse('api-metrics')
+
+
+class MetricsViewTests(TestCase):
+    """Testa o endpoint de métricas."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_metrics_requires_admin(self):
+        """Verifica se apenas administradores acessam as métricas."""
+        user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_prometheus_format(self):
+        """Verifica se as métricas são expostas no formato do Prometheus."""
+        counter = metrics.counter(
+            'test_events_total', 'Test events.', ['kind'],
+        )
+        counter.inc(kind='a "quoted"')
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'adminpass123',
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        content = res.content.decode()
+        self.assertIn('# TYPE test_events_total counter', content)
+        self.assertIn('test_events_total{kind="a \\"quoted\\""} 1', content)
@@ -0,0 +1,50 @@
+"""
+Helpers compartilhados pelos testes das apps.
+"""
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from core.authentication import get_local_cache
+
+
+class QueryBudgetMixin:
+    """Mixin de TestCase para limitar as consultas SQL de um trecho.
+
+    Diferente do assertNumQueries (contagem exata), o orçamento é um
+    máximo: melhorias não quebram o teste, mas um N+1 ou uma consulta a
+    mais na autenticação sim, e a falha lista o SQL executado.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+
+        if len(context) > budget:
+            queries = '\n'.join(
+                '%d. %s' % (i, query['sql'])
+                for i, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                '%d queries executed, budget is %d:\n%s'
+                % (len(context), budget, queries)
+            )
+
+    def assertQueryBudgetPerSize(self, budget, sizes, seed, request):
+        """Verifica o orçamento de `request()` para cada tamanho de dados.
+
+        `seed(size)` prepara os dados (fora da contagem); `request()`
+        executa a requisição medida, com os caches frios: autenticação,
+        versões e respostas em cache não escondem consultas. Como o
+        orçamento é o mesmo para todos os tamanhos, um N+1 falha.
+        """
+        for size in sizes:
+            with self.subTest(size=size):
+                seed(size)
+                cache.clear()
+                get_local_cache().clear()
+                with self.assertQueryBudget(budget):
+                    request()
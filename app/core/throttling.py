@@ -0,0 +1,200 @@
+"""
+Rate limiting por token bucket em memória.
+
+Cada processo guarda um balde por (escopo, usuário ou IP): a verificação
+é aritmética sobre floats, sem banco nem cache. Os baldes não usam lock:
+duas threads atualizando o mesmo balde ao mesmo tempo podem deixar passar
+uma requisição a mais, o que é aceitável para um limite de taxa.
+
+Com API_THROTTLE['SHARED_CACHE'], cada balde soma a cada SYNC_INTERVAL
+segundos o que consumiu a um contador no cache compartilhado (por janela
+do período) e desconta o que os outros processos consumiram no mesmo
+intervalo, aproximando um limite global.
+
+As taxas seguem o formato do DRF ('100/min') e ficam em
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'].
+"""
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Em ordem de uso: o mais recente no fim, o próximo a ser descartado no
+# início.
+_buckets = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Converte '100/min' em (100, 60)."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class TokenBucket:
+    """Balde de `capacity` fichas, reabastecido à taxa de `capacity`
+    fichas por `period` segundos."""
+    __slots__ = ('capacity', 'period', 'rate', 'tokens', 'updated',
+                 'pending', 'synced_at', 'window', 'mine', 'remote')
+
+    def __init__(self, capacity, period, now=None):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic() if now is None else now
+        # Estado da sincronização com o cache compartilhado.
+        self.pending = 0
+        self.synced_at = self.updated
+        self.window = None
+        self.mine = 0
+        self.remote = 0
+
+    def consume(self, now):
+        """Tira uma ficha, se houver, e diz se a requisição passa."""
+        tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+        if tokens < 1:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - 1
+        self.pending += 1
+        return True
+
+    def wait(self):
+        """Segundos até a próxima ficha."""
+        return max(1 - self.tokens, 0) / self.rate
+
+    def sync(self, cache, key, now):
+        """Publica o consumo local e desconta o dos outros processos."""
+        self.synced_at = now
+        window = int(time.time() // self.period)
+        if window != self.window:
+            self.window, self.mine, self.remote = window, 0, 0
+
+        shared_key = f'throttle:{key}:{window}'
+        pending, self.pending = self.pending, 0
+        if pending:
+            cache.add(shared_key, 0, self.period * 2)
+            try:
+                total = cache.incr(shared_key, pending)
+            except ValueError:
+                # A chave expirou entre o add e o incr.
+                total = pending
+        else:
+            total = cache.get(shared_key, 0)
+
+        self.mine += pending
+        remote = max(total - self.mine, 0)
+        self.tokens = max(self.tokens - (remote - self.remote), 0)
+        self.remote = remote
+
+
+def get_bucket(key, capacity, period):
+    """Retorna o balde da chave, criado cheio se ainda não existir."""
+    bucket = _buckets.get(key)
+    if (
+        bucket is not None
+        and bucket.capacity == capacity
+        and bucket.period == period
+    ):
+        try:
+            _buckets.move_to_end(key)
+        except KeyError:
+            # Descartado por outra thread; continua valendo nesta.
+            pass
+        return bucket
+
+    if len(_buckets) >= settings.API_THROTTLE['MAX_BUCKETS']:
+        # Descarta o balde usado há mais tempo: o cliente dele recomeça
+        # com o balde cheio, o que só afrouxa o limite.
+        try:
+            _buckets.popitem(last=False)
+        except KeyError:
+            pass
+    bucket = _buckets[key] = TokenBucket(capacity, period)
+    return bucket
+
+
+def reset():
+    """Esvazia todos os baldes do processo (ex.: entre testes)."""
+    _buckets.clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base dos throttles por token bucket. As subclasses definem o
+    escopo (`get_scope`) e a identidade do cliente (`get_cache_key`),
+    como os throttles do DRF."""
+    scope = None
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError('.get_cache_key() must be overridden')
+
+    def get_client_key(self, request):
+        """Identifica o usuário autenticado, ou o IP dos anônimos (o
+        REMOTE_ADDR, ou o X-Forwarded-For só até REST_FRAMEWORK
+        ['NUM_PROXIES'] proxies, para que o cliente não troque de IP
+        mudando o header)."""
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        config = settings.API_THROTTLE
+        if not config['ENABLED']:
+            return True
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        self.bucket = get_bucket(f'{scope}:{key}', capacity, period)
+        now = time.monotonic()
+        if (
+            config['SHARED_CACHE']
+            and now - self.bucket.synced_at >= config['SYNC_INTERVAL']
+        ):
+            self.bucket.sync(
+                caches[config['SHARED_CACHE']], f'{scope}:{key}', now,
+            )
+        return self.bucket.consume(now)
+
+    def wait(self):
+        return self.bucket.wait()
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Limite geral por usuário (ou IP, para anônimos) em toda a API."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        return self.get_client_key(request)
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """Limite por usuário (ou IP) no escopo da view (`throttle_scope`);
+    views sem escopo não são limitadas."""
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scope', None)
+
+    def get_cache_key(self, request, view):
+        return self.get_client_key(request)
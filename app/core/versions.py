@@ -0,0 +1,81 @@
+"""
+Versões das Receitas (por coleção do usuário e por receita).
+
+Cada gravação de uma receita troca a versão da coleção do dono e a da
+própria receita. As versões ficam no cache configurado em
+RECIPE_VERSION_CACHE e servem para ETags e chaves de cache de respostas;
+uma versão ausente (ex.: descartada pelo cache) é simplesmente recriada,
+o que apenas invalida o que dependia dela.
+
+As versões das receitas expiram após RECIPE_OBJECT_VERSION_TIMEOUT: elas
+são lidas antes da busca da receita (pelos GETs condicionais), então
+pks inexistentes ou de outros usuários também criam uma; sem expirar,
+essas chaves ocupariam o cache para sempre.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def _cache():
+    return caches[settings.RECIPE_VERSION_CACHE]
+
+
+def _collection_key(user_id):
+    return f'recipe:version:user:{user_id}'
+
+
+def _object_key(recipe_id):
+    return f'recipe:version:obj:{recipe_id}'
+
+
+def _new_version():
+    """Retorna uma versão nova: (token, timestamp da alteração)."""
+    return uuid.uuid4().hex, time.time()
+
+
+def _get(key, timeout=None):
+    cache = _cache()
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, timeout=timeout):
+            version = cache.get(key) or version
+    return version
+
+
+def get_collection_version(user_id):
+    """Retorna a versão (token, timestamp) das receitas do usuário."""
+    return _get(_collection_key(user_id))
+
+
+def get_object_version(recipe_id):
+    """Retorna a versão (token, timestamp) de uma receita."""
+    return _get(
+        _object_key(recipe_id), settings.RECIPE_OBJECT_VERSION_TIMEOUT,
+    )
+
+
+def bump(user_id, recipe_ids=()):
+    """Troca a versão da coleção do usuário e das receitas informadas.
+
+    A troca é repetida após o commit, para que uma leitura concorrente
+    feita antes do commit não fique associada à versão nova.
+    """
+    object_keys = [_object_key(recipe_id) for recipe_id in recipe_ids]
+
+    def _bump():
+        version = _new_version()
+        cache = _cache()
+        cache.set(_collection_key(user_id), version, timeout=None)
+        if object_keys:
+            cache.set_many(
+                {key: version for key in object_keys},
+                timeout=settings.RECIPE_OBJECT_VERSION_TIMEOUT,
+            )
+
+    _bump()
+    transaction.on_commit(_bump)
@@ -0,0 +1,29 @@
+"""
+Views do core.
+"""
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics
+from core.authentication import CachedTokenAuthentication
+from core.renderers import PrometheusTextRenderer
+
+
+class MetricsView(APIView):
+    """Expõe as métricas do processo para o Prometheus (só admins)."""
+    authentication_classes = [
+        CachedTokenAuthentication,
+        SessionAuthentication,
+    ]
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusTextRenderer]
+    # Fora do schema OpenAPI: não faz parte da API pública.
+    schema = None
+
+    def get(self, request):
+        return Response(
+            metrics.render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
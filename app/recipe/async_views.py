@@ -0,0 +1,65 @@
+"""
+Views assíncronas (ASGI) das Receitas: listagem, detalhes e criação.
+
+Mesmo contrato de RecipeViewSet (serializadores e paginação por cursor),
+com uma única ida ao thread pool por requisição para o trabalho de banco.
+"""
+from django.http import Http404
+
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from core.async_views import async_api_view, json_response, parse_json
+from core.db.threads import database_sync_to_async
+from core.models import Recipe
+from recipe import serializers
+from recipe.pagination import RecipeCursorPagination
+
+
+def _list_recipes(request):
+    drf_request = Request(request)
+    paginator = RecipeCursorPagination()
+    queryset = Recipe.objects.filter(user=request.user).order_by('-id')
+    page = paginator.paginate_queryset(queryset, drf_request)
+    if page is None:
+        return serializers.RecipeSerializer(queryset, many=True).data
+
+    data = serializers.RecipeSerializer(page, many=True).data
+    return paginator.get_paginated_response(data).data
+
+
+def _create_recipe(user, payload):
+    serializer = serializers.RecipeDetailSerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    serializer.save(user=user)
+    return serializer.data
+
+
+def _get_recipe(user, pk):
+    try:
+        recipe = Recipe.objects.get(user=user, pk=pk)
+    except Recipe.DoesNotExist:
+        raise Http404
+    return serializers.RecipeDetailSerializer(recipe).data
+
+
+@async_api_view(['GET', 'POST'], throttle_scope='recipes')
+async def recipe_list(request):
+    """Lista (GET) ou cria (POST) as receitas do usuário."""
+    if request.method == 'GET':
+        data = await database_sync_to_async(_list_recipes)(request)
+        return json_response(data)
+
+    payload = parse_json(request)
+    data = await database_sync_to_async(_create_recipe)(request.user, payload)
+    return json_response(data, status=status.HTTP_201_CREATED)
+
+
+@async_api_view(['GET'], throttle_scope='recipes')
+async def recipe_detail(request, pk):
+    """Retorna os detalhes de uma receita do usuário."""
+    try:
+        data = await database_sync_to_async(_get_recipe)(request.user, pk)
+    except Http404:
+        raise exceptions.NotFound()
+    return json_response(data)
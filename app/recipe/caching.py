@@ -0,0 +1,69 @@
+"""
+Cache das respostas de listagem e detalhes das Receitas.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.response import Response
+
+from core import metrics
+
+
+cache_hits = metrics.counter(
+    'recipe_response_cache_hits_total',
+    'Recipe responses served from the response cache.',
+    ['action'],
+)
+cache_misses = metrics.counter(
+    'recipe_response_cache_misses_total',
+    'Recipe responses computed because they were not in the cache.',
+    ['action'],
+)
+
+
+class ResponseCacheMixin:
+    """Guarda os dados serializados de list e retrieve no cache.
+
+    A chave inclui a versão da coleção (list) ou da receita (retrieve),
+    obtida de `get_recipe_version` (ver ConditionalGetMixin). Como os
+    sinais de post_save/post_delete trocam essas versões, uma gravação
+    invalida exatamente as respostas afetadas, sem varrer o cache.
+    """
+
+    def get_response_cache_key(self):
+        serializer_class = self.get_serializer_class()
+        raw = ':'.join([
+            self.get_recipe_version()[0],
+            str(self.request.user.pk),
+            self.request.get_full_path(),
+            f'{serializer_class.__module__}.{serializer_class.__qualname__}',
+        ])
+        return 'recipe:response:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        config = settings.RECIPE_RESPONSE_CACHE
+        if not config['ENABLED']:
+            return handler(request, *args, **kwargs)
+
+        cache = caches[config['ALIAS']]
+        key = self.get_response_cache_key()
+        data = cache.get(key)
+        if data is not None:
+            cache_hits.inc(action=self.action)
+            return Response(data)
+
+        cache_misses.inc(action=self.action)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, config['TIMEOUT'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,76 @@
+"""
+GETs condicionais (ETag / Last-Modified) das Receitas.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from core import versions
+
+
+class ConditionalGetMixin:
+    """Emite ETag/Last-Modified em list e retrieve e responde 304 aos
+    GETs condicionais antes de executar a consulta ou o serializador.
+
+    Os validadores vêm das versões em `core.versions`, lidas do cache,
+    então uma revalidação não toca no banco de receitas.
+    """
+
+    def get_recipe_version(self):
+        """Retorna a versão (token, timestamp) do recurso da ação atual,
+        lida uma única vez por requisição."""
+        if not hasattr(self, '_recipe_version'):
+            if self.action == 'list':
+                self._recipe_version = versions.get_collection_version(
+                    self.request.user.pk
+                )
+            else:
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                self._recipe_version = versions.get_object_version(
+                    self.kwargs[lookup_url_kwarg]
+                )
+
+        return self._recipe_version
+
+    def get_etag(self, version):
+        """Deriva a ETag da versão e de tudo que altera a representação:
+        usuário, caminho com query string e formato negociado."""
+        request = self.request
+        raw = ':'.join([
+            version[0],
+            str(request.user.pk),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+        ])
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version = self.get_recipe_version()
+        etag = self.get_etag(version)
+        last_modified = int(version[1])
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified,
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Cada usuário tem suas receitas: só o cliente pode guardar a
+        # resposta, e deve revalidá-la antes de reutilizar.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
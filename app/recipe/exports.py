@@ -0,0 +1,66 @@
+"""
+Exportação em streaming das Receitas (NDJSON e CSV).
+"""
+import csv
+import json
+
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'time_minutes', 'price', 'link']
+PRICE_INDEX = EXPORT_FIELDS.index('price')
+
+# Agrupa as linhas em blocos, para não fazer uma escrita por linha.
+CHUNK_BYTES = 64 * 1024
+
+
+class _Echo:
+    """Objeto "arquivo" que apenas devolve o que o csv.writer escreve."""
+
+    def write(self, value):
+        return value
+
+
+def _buffered(lines):
+    """Junta as linhas em blocos de aproximadamente CHUNK_BYTES."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _ndjson_lines(rows):
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    for row in rows:
+        row = list(row)
+        row[PRICE_INDEX] = str(row[PRICE_INDEX])
+        yield dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows):
+    """Converte tuplas (na ordem de EXPORT_FIELDS) em blocos NDJSON."""
+    return _buffered(_ndjson_lines(rows))
+
+
+def iter_csv(rows):
+    """Converte tuplas (na ordem de EXPORT_FIELDS) em blocos CSV."""
+    return _buffered(_csv_lines(rows))
+
+
+# output -> (gerador, content type, extensão do arquivo)
+FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (iter_csv, 'text/csv', 'csv'),
+}
@@ -0,0 +1,118 @@
+"""
+Caminho rápido (somente leitura) para listagem e detalhes das Receitas.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+
+from rest_framework import fields as drf_fields
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from core.instrumentation import timer
+
+
+# to_representation que não alteram os valores vindos do banco para esses
+# campos (int e str); as colunas deles são copiadas direto da tupla.
+PASSTHROUGH = (
+    drf_fields.IntegerField.to_representation,
+    drf_fields.CharField.to_representation,
+)
+
+
+@lru_cache(maxsize=None)
+def get_row_renderer(serializer_class, fields=None):
+    """Compila e retorna `render(row) -> dict` para o serializador.
+
+    `row` é uma tupla com os valores dos campos (na ordem de
+    `render.columns`), e o dict produzido é igual ao `data` que o
+    serializador geraria para a mesma instância: mesma ordem de chaves e
+    os mesmos `to_representation` dos campos que convertem valores (ex.:
+    Decimal do `price` para string), sem instanciar modelos, campos ou
+    OrderedDicts por linha.
+    """
+    serializer = serializer_class(
+        fields=list(fields) if fields is not None else None,
+    )
+    namespace = {}
+    items = []
+    for index, (name, field) in enumerate(serializer.fields.items()):
+        value = f'row[{index}]'
+        if type(field).to_representation not in PASSTHROUGH:
+            convert = f'convert_{index}'
+            namespace[convert] = field.to_representation
+            value = f'(None if {value} is None else {convert}({value}))'
+        items.append(f'{name!r}: {value}')
+
+    source = 'def render(row):\n    return {%s}\n' % ', '.join(items)
+    exec(compile(source, f'<render {serializer_class.__name__}>', 'exec'),
+         namespace)
+
+    render = namespace['render']
+    render.columns = tuple(
+        field.source for field in serializer.fields.values()
+    )
+    return render
+
+
+class FastReadMixin:
+    """Serve list e retrieve lendo tuplas com `values_list` e montando a
+    resposta com `get_row_renderer`, em vez do ModelSerializer.
+
+    Vale apenas para serializadores cujos campos são colunas do modelo
+    (sem SerializerMethodField ou relações aninhadas) e para views cujas
+    permissões de objeto se resumem ao filtro do queryset, já que não há
+    instância para `check_object_permissions`. A view deve implementar
+    `get_requested_fields` (ver `?fields=`) e `cursor_ordering`. Desligue com
+    RECIPE_FAST_PATH=0 para voltar ao caminho do serializador.
+    """
+
+    def get_row_renderer(self):
+        fields = self.get_requested_fields()
+        return get_row_renderer(
+            self.get_serializer_class(),
+            tuple(fields) if fields else None,
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not settings.RECIPE_FAST_PATH:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        render = self.get_row_renderer()
+        # O cursor lê os campos da ordenação nas linhas (por atributo),
+        # então eles vão no fim da tupla nomeada quando não forem campos
+        # da resposta.
+        ordering = (name.lstrip('-') for name in self.cursor_ordering)
+        columns = render.columns + tuple(
+            name for name in dict.fromkeys(ordering)
+            if name not in render.columns
+        )
+        rows = queryset.values_list(*columns, named=True)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            with timer('serialize'):
+                data = [render(row) for row in page]
+            return self.get_paginated_response(data)
+
+        rows = list(rows)
+        with timer('serialize'):
+            data = [render(row) for row in rows]
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.RECIPE_FAST_PATH:
+            return super().retrieve(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        render = self.get_row_renderer()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset.values_list(*render.columns),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+
+        with timer('serialize'):
+            data = render(row)
+        return Response(data)
@@ -0,0 +1,70 @@
+"""
+Filtros e ordenações da listagem de Receitas.
+"""
+from django.utils.translation import gettext as _
+
+from rest_framework import serializers
+
+
+# Ordenações aceitas em `?ordering=`. Cada uma termina no id (desempate
+# exigido pelo cursor) e corresponde a um índice composto que começa no
+# user_id (ver core.models.Recipe.Meta.indexes), lido em qualquer sentido.
+ORDERINGS = {
+    'id': ('id',),
+    '-id': ('-id',),
+    'time_minutes': ('time_minutes', 'id'),
+    '-time_minutes': ('-time_minutes', '-id'),
+    'price': ('price', 'id'),
+    '-price': ('-price', '-id'),
+    'title': ('title', 'id'),
+    '-title': ('-title', '-id'),
+}
+
+RANGES = (
+    ('time_minutes__gte', 'time_minutes__lte'),
+    ('price__gte', 'price__lte'),
+)
+
+
+class RecipeFilterSerializer(serializers.Serializer):
+    """Valida os parâmetros de filtro e ordenação da listagem."""
+    time_minutes__gte = serializers.IntegerField(min_value=0, required=False)
+    time_minutes__lte = serializers.IntegerField(min_value=0, required=False)
+    price__gte = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False,
+    )
+    price__lte = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False,
+    )
+    title = serializers.CharField(max_length=255, required=False)
+    ordering = serializers.ChoiceField(
+        choices=list(ORDERINGS), required=False,
+    )
+
+    def validate(self, attrs):
+        for lower, upper in RANGES:
+            if lower in attrs and upper in attrs \
+                    and attrs[lower] > attrs[upper]:
+                raise serializers.ValidationError({
+                    lower: [_('Must not be greater than %(field)s.')
+                            % {'field': upper}],
+                })
+        return attrs
+
+
+def filter_recipes(queryset, params):
+    """Aplica os filtros de `params` e retorna (queryset, ordenação).
+
+    A ordenação é None quando `?ordering=` não foi enviado, para que a
+    view mantenha a padrão (ou a da busca). Parâmetros inválidos geram
+    ValidationError.
+    """
+    serializer = RecipeFilterSerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    filters = dict(serializer.validated_data)
+
+    ordering = filters.pop('ordering', None)
+    if filters:
+        queryset = queryset.filter(**filters)
+
+    return queryset, ORDERINGS.get(ordering)
@@ -0,0 +1,91 @@
+"""
+Chaves de idempotência (header Idempotency-Key) nas escritas das Receitas.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        'A request with this Idempotency-Key is still being processed.'
+    )
+    default_code = 'idempotency_key_in_use'
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _(
+        'This Idempotency-Key was already used with a different request.'
+    )
+    default_code = 'idempotency_key_reused'
+
+
+def idempotent(method):
+    """Decora uma ação de escrita para aceitar o header Idempotency-Key.
+
+    A primeira resposta de sucesso fica no cache (RECIPE_IDEMPOTENCY) por
+    usuário, método, caminho e chave. Uma repetição com o mesmo corpo é
+    respondida com ela, sem validar nem gravar de novo; com outro corpo,
+    recebe 422, e enquanto a primeira ainda roda, 409. Respostas de erro
+    não são guardadas, então o cliente pode corrigir e repetir.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return method(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({HEADER: [
+                _('Ensure this value has between 1 and %(max)d characters.')
+                % {'max': MAX_KEY_LENGTH}
+            ]})
+
+        config = settings.RECIPE_IDEMPOTENCY
+        cache = caches[config['ALIAS']]
+        raw = ':'.join([
+            str(request.user.pk), request.method, request.path, key,
+        ])
+        cache_key = 'recipe:idempotency:' + hashlib.sha256(
+            raw.encode(),
+        ).hexdigest()
+        lock_key = cache_key + ':lock'
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(lock_key, 1, config['LOCK_TIMEOUT']):
+                raise IdempotencyKeyInUse()
+            try:
+                # Outra requisição pode ter terminado entre o get e o add.
+                stored = cache.get(cache_key)
+                if stored is None:
+                    response = method(self, request, *args, **kwargs)
+                    if status.is_success(response.status_code):
+                        cache.set(cache_key, (
+                            fingerprint, response.status_code, response.data,
+                        ), config['TIMEOUT'])
+                    return response
+            finally:
+                cache.delete(lock_key)
+
+        stored_fingerprint, status_code, data = stored
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReused()
+        response = Response(data, status=status_code)
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    return wrapper
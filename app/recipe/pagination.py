@@ -0,0 +1,171 @@
+"""
+Paginação das listagens de Receitas.
+"""
+from base64 import b64decode
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    _reverse_ordering,
+)
+from rest_framework.utils.urls import remove_query_param
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Paginação por cursor (keyset) ordenada pelo id decrescente.
+
+    O cursor guarda os valores de todos os campos da ordenação (que
+    sempre termina no id, único), e cada página filtra pelas linhas após
+    essa tupla, ex.: `time_minutes > t OR (time_minutes = t AND id > i)`.
+    Assim empates no primeiro campo não recorrem ao OFFSET do
+    CursorPagination do DRF (limitado a offset_cutoff), e o custo de uma
+    página não cresce com a profundidade da rolagem: ela é lida do índice
+    composto (user_id, campo, id) a partir do cursor.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        self.page_size = settings.RECIPE_PAGE_SIZE
+        self.max_page_size = settings.RECIPE_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        """Usa a ordenação escolhida pela view (ex.: rank da busca),
+        quando ela a define em `cursor_ordering`."""
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering:
+            return tuple(ordering)
+
+        return super().get_ordering(request, queryset, view)
+
+    def get_page_size(self, request):
+        """Retorna None (sem paginação) quando a listagem completa
+        estiver habilitada nas configurações."""
+        if settings.RECIPE_LIST_UNPAGINATED:
+            return None
+
+        return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = (
+            _reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        position = self.cursor.position if self.cursor else None
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_keyset_filter(ordering, position)
+                )
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_filter(self, ordering, position):
+        """Filtra as linhas que vêm depois de `position` em `ordering`.
+
+        A condição redundante no primeiro campo (`>=`/`<=`) limita a
+        varredura do índice ao trecho a partir do cursor.
+        """
+        keyset = Q()
+        equal = {}
+        for name, value in zip(ordering, position):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            keyset |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+
+        first = ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{lookup}': position[0]}) & keyset
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Página anterior vazia: a seguinte é a primeira.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        position = self._get_position_from_instance(
+            self.page[-1], self.ordering,
+        )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Depois do fim: a anterior é a última página.
+            position = None
+        else:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering,
+            )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position)
+        )
+
+    def decode_cursor(self, request):
+        """Lê o cursor, cuja posição tem um valor por campo da ordenação
+        (parâmetros `p` repetidos)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        position = tokens.get('p')
+        if position is not None:
+            if len(position) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            position = tuple(position)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for name in ordering:
+            field = name.lstrip('-')
+            if isinstance(instance, dict):
+                values.append(str(instance[field]))
+            else:
+                values.append(str(getattr(instance, field)))
+        return tuple(values)
@@ -0,0 +1,47 @@
+"""
+Busca textual nas Receitas.
+"""
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.db import connections
+from django.db.models import F, IntegerField, Q
+from django.db.models.functions import Cast
+
+
+# Mesma configuração usada pelo trigger da migração core 0004.
+SEARCH_CONFIG = 'simple'
+
+# O rank é convertido em inteiro para servir de posição exata no cursor
+# da paginação (floats não fazem ida e volta confiável como texto).
+RANK_SCALE = 1000000
+
+
+def search_recipes(queryset, query):
+    """Filtra as receitas pelo texto e retorna (queryset, ordenação).
+
+    No PostgreSQL usa o search_vector (índice GIN) com ranking, somando a
+    similaridade por trigramas do título para tolerar erros de digitação.
+    Nos demais bancos (ex.: SQLite dos testes) faz um icontains simples.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        queryset = queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query)
+        )
+        return queryset, ('-id',)
+
+    search_query = SearchQuery(
+        query, config=SEARCH_CONFIG, search_type='websearch',
+    )
+    rank = (
+        SearchRank(F('search_vector'), search_query)
+        + TrigramSimilarity('title', query)
+    )
+    queryset = queryset.annotate(
+        search_rank=Cast(rank * RANK_SCALE, IntegerField()),
+    ).filter(
+        Q(search_vector=search_query) | Q(title__trigram_similar=query)
+    )
+    return queryset, ('-search_rank', '-id')
@@ -1,15 +1,120 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
 from rest_framework import serializers
 
-from core.models import Recipe
+from core.instrumentation import TimedSerializerMixin
+from core.models import Recipe, RecipeStats
+from core.signals import recipes_changed
+
+
+STATS_FIELDS = {'time_minutes', 'price'}
+
+
+def notify_recipes_changed(recipes, recipe_ids=(), previous=None):
+    """Avisa os receptores sobre receitas gravadas em lote.
+
+    `previous` mapeia o id das receitas atualizadas que mudaram tempo ou
+    preço aos valores (time_minutes, price) anteriores; sem ele, as
+    receitas são tratadas como novas.
+    """
+    changes = defaultdict(lambda: ([], []))
+    for recipe in recipes:
+        added, removed = changes[recipe.user_id]
+        if previous is None:
+            added.append((recipe.time_minutes, recipe.price))
+        elif recipe.pk in previous:
+            added.append((recipe.time_minutes, recipe.price))
+            removed.append(previous[recipe.pk])
+
+    for user_id, (added, removed) in changes.items():
+        recipes_changed.send(
+            sender=Recipe, user_id=user_id, recipe_ids=recipe_ids,
+            added=added, removed=removed,
+        )
+
+
+class RecipeListSerializer(
+    TimedSerializerMixin,
+    serializers.ListSerializer,
+):
+    """Serializador de listas de Receitas, gravando em lote."""
+
+    def create(self, validated_data):
+        """Cria as receitas com bulk_create, em lotes."""
+        recipes = [Recipe(**attrs) for attrs in validated_data]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Recipe.objects.bulk_create(
+                recipes,
+                batch_size=settings.RECIPE_BULK_BATCH_SIZE,
+            )
+            notify_recipes_changed(recipes)
+        else:
+            # Sem RETURNING (ex.: SQLite) o bulk_create não preenche os
+            # ids, que precisamos devolver para cada item; o post_save de
+            # cada receita já avisa os receptores.
+            for recipe in recipes:
+                recipe.save(force_insert=True)
+
+        return recipes
+
+    def update(self, instances, validated_data):
+        """Atualiza as receitas (na mesma ordem dos dados) com bulk_update."""
+        fields = set()
+        previous = {}
+        for instance, attrs in zip(instances, validated_data):
+            if STATS_FIELDS & attrs.keys():
+                previous[instance.pk] = (instance.time_minutes, instance.price)
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+
+        if fields:
+            # O bulk_update não preenche os campos auto_now.
+            now = timezone.now()
+            for instance in instances:
+                instance.updated_at = now
+            Recipe.objects.bulk_update(
+                instances,
+                sorted(fields | {'updated_at'}),
+                batch_size=settings.RECIPE_BULK_BATCH_SIZE,
+            )
+            notify_recipes_changed(
+                instances, [instance.pk for instance in instances],
+                previous,
+            )
+        return instances
+
 
+class SparseFieldsMixin:
+    """Aceita o argumento `fields` com os campos a serializar e descarta
+    os demais (ver `?fields=` em RecipeViewSet)."""
 
-class RecipeSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class RecipeSerializer(
+    TimedSerializerMixin,
+    SparseFieldsMixin,
+    serializers.ModelSerializer,
+):
     """Serializador das Receitas."""
 
     class Meta:
         model = Recipe
         fields = ['id', 'title', 'time_minutes', 'price', 'link']
         read_only_fields = ['id']
+        list_serializer_class = RecipeListSerializer
 
 
 class RecipeDetailSerializer(RecipeSerializer):
@@ -17,3 +122,51 @@ class RecipeDetailSerializer(RecipeSerializer):
 
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ['description']
+
+
+class RecipeSyncSerializer(RecipeDetailSerializer):
+    """Serializador das Receitas alteradas na sincronização."""
+
+    class Meta(RecipeDetailSerializer.Meta):
+        fields = RecipeDetailSerializer.Meta.fields + ['updated_at']
+        read_only_fields = fields
+
+
+class RecipeSyncPageSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Serializador de uma página da sincronização (ver recipe.sync)."""
+    changes = RecipeSyncSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
+class RecipeBulkDeleteSerializer(serializers.Serializer):
+    """Serializador dos ids das Receitas a excluir em lote."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+    )
+
+    def validate_ids(self, value):
+        if len(value) > settings.RECIPE_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                _('A batch may contain at most %(max)d recipes.')
+                % {'max': settings.RECIPE_BULK_MAX_ITEMS}
+            )
+        return value
+
+
+class RecipeStatsSerializer(serializers.ModelSerializer):
+    """Serializador do resumo das Receitas do usuário."""
+    time_minutes_avg = serializers.FloatField(read_only=True)
+    price_avg = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True,
+    )
+
+    class Meta:
+        model = RecipeStats
+        fields = [
+            'count', 'time_minutes_avg', 'price_min', 'price_max',
+            'price_avg',
+        ]
+        read_only_fields = fields
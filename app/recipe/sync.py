@@ -0,0 +1,160 @@
+"""
+Sincronização incremental das receitas (GET /api/recipe/sync/).
+
+O cliente guarda o cursor devolvido e o envia em `?since=` na próxima
+chamada, recebendo só as receitas alteradas e os ids excluídos desde
+então. O cursor é o par (updated_at, id) da última alteração entregue,
+lido pelos índices (user, updated_at, id) das receitas e das marcas de
+exclusão, então o custo depende da quantidade de alterações, não do
+tamanho da coleção. Os ids das receitas e das marcas vêm da mesma
+sequência, o que torna o par único entre as duas tabelas.
+
+Só entram alterações com mais de RECIPE_SYNC['SETTLE_SECONDS'] segundos:
+o updated_at é gravado antes do commit, e uma transação ainda aberta
+poderia aparecer depois com um valor menor que o cursor já entregue. No
+PostgreSQL o limite também recua até o início da transação de escrita
+aberta mais antiga (ex.: um import ou uma operação em lote demorada).
+Pelo mesmo motivo a sincronização lê sempre do primário: numa réplica
+atrasada, as linhas ainda não replicadas ficariam para trás do cursor.
+"""
+import base64
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import DateTimeField, Field, Func, Value
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from core.models import Recipe, RecipeTombstone
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class SyncCursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = _(
+        'This sync cursor is too old; sync again without "since".'
+    )
+    default_code = 'sync_cursor_expired'
+
+
+def encode_cursor(moment, pk):
+    """Codifica o par (momento, id) em um cursor opaco."""
+    micros = (moment - EPOCH) // MICROSECOND
+    raw = f'{micros}:{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodifica o cursor de `encode_cursor`; 400 se for inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        micros, pk = (int(part) for part in raw.decode().split(':'))
+        moment = EPOCH + micros * MICROSECOND
+    except (ValueError, OverflowError, OSError, UnicodeDecodeError):
+        raise ValidationError({'since': [_('Invalid cursor.')]})
+
+    return moment, pk
+
+
+class Row(Func):
+    """Valor de linha do SQL, ex.: (updated_at, id), comparado como
+    tupla."""
+    template = '(%(expressions)s)'
+    output_field = Field()
+
+
+def after(queryset, field, id_field, moment, pk):
+    """Filtra as linhas depois do par (moment, pk) com a comparação de
+    linhas `(field, id_field) > (moment, pk)`, que o índice composto
+    (user, field, id_field) atende como uma faixa."""
+    return queryset.alias(
+        sync_position=Row(field, id_field),
+    ).filter(
+        sync_position__gt=Row(
+            Value(moment, output_field=DateTimeField()), Value(pk),
+        ),
+    )
+
+
+def settled_until(now, using):
+    """Retorna o momento até o qual as alterações já estão confirmadas
+    (ver o docstring do módulo)."""
+    settle = timedelta(seconds=settings.RECIPE_SYNC['SETTLE_SECONDS'])
+    until = now - settle
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT min(xact_start) FROM pg_stat_activity '
+                'WHERE backend_xid IS NOT NULL '
+                'AND datname = current_database() '
+                'AND pid <> pg_backend_pid()'
+            )
+            oldest, = cursor.fetchone()
+        if oldest is not None:
+            until = min(until, oldest - settle)
+    return until
+
+
+def changes_since(user, since=None):
+    """Retorna (receitas, ids excluídos, cursor, has_more) das alterações
+    do usuário depois do cursor `since`.
+
+    Sem `since`, retorna todas as receitas (a carga inicial), sem as
+    exclusões. Cada página tem até RECIPE_SYNC['PAGE_SIZE'] alterações;
+    com `has_more`, o cliente pede a próxima com o cursor recebido.
+    """
+    config = settings.RECIPE_SYNC
+    limit = config['PAGE_SIZE']
+    now = timezone.now()
+    until = settled_until(now, router.db_for_read(Recipe))
+
+    recipes = Recipe.objects.filter(user=user, updated_at__lt=until)
+    if since is None:
+        tombstones = RecipeTombstone.objects.none()
+    else:
+        moment, pk = decode_cursor(since)
+        if moment < now - timedelta(days=config['TOMBSTONE_DAYS']):
+            # As marcas de exclusão desse período já podem ter sido
+            # removidas.
+            raise SyncCursorExpired()
+        recipes = after(recipes, 'updated_at', 'id', moment, pk)
+        tombstones = after(
+            RecipeTombstone.objects.filter(user=user, deleted_at__lt=until),
+            'deleted_at', 'recipe_id', moment, pk,
+        )
+
+    # Até limit + 1 de cada tabela bastam para montar a página e saber
+    # se há mais.
+    recipes = recipes.order_by('updated_at', 'id')[:limit + 1]
+    tombstones = tombstones.order_by(
+        'deleted_at', 'recipe_id',
+    ).values_list('deleted_at', 'recipe_id')[:limit + 1]
+    merged = heapq.merge(
+        ((recipe.updated_at, recipe.id, recipe) for recipe in recipes),
+        ((moment, pk, None) for moment, pk in tombstones),
+        key=lambda item: item[:2],
+    )
+    page = list(islice(merged, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    if has_more:
+        cursor = encode_cursor(*page[-1][:2])
+    else:
+        # Nada mais até `until`: a próxima chamada começa dali.
+        cursor = encode_cursor(until, 0)
+
+    changed = [item[2] for item in page if item[2] is not None]
+    deleted = [item[1] for item in page if item[2] is None]
+
+    return changed, deleted, cursor, has_more
@@ -0,0 +1,144 @@
+"""
+Testes das views assíncronas (ASGI) de receitas.
+"""
+import json
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TransactionTestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from core.authentication import get_local_cache
+from core.models import Recipe
+from recipe.serializers import RecipeDetailSerializer, RecipeSerializer
+
+
+ASYNC_RECIPES_URL = reverse('recipe:async-recipe-list')
+
+
+def async_detail_url(recipe_id):
+    """Retorna a URL async de detalhes da receita."""
+    return reverse('recipe:async-recipe-detail', args=[recipe_id])
+
+
+def create_recipe(user, **params):
+    """Cria e retorna uma receita para testes"""
+    defaults = {
+        'title': 'Titulo da Receita teste',
+        'time_minutes': 22,
+        'price': Decimal('5.25'),
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+@sync_to_async
+def serialize(serializer_class, instance, **kwargs):
+    """Serializa fora do event loop (o ORM do Django 3.2 é síncrono)."""
+    return json.loads(json.dumps(serializer_class(instance, **kwargs).data))
+
+
+class AsyncRecipeViewsTests(TransactionTestCase):
+    """Verifica as views async de receitas pelo handler ASGI.
+
+    TransactionTestCase: as views consultam o banco em threads do
+    executor, com outras conexões, que não veriam os dados de um teste
+    dentro da transação do TestCase.
+    """
+
+    def setUp(self):
+        get_local_cache().clear()
+        self.client = AsyncClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        token = Token.objects.create(user=self.user)
+        self.auth = {'AUTHORIZATION': 'Token ' + token.key}
+        self.other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+
+    async def test_auth_required(self):
+        """Verifica se a autenticação é obrigatória."""
+        res = await self.client.get(ASYNC_RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_invalid_token(self):
+        """Verifica se um token inválido é recusado."""
+        res = await self.client.get(
+            ASYNC_RECIPES_URL, AUTHORIZATION='Token invalid',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_recipes(self):
+        """Verifica se a listagem async é igual à do RecipeSerializer."""
+        await sync_to_async(create_recipe)(user=self.other_user)
+        await sync_to_async(create_recipe)(user=self.user)
+        await sync_to_async(create_recipe)(user=self.user)
+
+        res = await self.client.get(ASYNC_RECIPES_URL, **self.auth)
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('-id')
+        expected = await serialize(RecipeSerializer, recipes, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['results'], expected)
+
+    async def test_get_recipe_detail(self):
+        """Verifica os detalhes async de uma receita."""
+        recipe = await sync_to_async(create_recipe)(
+            user=self.user, description='Descrição',
+        )
+
+        res = await self.client.get(async_detail_url(recipe.id), **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(), await serialize(RecipeDetailSerializer, recipe),
+        )
+
+    async def test_get_other_users_recipe_not_found(self):
+        """Verifica se a receita de outro usuário não é encontrada."""
+        recipe = await sync_to_async(create_recipe)(user=self.other_user)
+
+        res = await self.client.get(async_detail_url(recipe.id), **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_create_recipe(self):
+        """Verifica a criação async de uma receita."""
+        payload = {'title': 'Async', 'time_minutes': 10, 'price': '2.50'}
+
+        res = await self.client.post(
+            ASYNC_RECIPES_URL,
+            payload,
+            content_type='application/json',
+            **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = await sync_to_async(
+            Recipe.objects.select_related('user').get
+        )(id=res.json()['id'])
+        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.price, Decimal('2.50'))
+
+    async def test_create_invalid_recipe(self):
+        """Verifica os erros de validação na criação async."""
+        res = await self.client.post(
+            ASYNC_RECIPES_URL,
+            {'title': 'Async'},
+            content_type='application/json',
+            **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('time_minutes', res.json())
@@ -1,14 +1,33 @@
+import base64
+import csv
+import io
+import json
+from datetime import timedelta
 from decimal import Decimal
+from unittest import skipUnless
+from unittest.mock import Mock, patch
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
-from core.models import Recipe
+from core.models import Recipe, RecipeStats, RecipeTombstone
+from core.tests.utils import QueryBudgetMixin
 
+from recipe import exports
+from recipe.caching import cache_hits
+from recipe.filters import ORDERINGS, filter_recipes
+from recipe.sync import encode_cursor
 from recipe.serializers import (
     RecipeSerializer,
     RecipeDetailSerializer,
@@ -16,6 +35,10 @@ from recipe.serializers import (
 
 
 RECIPES_URL = reverse('recipe:recipe-list')
+BULK_URL = reverse('recipe:recipe-bulk')
+EXPORT_URL = reverse('recipe:recipe-export')
+STATS_URL = reverse('recipe:recipe-stats')
+SYNC_URL = reverse('recipe:sync')
 
 
 # Função Helper para Acessar a URL de Detalhes
@@ -92,7 +115,7 @@ class PrivateRecipeApiTests(TestCase):
         # 5 - Testa o Status da requisição
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         # 6 - Verifica se os dados da Requisição são iguais do BD
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_recipe_list_limited_to_user(self):
         """Verifica se a listagem devolvida está restrita apenas
@@ -124,7 +147,7 @@ class PrivateRecipeApiTests(TestCase):
         # 6 - Testa o Status da requisição
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         # 7 - Verifica se os dados da Requisição são iguais do BD
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_get_recipe_detail(self):
         """Verifica se Está recuperando os detalhes de uma receita."""
@@ -161,3 +184,1399 @@ class PrivateRecipeApiTests(TestCase):
             self.assertEqual(getattr(recipe, k), v)
         # 7 - Verifica se o usuário da Receita é igual ao usuário Autenticado
         self.assertEqual(recipe.user, self.user)
+
+    def test_recipe_list_paginated_by_cursor(self):
+        """Verifica se a listagem é paginada por cursor em ordem
+        decrescente de id, sem repetir nem perder receitas."""
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+        expected_ids = [r.id for r in reversed(recipes)]
+
+        res = self.client.get(RECIPES_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data['previous'])
+        ids = [r['id'] for r in res.data['results']]
+        # Percorre as páginas seguindo o link "next"
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            ids += [r['id'] for r in res.data['results']]
+
+        self.assertEqual(ids, expected_ids)
+
+    @override_settings(RECIPE_PAGE_SIZE=2, RECIPE_MAX_PAGE_SIZE=3)
+    def test_recipe_list_page_size_limits(self):
+        """Verifica o tamanho padrão e o máximo da página."""
+        for _ in range(5):
+            create_recipe(user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data['results']), 2)
+
+        res = self.client.get(RECIPES_URL, {'page_size': 100})
+        self.assertEqual(len(res.data['results']), 3)
+
+    @override_settings(RECIPE_LIST_UNPAGINATED=True)
+    def test_recipe_list_unpaginated_setting(self):
+        """Verifica se a configuração devolve a listagem completa
+        sem paginação."""
+        create_recipe(user=self.user)
+        create_recipe(user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('-id')
+        serializer = RecipeSerializer(recipes, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, serializer.data)
+
+
+class BulkRecipeApiTests(TestCase):
+    """Verifica os endpoints de receitas em lote."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_recipes(self):
+        """Verifica a criação de receitas em lote."""
+        payload = [
+            {'title': 'Receita 1', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'Receita 2', 'time_minutes': 20, 'price': '2.50'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        for item, data in zip(payload, res.data):
+            recipe = Recipe.objects.get(id=data['id'])
+            self.assertEqual(recipe.user, self.user)
+            self.assertEqual(recipe.title, item['title'])
+
+    def test_bulk_create_invalid_item_creates_nothing(self):
+        """Verifica se um item inválido devolve os erros por item e
+        nenhuma receita é criada."""
+        payload = [
+            {'title': 'Receita 1', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'Receita 2', 'price': '2.50'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('time_minutes', res.data[1])
+        self.assertFalse(Recipe.objects.exists())
+
+    @override_settings(RECIPE_BULK_MAX_ITEMS=1)
+    def test_bulk_create_limit(self):
+        """Verifica o limite de itens por lote."""
+        payload = [
+            {'title': 'Receita 1', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'Receita 2', 'time_minutes': 20, 'price': '2.50'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_recipes(self):
+        """Verifica a atualização parcial de receitas em lote."""
+        r1 = create_recipe(user=self.user, title='Antigo 1')
+        r2 = create_recipe(user=self.user, title='Antigo 2')
+        payload = [
+            {'id': r2.id, 'title': 'Novo 2'},
+            {'id': r1.id, 'price': '9.99'},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        r1.refresh_from_db()
+        r2.refresh_from_db()
+        self.assertEqual(r1.title, 'Antigo 1')
+        self.assertEqual(r1.price, Decimal('9.99'))
+        self.assertEqual(r2.title, 'Novo 2')
+        self.assertEqual([item['id'] for item in res.data], [r2.id, r1.id])
+
+    def test_bulk_update_other_users_recipe_not_found(self):
+        """Verifica se não é possível atualizar a receita de outro
+        usuário em lote."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        mine = create_recipe(user=self.user)
+        other = create_recipe(user=other_user, title='Outro')
+        payload = [
+            {'id': mine.id, 'title': 'Novo'},
+            {'id': other.id, 'title': 'Invadido'},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('id', res.data[1])
+        other.refresh_from_db()
+        self.assertEqual(other.title, 'Outro')
+
+    def test_bulk_delete_recipes(self):
+        """Verifica a exclusão em lote restrita ao usuário."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        r1 = create_recipe(user=self.user)
+        r2 = create_recipe(user=self.user)
+        other = create_recipe(user=other_user)
+
+        res = self.client.delete(
+            BULK_URL,
+            {'ids': [r1.id, other.id]},
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted'], [r1.id])
+        self.assertEqual(res.data['not_found'], [other.id])
+        self.assertFalse(Recipe.objects.filter(id=r1.id).exists())
+        self.assertTrue(Recipe.objects.filter(id=r2.id).exists())
+        self.assertTrue(Recipe.objects.filter(id=other.id).exists())
+
+    def test_bulk_delete_goes_through_collector(self):
+        """Verifica se a exclusão em lote passa pelo delete() do ORM
+        (post_delete por receita) e grava marcas e resumo em lote."""
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+
+        post_delete.connect(receiver, sender=Recipe)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Recipe)
+
+        self.client.delete(
+            BULK_URL, {'ids': [r.id for r in recipes]}, format='json',
+        )
+
+        ids = sorted(r.id for r in recipes)
+        self.assertEqual(sorted(deleted), ids)
+        self.assertEqual(sorted(
+            RecipeTombstone.objects.filter(user=self.user)
+            .values_list('recipe_id', flat=True)
+        ), ids)
+        self.assertEqual(RecipeStats.objects.get(user=self.user).count, 0)
+
+
+class ExportRecipeApiTests(TestCase):
+    """Verifica a exportação em streaming das receitas."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_export_ndjson(self):
+        """Verifica a exportação em NDJSON restrita ao usuário."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        create_recipe(user=other_user)
+        r1 = create_recipe(user=self.user, title='Primeira')
+        r2 = create_recipe(user=self.user, title='Segunda')
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        content = b''.join(res.streaming_content).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [r1.id, r2.id])
+        self.assertEqual(rows[0], {
+            'id': r1.id,
+            'title': 'Primeira',
+            'description': r1.description,
+            'time_minutes': r1.time_minutes,
+            'price': '5.25',
+            'link': r1.link,
+        })
+
+    def test_export_csv(self):
+        """Verifica a exportação em CSV."""
+        recipe = create_recipe(user=self.user, title='Com, vírgula')
+
+        res = self.client.get(EXPORT_URL, {'output': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], exports.EXPORT_FIELDS)
+        self.assertEqual(rows[1][:2], [str(recipe.id), 'Com, vírgula'])
+        self.assertEqual(len(rows), 2)
+
+    def test_export_invalid_output(self):
+        """Verifica se um formato desconhecido é recusado."""
+        res = self.client.get(EXPORT_URL, {'output': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalRecipeApiTests(TestCase):
+    """Verifica os GETs condicionais (ETag) das receitas."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self):
+        """Verifica se a listagem responde 304 sem consultar o banco
+        quando a ETag ainda é válida."""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        etag = res['ETag']
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def test_list_etag_changes_on_write(self):
+        """Verifica se criar, alterar ou excluir uma receita troca a ETag
+        da listagem."""
+        recipe = create_recipe(user=self.user)
+        etags = [self.client.get(RECIPES_URL)['ETag']]
+
+        create_recipe(user=self.user)
+        etags.append(self.client.get(RECIPES_URL)['ETag'])
+        recipe.title = 'Novo título'
+        recipe.save()
+        etags.append(self.client.get(RECIPES_URL)['ETag'])
+        recipe.delete()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etags[-1])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(set(etags + [res['ETag']])), 4)
+
+    def test_list_etag_changes_on_bulk_write(self):
+        """Verifica se as operações em lote trocam a ETag."""
+        recipe = create_recipe(user=self.user)
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        self.client.delete(BULK_URL, {'ids': [recipe.id]}, format='json')
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_is_per_user(self):
+        """Verifica se a ETag de um usuário não vale para outro."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        self.client.force_authenticate(other_user)
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        """Verifica o 304 nos detalhes e a troca da ETag ao alterar a
+        receita."""
+        recipe = create_recipe(user=self.user)
+        url = detail_url(recipe.id)
+        res = self.client.get(url)
+        etag = res['ETag']
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        recipe.price = Decimal('1.00')
+        recipe.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['price'], '1.00')
+
+    def test_detail_of_other_user_has_no_etag(self):
+        """Verifica se a receita de outro usuário continua 404."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        recipe = create_recipe(user=other_user)
+
+        res = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', res)
+
+    def test_missing_recipe_version_expires(self):
+        """Verifica se a versão criada para um pk inexistente expira."""
+        with patch.object(cache, 'add', wraps=cache.add) as add:
+            res = self.client.get(detail_url(987654))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        add.assert_called_once()
+        self.assertEqual(
+            add.call_args.kwargs['timeout'],
+            settings.RECIPE_OBJECT_VERSION_TIMEOUT,
+        )
+
+
+class ResponseCacheRecipeApiTests(TestCase):
+    """Verifica o cache das respostas de receitas."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        """Verifica se a segunda listagem não consulta o banco."""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        hits = cache_hits.value(action='list')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(RECIPES_URL)
+
+        self.assertEqual(cached.data, res.data)
+        self.assertEqual(cache_hits.value(action='list'), hits + 1)
+
+    def test_cache_invalidated_on_write(self):
+        """Verifica se criar e alterar receitas invalida o cache da
+        listagem e dos detalhes."""
+        recipe = create_recipe(user=self.user, title='Antigo')
+        self.client.get(RECIPES_URL)
+        self.client.get(detail_url(recipe.id))
+
+        create_recipe(user=self.user)
+        recipe.title = 'Novo'
+        recipe.save()
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data['results']), 2)
+        res = self.client.get(detail_url(recipe.id))
+        self.assertEqual(res.data['title'], 'Novo')
+
+    def test_cache_keyed_by_page(self):
+        """Verifica se páginas diferentes não compartilham o cache."""
+        for _ in range(3):
+            create_recipe(user=self.user)
+
+        first = self.client.get(RECIPES_URL, {'page_size': 2})
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(len(first.data['results']), 2)
+        self.assertEqual(len(second.data['results']), 1)
+
+    def test_cache_is_per_user(self):
+        """Verifica se um usuário não recebe a resposta de outro."""
+        create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+
+        self.client.force_authenticate(other_user)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    @override_settings(RECIPE_RESPONSE_CACHE={
+        'ENABLED': False, 'ALIAS': 'default', 'TIMEOUT': 300,
+    })
+    def test_cache_disabled(self):
+        """Verifica se o cache pode ser desligado."""
+        create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        with self.assertNumQueries(1):
+            self.client.get(RECIPES_URL)
+
+
+class SearchRecipeApiTests(TestCase):
+    """Verifica a busca textual (?search=) nas receitas."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def search(self, query):
+        res = self.client.get(RECIPES_URL, {'search': query})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in res.data['results']]
+
+    def test_search_title_and_description(self):
+        """Verifica se a busca encontra o termo no título ou na
+        descrição, apenas nas receitas do usuário."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        cake = create_recipe(user=self.user, title='Bolo de cenoura')
+        pie = create_recipe(
+            user=self.user,
+            title='Torta',
+            description='Massa de bolo com frutas',
+        )
+        create_recipe(user=self.user, title='Pizza', description='Queijo')
+        create_recipe(user=other_user, title='Bolo de chocolate')
+
+        self.assertEqual(set(self.search('bolo')), {cake.id, pie.id})
+
+    def test_search_too_long(self):
+        """Verifica se uma busca longa demais é recusada."""
+        res = self.client.get(RECIPES_URL, {'search': 'x' * 201})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_search_ranks_title_first(self):
+        """Verifica se o termo no título vem antes do termo só na
+        descrição."""
+        pie = create_recipe(
+            user=self.user,
+            title='Torta',
+            description='Massa de bolo com frutas',
+        )
+        cake = create_recipe(user=self.user, title='Bolo de cenoura')
+
+        self.assertEqual(self.search('bolo'), [cake.id, pie.id])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_search_tolerates_typos(self):
+        """Verifica se a busca por trigramas encontra títulos com erros
+        de digitação."""
+        cake = create_recipe(user=self.user, title='Bolo de cenoura')
+        create_recipe(user=self.user, title='Pizza')
+
+        self.assertEqual(self.search('bolo de cenora'), [cake.id])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_search_vector_updated_on_save(self):
+        """Verifica se o search_vector é atualizado ao alterar a receita."""
+        recipe = create_recipe(user=self.user, title='Pizza')
+        recipe.title = 'Lasanha'
+        recipe.save()
+
+        self.assertEqual(self.search('lasanha'), [recipe.id])
+        self.assertEqual(self.search('pizza'), [])
+
+
+class FilterRecipeApiTests(TestCase):
+    """Verifica os filtros por faixa e as ordenações da listagem."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def list_ids(self, params):
+        res = self.client.get(RECIPES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in res.data['results']]
+
+    def explain(self, params):
+        """Retorna o plano da consulta da listagem com os `params`."""
+        queryset, ordering = filter_recipes(
+            Recipe.objects.filter(user=self.user), params,
+        )
+        queryset = queryset.order_by(*(ordering or ('-id',)))
+        if connection.vendor == 'postgresql':
+            # Com tabelas minúsculas o planner prefere o seq scan.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_filter_time_minutes_range(self):
+        """Verifica o filtro por faixa de tempo de preparo."""
+        create_recipe(user=self.user, time_minutes=10)
+        quick = create_recipe(user=self.user, time_minutes=25)
+        create_recipe(user=self.user, time_minutes=60)
+
+        ids = self.list_ids({
+            'time_minutes__gte': 20, 'time_minutes__lte': 30,
+        })
+
+        self.assertEqual(ids, [quick.id])
+
+    def test_filter_price_and_title(self):
+        """Verifica os filtros por preço máximo e por título."""
+        cheap = create_recipe(user=self.user, title='Bolo', price='3.00')
+        create_recipe(user=self.user, title='Bolo', price='9.00')
+        create_recipe(user=self.user, title='Torta', price='2.00')
+
+        ids = self.list_ids({'price__lte': '5.00', 'title': 'Bolo'})
+
+        self.assertEqual(ids, [cheap.id])
+
+    def test_ordering_by_price_pages_with_cursor(self):
+        """Verifica a ordenação pelo mais barato, com desempate pelo id
+        entre as páginas do cursor."""
+        recipes = [
+            create_recipe(user=self.user, price=price)
+            for price in ('4.00', '1.00', '4.00', '2.00')
+        ]
+
+        res = self.client.get(RECIPES_URL, {
+            'ordering': 'price', 'page_size': 2,
+        })
+        ids = [item['id'] for item in res.data['results']]
+        res = self.client.get(res.data['next'])
+        ids += [item['id'] for item in res.data['results']]
+
+        self.assertEqual(ids, [
+            recipes[1].id, recipes[3].id, recipes[0].id, recipes[2].id,
+        ])
+
+    def test_ordering_with_many_ties_pages_by_keyset(self):
+        """Verifica se mais de offset_cutoff (1000) empates no campo da
+        ordenação são paginados pelo id, sem repetir nem perder receitas,
+        nos dois sentidos."""
+        Recipe.objects.bulk_create([
+            Recipe(
+                user=self.user, title=f'Receita {i}',
+                time_minutes=30, price=Decimal('5.00'),
+            )
+            for i in range(1200)
+        ])
+        expected = list(
+            Recipe.objects.filter(user=self.user)
+            .order_by('time_minutes', 'id')
+            .values_list('id', flat=True)
+        )
+
+        res = self.client.get(RECIPES_URL, {
+            'ordering': 'time_minutes', 'page_size': 500,
+        })
+        pages = [[item['id'] for item in res.data['results']]]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            pages.append([item['id'] for item in res.data['results']])
+
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(page) for page in pages], [500, 500, 200])
+
+        res = self.client.get(res.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], pages[1],
+        )
+        res = self.client.get(res.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], pages[0],
+        )
+        self.assertIsNone(res.data['previous'])
+
+    def test_invalid_cursor_position(self):
+        """Verifica se um cursor com posição inválida gera 404."""
+        for position in ('p=abc&p=1', 'p=1'):
+            cursor = base64.b64encode(position.encode()).decode()
+            res = self.client.get(RECIPES_URL, {
+                'ordering': 'time_minutes', 'cursor': cursor,
+            })
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ordering_descending_time(self):
+        """Verifica a ordenação pelo maior tempo de preparo."""
+        short = create_recipe(user=self.user, time_minutes=5)
+        long = create_recipe(user=self.user, time_minutes=90)
+
+        ids = self.list_ids({'ordering': '-time_minutes'})
+
+        self.assertEqual(ids, [long.id, short.id])
+
+    def test_invalid_ordering_rejected(self):
+        """Verifica se ordenações fora da lista são recusadas."""
+        res = self.client.get(RECIPES_URL, {'ordering': 'description'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', res.data)
+
+    def test_invalid_range_rejected(self):
+        """Verifica se valores inválidos ou faixas invertidas são
+        recusados."""
+        for params in (
+            {'time_minutes__gte': 'abc'},
+            {'price__lte': '-1'},
+            {'time_minutes__gte': 30, 'time_minutes__lte': 10},
+        ):
+            res = self.client.get(RECIPES_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_orderings_use_index(self):
+        """Verifica no EXPLAIN se cada ordenação aceita é lida do índice
+        composto, sem ordenação em memória."""
+        indexes = {
+            # O SQLite também pode usar o índice da FK, já que os seus
+            # índices terminam no rowid (o id); ambos evitam a ordenação.
+            'id': r'core_recipe_user_id_',
+            'time_minutes': r'core_recipe_user_time_idx',
+            'price': r'core_recipe_user_price_idx',
+            'title': r'core_recipe_user_title_idx',
+        }
+        for ordering in ORDERINGS:
+            with self.subTest(ordering=ordering):
+                plan = self.explain({'ordering': ordering})
+
+                self.assertRegex(plan, indexes[ordering.lstrip('-')])
+                self.assertNotIn('TEMP B-TREE', plan)
+                self.assertNotIn('Sort', plan)
+
+    def test_cursor_page_uses_index(self):
+        """Verifica no EXPLAIN se a consulta da segunda página (o filtro
+        do cursor sobre todos os campos da ordenação) continua lida do
+        índice composto, sem ordenação em memória."""
+        for i in range(5):
+            create_recipe(user=self.user, time_minutes=10 + i % 2)
+        for ordering, index in (
+            ('time_minutes', 'core_recipe_user_time_idx'),
+            ('-price', 'core_recipe_user_price_idx'),
+        ):
+            with self.subTest(ordering=ordering):
+                res = self.client.get(
+                    RECIPES_URL, {'ordering': ordering, 'page_size': 2},
+                )
+                with CaptureQueriesContext(connection) as context:
+                    res = self.client.get(res.data['next'])
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                sql = next(
+                    query['sql'] for query in context.captured_queries
+                    if 'FROM "core_recipe"' in query['sql']
+                )
+                self.assertIn(' OR ', sql)
+
+                with connection.cursor() as cursor:
+                    if connection.vendor == 'postgresql':
+                        cursor.execute('SET LOCAL enable_seqscan = off')
+                        cursor.execute('EXPLAIN ' + sql)
+                    else:
+                        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    plan = '\n'.join(str(row) for row in cursor.fetchall())
+
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+                self.assertNotIn('Sort', plan)
+
+    def test_range_filters_use_index(self):
+        """Verifica no EXPLAIN se os filtros por faixa usam o índice do
+        mesmo campo."""
+        plan = self.explain({
+            'time_minutes__lte': 30, 'ordering': 'time_minutes',
+        })
+        self.assertIn('core_recipe_user_time_idx', plan)
+
+        plan = self.explain({'price__gte': '2.00', 'ordering': '-price'})
+        self.assertIn('core_recipe_user_price_idx', plan)
+
+
+class SparseFieldsRecipeApiTests(TestCase):
+    """Verifica a escolha dos campos com ?fields=."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_requested_fields(self):
+        """Verifica se a listagem devolve só os campos pedidos e não
+        busca as demais colunas."""
+        recipe = create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL, {'fields': 'id,title'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [
+            {'id': recipe.id, 'title': recipe.title},
+        ])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"price"', queries[0]['sql'])
+
+    def test_retrieve_without_description(self):
+        """Verifica se os detalhes podem omitir a descrição, que não é
+        carregada do banco."""
+        recipe = create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                detail_url(recipe.id), {'fields': 'title,price'},
+            )
+
+        self.assertEqual(res.data, {
+            'title': recipe.title, 'price': str(recipe.price),
+        })
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"description"', queries[0]['sql'])
+
+    def test_sparse_fields_with_ordering(self):
+        """Verifica se o campo da ordenação é carregado para o cursor,
+        sem uma consulta extra por receita."""
+        for price in ('3.00', '1.00', '2.00'):
+            create_recipe(user=self.user, price=price)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL, {
+                'fields': 'id', 'ordering': 'price', 'page_size': 2,
+            })
+
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_unknown_field_rejected(self):
+        """Verifica se campos inexistentes (ou fora do serializador da
+        ação) são recusados."""
+        res = self.client.get(RECIPES_URL, {'fields': 'id,description'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', res.data)
+
+    def test_fields_ignored_on_create(self):
+        """Verifica se ?fields= não altera a resposta da criação."""
+        payload = {
+            'title': 'Bolo', 'time_minutes': 30, 'price': Decimal('5.00'),
+        }
+
+        res = self.client.post(RECIPES_URL + '?fields=id', payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn('title', res.data)
+
+
+class FastPathRecipeApiTests(TestCase):
+    """Verifica se o caminho rápido de list/retrieve gera exatamente a
+    mesma resposta que os serializadores."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.recipes = [
+            create_recipe(user=self.user, price=Decimal('5.5'), link=''),
+            create_recipe(
+                user=self.user,
+                title='Pão de queijo "mineiro"',
+                description='Polvilho\nQueijo',
+                time_minutes=45,
+                price=Decimal('999.99'),
+            ),
+            create_recipe(user=self.user, price=Decimal('0'), title='Água'),
+        ]
+
+    def get_both(self, url, params=None):
+        """Retorna os bytes da resposta pelo caminho rápido e pelo do
+        serializador."""
+        contents = []
+        for enabled in (True, False):
+            cache.clear()
+            with self.settings(RECIPE_FAST_PATH=enabled):
+                res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            contents.append(res.content)
+        return contents
+
+    def test_list_identical_to_serializer(self):
+        """Verifica a listagem, inclusive com campos, ordenação, filtros,
+        busca e paginação."""
+        for params in (
+            {},
+            {'fields': 'price,id'},
+            {'ordering': 'price'},
+            {'ordering': '-title', 'page_size': 2},
+            {'time_minutes__gte': 30},
+            {'search': 'queijo'},
+        ):
+            with self.subTest(params=params):
+                fast, slow = self.get_both(RECIPES_URL, params)
+
+                self.assertEqual(fast, slow)
+
+    def test_retrieve_identical_to_serializer(self):
+        """Verifica os detalhes, com e sem ?fields=."""
+        for recipe in self.recipes:
+            for params in ({}, {'fields': 'description,title'}):
+                with self.subTest(recipe=recipe.id, params=params):
+                    fast, slow = self.get_both(detail_url(recipe.id), params)
+
+                    self.assertEqual(fast, slow)
+
+    def test_retrieve_other_user_not_found(self):
+        """Verifica se o caminho rápido mantém o 404 para receitas de
+        outros usuários."""
+        other_user = get_user_model().objects.create_user(
+            'other@example.com',
+            'password123',
+        )
+        recipe = create_recipe(user=other_user)
+
+        res = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_single_query(self):
+        """Verifica se a listagem rápida faz uma única consulta."""
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data['results']), len(self.recipes))
+
+
+class IdempotencyRecipeApiTests(TestCase):
+    """Verifica o header Idempotency-Key nas escritas."""
+
+    def setUp(self):
+        cache.clear()
+        caches[settings.RECIPE_IDEMPOTENCY['ALIAS']].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.payload = {
+            'title': 'Bolo', 'time_minutes': 30, 'price': '5.00',
+        }
+
+    def post(self, payload, key='retry-1', url=RECIPES_URL):
+        return self.client.post(
+            url, payload, format='json', HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_response(self):
+        """Verifica se a repetição devolve a mesma resposta, sem criar
+        outra receita nem consultar o banco."""
+        first = self.post(self.payload)
+
+        with self.assertNumQueries(0):
+            retry = self.post(self.payload)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        """Verifica se a mesma chave de outro usuário cria outra receita."""
+        self.post(self.payload)
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.post(self.payload)
+
+        self.assertNotIn('Idempotent-Replayed', res)
+        self.assertEqual(Recipe.objects.filter(user=other).count(), 1)
+
+    def test_key_reused_with_other_payload(self):
+        """Verifica se a chave repetida com outro corpo é recusada."""
+        self.post(self.payload)
+
+        res = self.post({**self.payload, 'title': 'Outro'})
+
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_errors_are_not_stored(self):
+        """Verifica se, após um erro, a mesma chave pode ser usada com o
+        corpo corrigido."""
+        res = self.post({'title': 'Bolo'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.post(self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_key_in_use(self):
+        """Verifica o 409 enquanto a primeira requisição ainda roda."""
+        with patch(
+            'recipe.idempotency.caches',
+            {'idempotency': Mock(get=Mock(return_value=None),
+                                 add=Mock(return_value=False))},
+        ):
+            res = self.post(self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_bulk_create_replayed(self):
+        """Verifica a chave no endpoint de criação em lote."""
+        payload = [self.payload, {**self.payload, 'title': 'Torta'}]
+        first = self.post(payload, url=BULK_URL)
+
+        retry = self.post(payload, url=BULK_URL)
+
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Recipe.objects.count(), 2)
+
+    def test_record_survives_default_cache_churn(self):
+        """Verifica se as chaves ficam em um cache próprio, sem serem
+        descartadas quando o 'default' enche."""
+        self.post(self.payload, key='churn')
+        cache.set_many({f'filler:{i}': i for i in range(1000)})
+
+        retry = self.post(self.payload, key='churn')
+
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_delete_replayed(self):
+        """Verifica se a repetição do DELETE em lote devolve a resposta
+        original, e não os ids como não encontrados."""
+        recipe = create_recipe(user=self.user)
+        payload = {'ids': [recipe.id]}
+        self.client.delete(
+            BULK_URL, payload, format='json', HTTP_IDEMPOTENCY_KEY='del',
+        )
+
+        retry = self.client.delete(
+            BULK_URL, payload, format='json', HTTP_IDEMPOTENCY_KEY='del',
+        )
+
+        self.assertEqual(retry.data['deleted'], [recipe.id])
+
+    def test_invalid_key(self):
+        """Verifica o limite de tamanho da chave."""
+        res = self.post(self.payload, key='x' * 256)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Idempotency-Key', res.data)
+
+
+class StatsRecipeApiTests(TestCase):
+    """Verifica o resumo das receitas do usuário."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def get_stats(self):
+        res = self.client.get(STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_stats_without_recipes(self):
+        """Verifica o resumo de um usuário sem receitas."""
+        self.assertEqual(self.get_stats(), {
+            'count': 0,
+            'time_minutes_avg': None,
+            'price_min': None,
+            'price_max': None,
+            'price_avg': None,
+        })
+
+    def test_stats_follow_create_update_delete(self):
+        """Verifica se o resumo acompanha as gravações das receitas."""
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123',
+        )
+        create_recipe(user=other, time_minutes=1, price=Decimal('0.50'))
+        cheap = create_recipe(user=self.user, time_minutes=10,
+                              price=Decimal('2.00'))
+        create_recipe(user=self.user, time_minutes=20, price=Decimal('4.00'))
+        expensive = create_recipe(user=self.user, time_minutes=45,
+                                  price=Decimal('9.00'))
+
+        self.assertEqual(self.get_stats(), {
+            'count': 3,
+            'time_minutes_avg': 25.0,
+            'price_min': '2.00',
+            'price_max': '9.00',
+            'price_avg': '5.00',
+        })
+
+        self.client.patch(detail_url(expensive.id), {
+            'time_minutes': 30, 'price': '6.00',
+        })
+        # Excluir o mais barato relê o mínimo das receitas restantes.
+        self.client.delete(detail_url(cheap.id))
+
+        self.assertEqual(self.get_stats(), {
+            'count': 2,
+            'time_minutes_avg': 25.0,
+            'price_min': '4.00',
+            'price_max': '6.00',
+            'price_avg': '5.00',
+        })
+
+    def test_stats_follow_bulk_writes(self):
+        """Verifica se o resumo acompanha os endpoints em lote."""
+        res = self.client.post(BULK_URL, [
+            {'title': 'A', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'B', 'time_minutes': 20, 'price': '2.50'},
+            {'title': 'C', 'time_minutes': 30, 'price': '3.50'},
+        ], format='json')
+        ids = [item['id'] for item in res.data]
+
+        self.client.patch(BULK_URL, [
+            {'id': ids[0], 'price': '0.50'},
+            {'id': ids[1], 'title': 'Só o título'},
+        ], format='json')
+        self.client.delete(BULK_URL, {'ids': [ids[2]]}, format='json')
+
+        self.assertEqual(self.get_stats(), {
+            'count': 2,
+            'time_minutes_avg': 15.0,
+            'price_min': '0.50',
+            'price_max': '2.50',
+            'price_avg': '1.50',
+        })
+
+    def test_stats_single_query(self):
+        """Verifica se o resumo é lido com uma consulta, sem agregar as
+        receitas."""
+        for price in ('1.00', '2.00', '3.00'):
+            create_recipe(user=self.user, price=Decimal(price))
+
+        with self.assertNumQueries(1) as context:
+            self.client.get(STATS_URL)
+
+        self.assertNotIn('core_recipe"', context.captured_queries[0]['sql'])
+
+    def test_stats_rebuilt_when_row_missing(self):
+        """Verifica se uma gravação sem a linha do resumo (ex.: usuário
+        criado em lote) recalcula o usuário."""
+        create_recipe(user=self.user, price=Decimal('3.00'))
+        RecipeStats.objects.filter(user=self.user).delete()
+
+        create_recipe(user=self.user, price=Decimal('5.00'))
+
+        self.assertEqual(self.get_stats()['count'], 2)
+        self.assertEqual(self.get_stats()['price_avg'], '4.00')
+
+    def test_user_delete_with_recipes(self):
+        """Verifica se a exclusão do usuário em cascata não recria o
+        resumo dele a partir das receitas excluídas."""
+        create_recipe(user=self.user)
+
+        self.user.delete()
+
+        self.assertFalse(RecipeStats.objects.exists())
+
+
+@override_settings(RECIPE_SYNC={
+    'PAGE_SIZE': 500, 'SETTLE_SECONDS': 0, 'TOMBSTONE_DAYS': 30,
+})
+class SyncRecipeApiTests(TestCase):
+    """Verifica a sincronização incremental das receitas."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None):
+        params = {} if since is None else {'since': since}
+        res = self.client.get(SYNC_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_sync_requires_auth(self):
+        """Verifica se a sincronização exige autenticação."""
+        res = APIClient().get(SYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_initial_sync_returns_all_recipes(self):
+        """Verifica se a carga inicial traz todas as receitas do usuário."""
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123',
+        )
+        create_recipe(user=other)
+        first = create_recipe(user=self.user)
+        second = create_recipe(user=self.user)
+
+        data = self.sync()
+
+        self.assertEqual(
+            [recipe['id'] for recipe in data['changes']],
+            [first.id, second.id],
+        )
+        self.assertIn('updated_at', data['changes'][0])
+        self.assertEqual(data['deleted'], [])
+        self.assertFalse(data['has_more'])
+
+    def test_sync_returns_only_changes_since_cursor(self):
+        """Verifica se só as receitas alteradas ou excluídas depois do
+        cursor são devolvidas."""
+        unchanged = create_recipe(user=self.user)
+        updated = create_recipe(user=self.user)
+        deleted = create_recipe(user=self.user)
+        bulk_deleted = create_recipe(user=self.user)
+        cursor = self.sync()['cursor']
+
+        self.client.patch(detail_url(updated.id), {'title': 'New'})
+        self.client.delete(detail_url(deleted.id))
+        self.client.delete(
+            BULK_URL, {'ids': [bulk_deleted.id]}, format='json',
+        )
+        created = create_recipe(user=self.user)
+        data = self.sync(cursor)
+
+        ids = [recipe['id'] for recipe in data['changes']]
+        self.assertEqual(ids, [updated.id, created.id])
+        self.assertNotIn(unchanged.id, ids)
+        self.assertEqual(data['changes'][0]['title'], 'New')
+        self.assertEqual(data['deleted'], [deleted.id, bulk_deleted.id])
+        self.assertEqual(self.sync(data['cursor'])['changes'], [])
+
+    def test_sync_includes_bulk_updates(self):
+        """Verifica se a atualização em lote avança o updated_at."""
+        recipe = create_recipe(user=self.user)
+        cursor = self.sync()['cursor']
+
+        self.client.patch(
+            BULK_URL, [{'id': recipe.id, 'title': 'Bulk'}], format='json',
+        )
+        data = self.sync(cursor)
+
+        self.assertEqual(
+            [item['title'] for item in data['changes']], ['Bulk'],
+        )
+
+    def test_sync_pages(self):
+        """Verifica se as alterações são paginadas pelo cursor, sem
+        repetições nem perdas."""
+        recipes = [create_recipe(user=self.user) for _ in range(4)]
+        cursor = self.sync()['cursor']
+        for recipe in recipes[:3]:
+            self.client.patch(detail_url(recipe.id), {'title': 'New'})
+        self.client.delete(detail_url(recipes[3].id))
+
+        changed, deleted = [], []
+        pages = 0
+        with self.settings(RECIPE_SYNC={
+            'PAGE_SIZE': 2, 'SETTLE_SECONDS': 0, 'TOMBSTONE_DAYS': 30,
+        }):
+            while True:
+                data = self.sync(cursor)
+                pages += 1
+                changed += [recipe['id'] for recipe in data['changes']]
+                deleted += data['deleted']
+                cursor = data['cursor']
+                if not data['has_more']:
+                    break
+
+        self.assertEqual(pages, 2)
+        self.assertEqual(changed, [recipe.id for recipe in recipes[:3]])
+        self.assertEqual(deleted, [recipes[3].id])
+
+    def test_sync_waits_for_settle_window(self):
+        """Verifica se as alterações recentes ficam para a próxima
+        chamada, sem serem perdidas."""
+        with self.settings(RECIPE_SYNC={
+            'PAGE_SIZE': 500, 'SETTLE_SECONDS': 60, 'TOMBSTONE_DAYS': 30,
+        }):
+            create_recipe(user=self.user)
+            data = self.sync()
+
+        self.assertEqual(data['changes'], [])
+        self.assertEqual(len(self.sync(data['cursor'])['changes']), 1)
+
+    def test_invalid_cursor(self):
+        """Verifica se um cursor inválido retorna 400."""
+        res = self.client.get(SYNC_URL, {'since': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', res.data)
+
+    def test_expired_cursor(self):
+        """Verifica se um cursor mais antigo que as marcas de exclusão
+        retorna 410."""
+        old = timezone.now() - timedelta(days=31)
+
+        res = self.client.get(SYNC_URL, {'since': encode_cursor(old, 1)})
+
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+
+    def test_user_delete_writes_no_tombstones(self):
+        """Verifica se a exclusão do usuário não grava marcas de exclusão
+        das receitas apagadas em cascata."""
+        create_recipe(user=self.user)
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'password123',
+        )
+        recipe = create_recipe(user=other)
+
+        self.user.delete()
+        recipe.delete()
+
+        self.assertEqual(
+            list(RecipeTombstone.objects.values_list('user_id', flat=True)),
+            [other.id],
+        )
+
+
+class QueryBudgetRecipeApiTests(QueryBudgetMixin, TestCase):
+    """Verifica quantas consultas cada endpoint de receitas custa, com
+    autenticação real por token e caches frios."""
+
+    SIZES = (0, 10, 100)
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.recipe = create_recipe(user=self.user)
+
+    def seed(self, size):
+        """Completa `size` receitas do usuário."""
+        missing = size - Recipe.objects.filter(user=self.user).count()
+        for _ in range(max(missing, 0)):
+            create_recipe(user=self.user)
+
+    def assertBudget(self, budget, request, expected_status, seed=None):
+        def measured():
+            res = request()
+            self.assertEqual(res.status_code, expected_status)
+
+        self.assertQueryBudgetPerSize(
+            budget, self.SIZES, seed or self.seed, measured,
+        )
+
+    def test_list_budget(self):
+        """Token + página de receitas."""
+        self.assertBudget(
+            2, lambda: self.client.get(RECIPES_URL), status.HTTP_200_OK,
+        )
+
+    def test_list_sparse_fields_budget(self):
+        """Token + página de receitas com ?fields= e ordenação."""
+        self.assertBudget(
+            2,
+            lambda: self.client.get(RECIPES_URL, {
+                'fields': 'id,title', 'ordering': 'price',
+            }),
+            status.HTTP_200_OK,
+        )
+
+    @override_settings(RECIPE_FAST_PATH=False)
+    def test_list_serializer_path_budget(self):
+        """Token + página de receitas, pelo caminho do serializador."""
+        self.assertBudget(
+            2, lambda: self.client.get(RECIPES_URL), status.HTTP_200_OK,
+        )
+
+    def test_retrieve_budget(self):
+        """Token + receita."""
+        self.assertBudget(
+            2,
+            lambda: self.client.get(detail_url(self.recipe.id)),
+            status.HTTP_200_OK,
+        )
+
+    def test_create_budget(self):
+        """Token + insert + resumo, dentro da transação da requisição."""
+        payload = {
+            'title': 'Bolo', 'time_minutes': 30, 'price': Decimal('5.00'),
+        }
+        self.assertBudget(
+            3,
+            lambda: self.client.post(RECIPES_URL, payload),
+            status.HTTP_201_CREATED,
+        )
+
+    def test_update_budget(self):
+        """Token + leitura + update da receita."""
+        self.assertBudget(
+            3,
+            lambda: self.client.patch(
+                detail_url(self.recipe.id), {'title': 'Novo título'},
+            ),
+            status.HTTP_200_OK,
+        )
+
+    def test_update_price_budget(self):
+        """Token + leitura + update da receita + resumo."""
+        self.assertBudget(
+            4,
+            lambda: self.client.patch(
+                detail_url(self.recipe.id), {'price': Decimal('7.50')},
+            ),
+            status.HTTP_200_OK,
+        )
+
+    def test_delete_budget(self):
+        """Token + leitura + delete da receita + resumo + marca de
+        exclusão."""
+        def seed(size):
+            self.seed(size)
+            self.recipe = create_recipe(user=self.user)
+
+        self.assertBudget(
+            5,
+            lambda: self.client.delete(detail_url(self.recipe.id)),
+            status.HTTP_204_NO_CONTENT,
+            seed,
+        )
+
+    def test_sync_budget(self):
+        """Token + receitas alteradas + marcas de exclusão."""
+        cursor = encode_cursor(timezone.now() - timedelta(hours=1), 0)
+
+        self.assertBudget(
+            3,
+            lambda: self.client.get(SYNC_URL, {'since': cursor}),
+            status.HTTP_200_OK,
+        )
+
+    def test_stats_budget(self):
+        """Token + linha do resumo, qualquer que seja a coleção."""
+        self.assertBudget(
+            2, lambda: self.client.get(STATS_URL), status.HTTP_200_OK,
+        )
@@ -5,7 +5,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from recipe import views
+from recipe import async_views, views
 
 
 router = DefaultRouter()
@@ -15,4 +15,15 @@ app_name = 'recipe'
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('sync/', views.RecipeSyncView.as_view(), name='sync'),
+    path(
+        'async/recipes/',
+        async_views.recipe_list,
+        name='async-recipe-list',
+    ),
+    path(
+        'async/recipes/<int:pk>/',
+        async_views.recipe_detail,
+        name='async-recipe-detail',
+    ),
 ]
@@ -1,23 +1,113 @@
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from django.conf import settings
+from django.db import router, transaction
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext as _
+
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.authentication import CachedTokenAuthentication
+from core.db.routers import ReplicaReadMixin
+from core.models import Recipe, RecipeStats
+from core.signals import batch_recipe_deletes
+from recipe import exports, serializers, sync
+from recipe.caching import ResponseCacheMixin
+from recipe.conditional import ConditionalGetMixin
+from recipe.fastpath import FastReadMixin
+from recipe.filters import filter_recipes
+from recipe.idempotency import idempotent
+from recipe.pagination import RecipeCursorPagination
+from recipe.search import search_recipes
+
 
-from core.models import Recipe
-from recipe import serializers
+SEARCH_MAX_LENGTH = 200
 
+# Ações em que o cliente pode escolher os campos com `?fields=`.
+SPARSE_FIELDS_ACTIONS = ('list', 'retrieve')
 
-class RecipeViewSet(viewsets.ModelViewSet):
+
+class RecipeViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """ModelViewSet para receitas."""
     serializer_class = serializers.RecipeDetailSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    throttle_scope = 'recipes'
+
+    cursor_ordering = ('-id',)
 
     def get_queryset(self):
         """ Recupera os dados baseado no usuário autenticado """
-        return self.queryset.filter(
-            user=self.request.user
-            ).order_by('-id')
+        queryset = self.queryset.filter(user=self.request.user)
+
+        if self.action == 'list':
+            queryset, ordering = filter_recipes(
+                queryset, self.request.query_params,
+            )
+            search = self.request.query_params.get('search', '').strip()
+            if len(search) > SEARCH_MAX_LENGTH:
+                raise ValidationError({'search': [
+                    _('Ensure this value has at most %(max)d characters.')
+                    % {'max': SEARCH_MAX_LENGTH}
+                ]})
+            if search:
+                queryset, self.cursor_ordering = search_recipes(
+                    queryset, search,
+                )
+            # Uma ordenação explícita prevalece sobre o rank da busca.
+            if ordering:
+                self.cursor_ordering = ordering
+
+        fields = self.get_requested_fields()
+        if fields:
+            # Carrega só as colunas pedidas e as da ordenação, lidas pelo
+            # cursor da paginação.
+            ordering = [name.lstrip('-') for name in self.cursor_ordering]
+            queryset = queryset.only(*fields, *(
+                name for name in ordering
+                if name not in queryset.query.annotations
+            ))
+
+        return queryset.order_by(*self.cursor_ordering)
+
+    def get_requested_fields(self):
+        """Retorna os campos pedidos em `?fields=` (ex.: `id,title`),
+        ou None quando todos devem ser serializados."""
+        if self.action not in SPARSE_FIELDS_ACTIONS:
+            return None
+        if not hasattr(self, '_requested_fields'):
+            param = self.request.query_params.get('fields', '')
+            fields = [name.strip() for name in param.split(',')]
+            fields = list(dict.fromkeys(name for name in fields if name))
+
+            allowed = self.get_serializer_class().Meta.fields
+            unknown = [name for name in fields if name not in allowed]
+            if unknown:
+                raise ValidationError({'fields': [
+                    _('Unknown field(s): %(fields)s.')
+                    % {'fields': ', '.join(unknown)}
+                ]})
+            self._requested_fields = fields or None
+
+        return self._requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        """Repassa ao serializador os campos pedidos em `?fields=`."""
+        fields = self.get_requested_fields()
+        if fields:
+            kwargs['fields'] = fields
+
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
         """ Retorna o serializador básico, sem os detalhes se
@@ -26,6 +116,10 @@ class RecipeViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'list':
             return serializers.RecipeSerializer
+        if self.action == 'bulk_destroy':
+            return serializers.RecipeBulkDeleteSerializer
+        if self.action == 'stats':
+            return serializers.RecipeStatsSerializer
 
         return self.serializer_class
         """ Documentação da func => get_serializer_class
@@ -33,6 +127,176 @@ class RecipeViewSet(viewsets.ModelViewSet):
             generic-views/#get_serializer_classself
         """
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """ Recepe os dados da Requisição e Cria a Receita."""
         serializer.save(user=self.request.user)
+
+    def get_bulk_items(self):
+        """Retorna a lista de itens do corpo da requisição em lote."""
+        items = self.request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(_('Expected a non-empty list of recipes.'))
+        if len(items) > settings.RECIPE_BULK_MAX_ITEMS:
+            raise ValidationError(
+                _('A batch may contain at most %(max)d recipes.')
+                % {'max': settings.RECIPE_BULK_MAX_ITEMS}
+            )
+
+        return items
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    @idempotent
+    def bulk_create(self, request):
+        """Cria várias receitas com um único bulk_create.
+
+        Os itens inválidos são devolvidos com os erros na mesma posição
+        da lista enviada, e nenhuma receita é criada.
+        """
+        serializer = self.get_serializer(data=self.get_bulk_items(), many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save(user=request.user)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    @idempotent
+    def bulk_update(self, request):
+        """Atualiza parcialmente várias receitas com um único bulk_update.
+
+        Cada item deve conter o `id` de uma receita do usuário.
+        """
+        items = self.get_bulk_items()
+        try:
+            ids = [int(item['id']) for item in items]
+        except (TypeError, KeyError, ValueError):
+            raise ValidationError(_('Each recipe must include a valid id.'))
+        if len(set(ids)) != len(ids):
+            raise ValidationError(_('Each recipe may appear only once.'))
+
+        recipes = self.queryset.filter(user=request.user).in_bulk(ids)
+        if len(recipes) != len(ids):
+            raise ValidationError([
+                {} if pk in recipes else {'id': [_('Not found.')]}
+                for pk in ids
+            ])
+
+        serializer = self.get_serializer(
+            [recipes[pk] for pk in ids],
+            data=items,
+            many=True,
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data)
+
+    @bulk_create.mapping.delete
+    @idempotent
+    def bulk_destroy(self, request):
+        """Exclui várias receitas do usuário com um único DELETE e
+        informa quais ids foram excluídos e quais não foram encontrados.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        recipes = self.queryset.filter(user=request.user, id__in=ids)
+        with transaction.atomic():
+            # O delete() do ORM faz um DELETE por tabela (com cascatas e
+            # sinais); os post_delete das receitas são agrupados em um
+            # bulk_create das marcas de exclusão e um recipes_changed.
+            with batch_recipe_deletes() as deleted:
+                recipes.delete()
+            found = {pk for pk, _, _ in deleted}
+
+        return Response({
+            'deleted': [pk for pk in ids if pk in found],
+            'not_found': [pk for pk in ids if pk not in found],
+        })
+
+    @action(detail=False, methods=['get'], url_path='stats',
+            url_name='stats')
+    def stats(self, request):
+        """Retorna quantidade, tempo médio e preços mínimo, máximo e
+        médio das receitas do usuário.
+
+        Lê uma única linha do resumo mantido pelos sinais (ver
+        core.stats), sem agregar as receitas.
+        """
+        stats = (
+            RecipeStats.objects.filter(user=request.user).first()
+            or RecipeStats(user=request.user)
+        )
+        serializer = self.get_serializer(stats)
+
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='export',
+            url_name='export')
+    def export(self, request):
+        """Exporta todas as receitas do usuário em NDJSON (padrão) ou CSV
+        (`?output=csv`), em streaming.
+
+        As linhas vêm de um cursor no servidor (`iterator`) como tuplas,
+        sem instanciar modelos nem serializadores, então a memória usada
+        não depende da quantidade de receitas.
+        """
+        output = request.query_params.get('output', 'ndjson')
+        if output not in exports.FORMATS:
+            raise ValidationError(
+                {'output': _('Choose one of: %(formats)s.')
+                 % {'formats': ', '.join(exports.FORMATS)}}
+            )
+        generate, content_type, extension = exports.FORMATS[output]
+
+        # O streaming roda depois da view: fixa já o banco da leitura.
+        rows = (
+            self.queryset.using(router.db_for_read(Recipe))
+            .filter(user=request.user)
+            .order_by('id')
+            .values_list(*exports.EXPORT_FIELDS)
+            .iterator(chunk_size=settings.RECIPE_EXPORT_CHUNK_SIZE)
+        )
+        response = StreamingHttpResponse(
+            generate(rows),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{extension}"'
+        )
+
+        return response
+
+
+class RecipeSyncView(generics.GenericAPIView):
+    """Sincronização incremental das receitas do usuário (ver recipe.sync).
+
+    Retorna as receitas alteradas e os ids excluídos depois do cursor
+    `?since=`, com o cursor a enviar na próxima chamada. Lê do primário,
+    nunca das réplicas: com atraso na replicação, as linhas ainda não
+    replicadas ficariam para trás de um cursor já entregue.
+    """
+    serializer_class = serializers.RecipeSyncPageSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'recipes'
+
+    def get(self, request):
+        changes, deleted, cursor, has_more = sync.changes_since(
+            request.user, request.query_params.get('since') or None,
+        )
+        serializer = self.get_serializer({
+            'changes': changes,
+            'deleted': deleted,
+            'cursor': cursor,
+            'has_more': has_more,
+        })
+
+        return Response(serializer.data)
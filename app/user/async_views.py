@@ -0,0 +1,29 @@
+"""
+View assíncrona (ASGI) do perfil do usuário autenticado.
+"""
+from core.async_views import async_api_view, json_response, parse_json
+from core.db.threads import database_sync_to_async
+from user.serializers import UserSerializer
+
+
+def _update_user(user, payload, partial):
+    serializer = UserSerializer(user, data=payload, partial=partial)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer.data
+
+
+@async_api_view(['GET', 'PUT', 'PATCH'])
+async def me(request):
+    """Retorna (GET) ou atualiza (PUT/PATCH) o usuário autenticado.
+
+    O GET não acessa o banco: o usuário vem do cache de autenticação.
+    """
+    if request.method == 'GET':
+        return json_response(UserSerializer(request.user).data)
+
+    payload = parse_json(request)
+    data = await database_sync_to_async(_update_user)(
+        request.user, payload, request.method == 'PATCH',
+    )
+    return json_response(data)
@@ -6,8 +6,10 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core.instrumentation import TimedSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializador de dados para os Usuários."""
 
     class Meta:
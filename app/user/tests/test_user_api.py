@@ -1,18 +1,25 @@
 """
 TESTES PARA A API DE USUÁRIOS
 """
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+
+from django.test import AsyncClient, TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.authentication import get_local_cache
+from core.tests.utils import QueryBudgetMixin
+
 
 # Constante com o endpoint que será testado
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
+ASYNC_ME_URL = reverse('user:async-me')
 
 
 def create_user(**params):
@@ -202,3 +209,118 @@ class PrivateUserApiTests(TestCase):
         self.assertTrue(self.user.check_password(payload['password']))
         # 6 - Verifica o status da Requisição
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class AsyncUserApiTests(TransactionTestCase):
+    """TESTES para a view async (ASGI) do profile.
+
+    TransactionTestCase: a view grava em uma thread do executor, com outra
+    conexão (ver core.db.threads).
+    """
+
+    def setUp(self):
+        get_local_cache().clear()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        token = Token.objects.create(user=self.user)
+        self.auth = {'AUTHORIZATION': 'Token ' + token.key}
+        self.client = AsyncClient()
+
+    async def test_retrieve_profile_unauthorized(self):
+        """Verifica se o profile async exige autenticação."""
+        res = await self.client.get(ASYNC_ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_retrieve_profile_success(self):
+        """Verifica se o profile async retorna o usuário autenticado."""
+        res = await self.client.get(ASYNC_ME_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {
+            'name': self.user.name,
+            'email': self.user.email,
+        })
+
+    async def test_post_me_not_allowed(self):
+        """Verifica se o profile async recusa POST."""
+        res = await self.client.post(ASYNC_ME_URL, {}, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_update_user_profile(self):
+        """Verifica a atualização async com patch."""
+        payload = {'name': 'Updated name', 'password': 'newpassword123'}
+
+        res = await self.client.patch(
+            ASYNC_ME_URL,
+            payload,
+            content_type='application/json',
+            **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        await sync_to_async(self.user.refresh_from_db)()
+        self.assertEqual(self.user.name, payload['name'])
+        self.assertTrue(self.user.check_password(payload['password']))
+
+
+class QueryBudgetUserApiTests(QueryBudgetMixin, TestCase):
+    """Verifica quantas consultas os endpoints de usuário custam, com
+    autenticação real por token e caches frios."""
+
+    SIZES = (0, 10, 100)
+
+    def setUp(self):
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def seed(self, size):
+        """Completa `size` outros usuários, cada um com seu token."""
+        users = get_user_model().objects.exclude(pk=self.user.pk)
+        for i in range(users.count(), size):
+            user = get_user_model().objects.create_user(
+                email=f'user{i}@example.com',
+            )
+            Token.objects.create(user=user)
+
+    def assertBudget(self, budget, request, expected_status):
+        def measured():
+            res = request()
+            self.assertEqual(res.status_code, expected_status)
+
+        self.assertQueryBudgetPerSize(budget, self.SIZES, self.seed, measured)
+
+    def test_me_budget(self):
+        """Token (com o usuário no mesmo SELECT)."""
+        self.assertBudget(
+            1, lambda: self.client.get(ME_URL), status.HTTP_200_OK,
+        )
+
+    def test_update_me_budget(self):
+        """Token + update do usuário + chaves dos tokens dele, removidas
+        do cache de autenticação pelo sinal de post_save."""
+        self.assertBudget(
+            3,
+            lambda: self.client.patch(ME_URL, {'name': 'Updated name'}),
+            status.HTTP_200_OK,
+        )
+
+    def test_token_budget(self):
+        """Usuário pelo email + token existente."""
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+        self.assertBudget(
+            2,
+            lambda: APIClient().post(TOKEN_URL, payload),
+            status.HTTP_200_OK,
+        )
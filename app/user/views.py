@@ -1,7 +1,9 @@
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from core.authentication import CachedTokenAuthentication
+from core.db.routers import ReplicaReadMixin
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
@@ -11,18 +13,23 @@ from user.serializers import (
 class CreateUserView(generics.CreateAPIView):
     """Implementa a View genérica para criação dos Usuários"""
     serializer_class = UserSerializer
+    throttle_scope = 'user_create'
 
 
 class CreateTokenView(ObtainAuthToken):
     """Implementa APIView para gerar o Token do usuário."""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    # O ObtainAuthToken desliga os throttles; este é o endpoint que mais
+    # precisa deles (adivinhação de senhas).
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    throttle_scope = 'token'
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(ReplicaReadMixin, generics.RetrieveUpdateAPIView):
     """Implementa APIView para Details e Update do user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):